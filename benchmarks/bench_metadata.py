@@ -0,0 +1,105 @@
+"""
+End-to-end benchmark of Orchestrator.scan_games against the local IGDB
+stand-in: a cold scan, where every lookup and cover goes over the network,
+and a warm rescan answered from the metadata cache and conditional requests.
+
+Of the synthetic Steam games, 80% are known to the stand-in by appid, 10%
+only by title and 10% not at all.
+
+Usage:
+    python -m benchmarks.bench_metadata [--games 500] [--latency 0.05] [--rate-limit 4] [--normalize]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from src.game_scanner import GameScanner
+from src.orchestrator import Orchestrator
+
+from .fake_igdb import FakeIGDBServer
+from .synthetic_steam import generate_steam_install
+
+LIBRARIES = 2
+
+def build_catalog(server, games):
+    """Registers the scanned games with the stand-in."""
+    for i, game in enumerate(games):
+        if i % 10 < 8:
+            server.add_game(game["name"], steam_appid=game["appid"])
+        elif i % 10 == 8:
+            server.add_game(game["name"])
+
+def create_orchestrator(root, steam_path, server, rate_limit, normalize):
+    orchestrator = Orchestrator()
+    # Orchestrator copied the configured path already; apps.json and covers go next to it
+    orchestrator.sunshine_path = os.path.join(root, "Sunshine", "sunshine.exe")
+    orchestrator.config.config.update({
+        "sunshine_path": orchestrator.sunshine_path,
+        "cache_path": os.path.join(root, "cache"),
+        "steam_path": steam_path,
+        "launchers": ["steam"],
+        "resolve_executables": False,
+        "local_artwork": False,
+        "normalize_covers": normalize,
+        "igdb_client_id": FakeIGDBServer.CLIENT_ID,
+        "igdb_client_secret": FakeIGDBServer.CLIENT_SECRET,
+        "igdb_api_url": server.api_url,
+        "igdb_auth_url": server.auth_url,
+        "igdb_rate_limit": rate_limit,
+    })
+    return orchestrator
+
+def benchmark(games, latency, rate_limit, normalize):
+    """
+    Returns:
+        dict: cold/warm throughput in games per second and the requests the stand-in received.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        install = generate_steam_install(root, libraries=LIBRARIES, manifests=max(1, games // LIBRARIES),
+                                         malformed=0)
+        scanned = GameScanner(steam_path=install["steam_path"], use_appinfo=False).scan_steam_library()
+
+        server = FakeIGDBServer(latency=latency, rate_limit=rate_limit)
+        build_catalog(server, scanned)
+        with server:
+            # The client is paced at the server's limit, or effectively unlimited
+            orchestrator = create_orchestrator(root, install["steam_path"], server, rate_limit or 1000.0, normalize)
+            start = time.perf_counter()
+            orchestrator.scan_games()
+            cold = time.perf_counter() - start
+            cold_requests = sum(server.stats()["requests"].values())
+
+            start = time.perf_counter()
+            orchestrator.scan_games()
+            warm = time.perf_counter() - start
+            stats = server.stats()
+            orchestrator.http.close()
+
+    return {
+        "games": len(scanned),
+        "cold_games_per_s": len(scanned) / cold,
+        "warm_games_per_s": len(scanned) / warm,
+        "cold_requests": cold_requests,
+        "warm_requests": sum(stats["requests"].values()) - cold_requests,
+        "throttled": stats["throttled"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scan_games against a local IGDB stand-in")
+    parser.add_argument("--games", type=int, default=500, help="Synthetic Steam games")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the stand-in adds to every response")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Stand-in API requests per second")
+    parser.add_argument("--normalize", action="store_true", help="Normalize covers (needs Pillow)")
+    args = parser.parse_args()
+
+    # Per-game logging, including the expected misses, would dominate the output
+    logging.getLogger().setLevel(logging.ERROR)
+    result = benchmark(args.games, args.latency, args.rate_limit, args.normalize)
+    print(f"{result['games']} games: cold {result['cold_games_per_s']:.0f}/s ({result['cold_requests']} requests), "
+          f"warm {result['warm_games_per_s']:.0f}/s ({result['warm_requests']} requests), "
+          f"{result['throttled']} throttled")
+
+if __name__ == "__main__":
+    main()
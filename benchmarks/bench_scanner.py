@@ -0,0 +1,175 @@
+"""
+GameScanner benchmark suite: cold and warm scan throughput, peak memory and
+scaling from 100 to 20,000 titles on synthetic Steam installs.
+
+The run fails (exit code 1) when, within the same run, a warm scan is not
+at least --min-warm-speedup times faster than a cold one, or when a larger
+library scans at a lower rate or uses more memory per title than the
+smallest one beyond --tolerance. Ratios are used so the check holds on any
+machine, as in bench_sunshine.
+
+Absolute timings in benchmarks/baselines.json are machine specific and only
+checked with --check-baselines; refresh them with --update-baselines.
+
+Usage:
+    python -m benchmarks.bench_scanner [--sizes 100 1000 5000 20000] [--workers 4]
+    python -m benchmarks.bench_scanner --check-baselines
+    python -m benchmarks.bench_scanner --update-baselines
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.game_scanner import GameScanner
+
+from .synthetic_steam import generate_steam_install
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = (100, 1000, 5000, 20000)
+LIBRARIES = 4
+
+def _scan(steam_path, index_path, workers):
+    scanner = GameScanner(steam_path=steam_path, index_path=index_path, max_workers=workers)
+    start = time.perf_counter()
+    games = scanner.scan_steam_library()
+    return games, time.perf_counter() - start
+
+def _peak_memory(steam_path, index_path, workers):
+    tracemalloc.start()
+    try:
+        _scan(steam_path, index_path, workers)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_size(titles, workers, malformed=0.02):
+    """
+    Measures one library size.
+
+    Returns:
+        dict: cold/warm throughput in titles per second and peak memory in bytes.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        install = generate_steam_install(
+            root, libraries=LIBRARIES, manifests=max(1, titles // LIBRARIES), malformed=malformed
+        )
+        manifests = install["games"] + install["malformed"]
+        index_path = os.path.join(root, "cache", "manifest_index.json")
+
+        games, cold = _scan(install["steam_path"], index_path, workers)
+        if len(games) != install["games"]:
+            raise AssertionError(f"Expected {install['games']} games, scanner returned {len(games)}")
+        _, warm = _scan(install["steam_path"], index_path, workers)
+        peak = _peak_memory(install["steam_path"], index_path, workers)
+
+    return {
+        "titles": manifests,
+        "cold_titles_per_s": manifests / cold,
+        "warm_titles_per_s": manifests / warm,
+        "peak_memory_bytes": peak,
+    }
+
+def check_ratios(results, min_warm_speedup, tolerance):
+    """
+    Compares each size against the cold scan of the same size and against the
+    smallest size of the same run.
+
+    Returns:
+        list: Regression messages; empty when everything is within bounds.
+    """
+    failures = []
+    for size, result in results.items():
+        speedup = result["warm_titles_per_s"] / result["cold_titles_per_s"]
+        if speedup < min_warm_speedup:
+            failures.append(f"{size} titles: warm scan only {speedup:.1f}x faster than cold, "
+                            f"expected {min_warm_speedup}x")
+
+    reference = results[min(results, key=int)]
+    for size, result in results.items():
+        minimum = reference["cold_titles_per_s"] * (1 - tolerance)
+        if result["cold_titles_per_s"] < minimum:
+            failures.append(f"{size} titles: cold_titles_per_s {result['cold_titles_per_s']:.0f} < {minimum:.0f}, "
+                            f"the smallest library's rate less tolerance")
+        per_title = result["peak_memory_bytes"] / result["titles"]
+        maximum = reference["peak_memory_bytes"] / reference["titles"] * (1 + tolerance)
+        if per_title > maximum:
+            failures.append(f"{size} titles: {per_title:.0f} peak bytes per title > {maximum:.0f}")
+    return failures
+
+def compare(results, baselines, tolerance):
+    """
+    Compares against absolute baselines recorded on this machine.
+
+    Returns:
+        list: Regression messages; empty when everything is within tolerance.
+    """
+    failures = []
+    for size, result in results.items():
+        baseline = baselines.get(size)
+        if not baseline:
+            continue
+        for key in ("cold_titles_per_s", "warm_titles_per_s"):
+            minimum = baseline[key] * (1 - tolerance)
+            if result[key] < minimum:
+                failures.append(f"{size} titles: {key} {result[key]:.0f} < {minimum:.0f}")
+        maximum = baseline["peak_memory_bytes"] * (1 + tolerance)
+        if result["peak_memory_bytes"] > maximum:
+            failures.append(f"{size} titles: peak_memory_bytes {result['peak_memory_bytes']} > {maximum:.0f}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GameScanner on synthetic Steam installs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Total titles per run")
+    parser.add_argument("--workers", type=int, default=4, help="GameScanner max_workers")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed relative regression against the smallest size, or the baselines")
+    parser.add_argument("--min-warm-speedup", type=float, default=1.5,
+                        help="Required warm over cold scan throughput at every size")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="Baselines file")
+    parser.add_argument("--check-baselines", action="store_true",
+                        help="Also compare against the absolute baselines; only meaningful on the machine that wrote them")
+    parser.add_argument("--update-baselines", action="store_true", help="Store these results as the new baselines")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        result = benchmark_size(size, args.workers)
+        results[str(size)] = result
+        print(f"{result['titles']:6d} titles: cold {result['cold_titles_per_s']:9.0f}/s  "
+              f"warm {result['warm_titles_per_s']:9.0f}/s  "
+              f"peak {result['peak_memory_bytes'] / 1024 / 1024:7.1f} MiB")
+
+    if args.update_baselines:
+        baselines = {}
+        if os.path.exists(args.baselines):
+            with open(args.baselines, 'r') as f:
+                baselines = json.load(f)
+        baselines.setdefault("scanner", {}).update(
+            {size: {key: int(value) for key, value in result.items()} for size, result in results.items()}
+        )
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {args.baselines}")
+        return
+
+    failures = check_ratios(results, args.min_warm_speedup, args.tolerance)
+    if args.check_baselines:
+        baselines = {}
+        if os.path.exists(args.baselines):
+            with open(args.baselines, 'r') as f:
+                baselines = json.load(f).get("scanner", {})
+        failures += compare(results, baselines, args.tolerance)
+    if failures:
+        print("Performance regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("No regressions.")
+
+if __name__ == "__main__":
+    main()
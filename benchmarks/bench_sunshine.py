@@ -0,0 +1,86 @@
+"""
+Benchmark: writing a scanned library to Sunshine's apps.json, one
+add_game call per game versus a single add_games call.
+
+The run fails (exit code 1) when add_games is not at least --min-speedup
+times faster than the per-game loop at every size. A ratio is used instead
+of absolute baselines so the check holds on any machine.
+
+Usage:
+    python -m benchmarks.bench_sunshine [--sizes 500 2000] [--min-speedup 10]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from src.sunshine_manager import SunshineManager
+
+DEFAULT_SIZES = (500, 2000)
+
+def make_games(count):
+    """Returns (name, cmd, working_dir, image_path) tuples for count synthetic games."""
+    return [
+        (f"Benchmark Game {i}", f"steam://rungameid/{1000 + i}", f"C:\\Games\\Game{i}", f"C:\\covers\\{i}.png")
+        for i in range(count)
+    ]
+
+def _manager(root):
+    return SunshineManager(os.path.join(root, "Sunshine.exe"))
+
+def benchmark_size(count):
+    """
+    Returns:
+        dict: Seconds for the per-game loop, the bulk call on an empty
+        config and the bulk call on an unchanged library.
+    """
+    games = make_games(count)
+    with tempfile.TemporaryDirectory() as root:
+        manager = _manager(root)
+        start = time.perf_counter()
+        for game in games:
+            manager.add_game(*game)
+        loop = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as root:
+        manager = _manager(root)
+        start = time.perf_counter()
+        counts = manager.add_games(games)
+        bulk = time.perf_counter() - start
+        if counts != {"added": count, "updated": 0, "unchanged": 0}:
+            raise AssertionError(f"Unexpected counts for {count} games: {counts}")
+
+        start = time.perf_counter()
+        manager.add_games(games)
+        rescan = time.perf_counter() - start
+
+    return {"games": count, "loop_s": loop, "bulk_s": bulk, "rescan_s": rescan, "speedup": loop / bulk}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-game and bulk apps.json updates")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Games per run")
+    parser.add_argument("--min-speedup", type=float, default=10.0, help="Required bulk speedup over the loop")
+    args = parser.parse_args()
+
+    # One log line per add_game call would dominate the loop
+    logging.getLogger().setLevel(logging.WARNING)
+    failures = []
+    for size in args.sizes:
+        result = benchmark_size(size)
+        print(f"{result['games']:6d} games: add_game loop {result['loop_s']:8.3f}s  "
+              f"add_games {result['bulk_s']:7.3f}s  unchanged rescan {result['rescan_s']:7.3f}s  "
+              f"speedup {result['speedup']:6.0f}x")
+        if result["speedup"] < args.min_speedup:
+            failures.append(f"{size} games: speedup {result['speedup']:.1f}x < {args.min_speedup}x")
+
+    if failures:
+        print("Performance regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("No regressions.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: app manifest parsing throughput, regex scans vs.
+vdf.extract_file, i.e. its bounded header read with the single-pass VDF
+tokenizer as fallback.
+
+Usage:
+    python -m benchmarks.bench_vdf [--count 2000] [--repeat 3] [--depots 4 400]
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from src import vdf
+from src.game_scanner import MANIFEST_FIELDS
+
+from .synthetic_steam import render_manifest
+
+def write_manifests(directory, count, depots=8):
+    paths = []
+    for appid in range(1000, 1000 + count):
+        path = os.path.join(directory, f"appmanifest_{appid}.acf")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_manifest(appid, f"Benchmark Game {appid}", depots=depots))
+        paths.append(path)
+    return paths
+
+def parse_regex(path):
+    """The previous implementation: full read plus three regex searches."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    name = re.search(r'"name"\s+"([^"]+)"', content)
+    install_dir = re.search(r'"installdir"\s+"([^"]+)"', content)
+    appid = re.search(r'"appid"\s+"(\d+)"', content)
+    return name.group(1), install_dir.group(1), appid.group(1)
+
+def parse_tokenizer(path):
+    fields = vdf.extract_file(path, MANIFEST_FIELDS)
+    return fields["name"], fields["installdir"], fields["appid"]
+
+def run(parse, paths, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            parse(path)
+        best = min(best, time.perf_counter() - start)
+    return len(paths) / best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app manifest parsing")
+    parser.add_argument("--count", type=int, default=2000, help="Number of manifests")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser; the best is reported")
+    parser.add_argument("--depots", type=int, nargs="+", default=[4, 400],
+                        help="Installed depots per manifest; large values model DLC-heavy titles")
+    args = parser.parse_args()
+
+    for depots in args.depots:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_manifests(directory, args.count, depots=depots)
+            size = os.path.getsize(paths[0])
+            for path in paths[:10]:
+                assert parse_regex(path) == parse_tokenizer(path)
+
+            regex_rate = run(parse_regex, paths, args.repeat)
+            tokenizer_rate = run(parse_tokenizer, paths, args.repeat)
+
+        print(f"{args.count} manifests, {depots} depots ({size} bytes each)")
+        print(f"  regex:     {regex_rate:10.0f} manifests/s")
+        print(f"  tokenizer: {tokenizer_rate:10.0f} manifests/s ({tokenizer_rate / regex_rate:.2f}x)")
+
+if __name__ == "__main__":
+    main()
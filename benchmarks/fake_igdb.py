@@ -0,0 +1,344 @@
+"""
+In-process stand-in for the Twitch OAuth token endpoint, the IGDB API
+(games, multiquery and external_games) and IGDB's image CDN, for offline
+tests and load benchmarks of the metadata path.
+
+Usage:
+    python -m benchmarks.fake_igdb [--port 8400] [--catalog 10000] [--latency 0.05] [--rate-limit 4]
+"""
+import argparse
+import json
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .synthetic_steam import WORDS
+
+# An Apicalypse string literal, with backslash escapes
+_STRING = r'"((?:[^"\\]|\\.)*)"'
+_SEARCH_RE = re.compile(r"search\s+" + _STRING)
+_LIMIT_RE = re.compile(r"limit\s+(\d+)")
+_UIDS_RE = re.compile(r"uid\s*=\s*\(([^)]*)\)")
+_CATEGORY_RE = re.compile(r"category\s*=\s*(\d+)")
+_SUBQUERY_RE = re.compile(r'query\s+(\w+)\s+' + _STRING + r'\s*\{((?:[^{}"]|"(?:[^"\\]|\\.)*")*)\}\s*;')
+_COVER_RE = re.compile(r"^/igdb/image/upload/(\w+)/(co\d+)\.(?:jpg|png)$")
+
+def _unquote(text):
+    return re.sub(r"\\(.)", r"\1", text)
+
+def _words(name):
+    return re.findall(r"[^\W_]+", name.lower())
+
+def render_png(width, height, rgb):
+    """Returns a solid-colour PNG image, built without Pillow."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    row = b"\x00" + bytes(rgb) * width
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+
+class FakeIGDBServer:
+    """
+    Threaded HTTP server answering like Twitch, IGDB and the IGDB image CDN.
+
+    Searches match catalog games whose names contain every word of the
+    query, the exact title first. Covers are small PNGs with an ETag, so
+    conditional requests are answered with 304. The server can add latency
+    to every response, answer with 429 once a per-second request limit is
+    exceeded or on every n-th API request, and expire issued tokens early.
+    """
+    CLIENT_ID = "fake-client-id"
+    CLIENT_SECRET = "fake-client-secret"
+    STEAM_CATEGORY = 1
+    MULTIQUERY_LIMIT = 10
+
+    def __init__(self, catalog_size=0, latency=0.0, rate_limit=None, throttle_every=0, retry_after=1,
+                 token_ttl=3600, cover_size=(90, 128), seed=0, host="127.0.0.1", port=0):
+        """
+        Args:
+            catalog_size (int, optional): Synthetic games to generate; more can be added with add_game.
+            latency (float, optional): Seconds every response is delayed by.
+            rate_limit (float, optional): API requests per second before answering 429. Unlimited if None.
+            throttle_every (int, optional): Answer every n-th API request with 429. Disabled if 0.
+            retry_after (float, optional): Retry-After seconds sent with 429 responses.
+            token_ttl (int, optional): Lifetime of issued access tokens in seconds.
+            cover_size (tuple, optional): (width, height) of the served covers.
+            seed (int, optional): Random seed for the synthetic catalog.
+            host (str, optional): Interface to listen on.
+            port (int, optional): Port to listen on; 0 picks a free one.
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.cover_size = tuple(cover_size)
+        self.games = []
+        self.requests = Counter()
+        self.throttled = 0
+        # {token: expires_at}
+        self._tokens = {}
+        self._by_word = {}
+        self._by_name = {}
+        self._by_steam_appid = {}
+        self._recent = deque()
+        self._api_requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+
+        rng = random.Random(seed)
+        for i in range(catalog_size):
+            self.add_game(" ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {i}")
+
+    @property
+    def auth_url(self):
+        return f"{self.base_url}/oauth2/token"
+
+    @property
+    def api_url(self):
+        return f"{self.base_url}/v4"
+
+    def add_game(self, name, steam_appid=None):
+        """
+        Adds a game to the catalog.
+
+        Returns:
+            dict: The game as the API returns it.
+        """
+        with self._lock:
+            game_id = len(self.games) + 1
+            game = {
+                "id": game_id,
+                "name": name,
+                "cover": {"id": game_id, "url": f"{self.base_url}/igdb/image/upload/t_thumb/co{game_id}.jpg"},
+            }
+            self.games.append(game)
+            self._by_name.setdefault(name.lower(), game)
+            for word in set(_words(name)):
+                self._by_word.setdefault(word, []).append(game)
+            if steam_appid is not None:
+                self._by_steam_appid[str(steam_appid)] = game
+        return game
+
+    def search(self, title, limit=1):
+        """Returns up to limit games matching title."""
+        words = _words(title)
+        if not words:
+            return []
+        exact = self._by_name.get(title.lower())
+        candidates = min((self._by_word.get(word, []) for word in words), key=len)
+        wanted = set(words)
+        matches = [exact] if exact else []
+        for game in candidates:
+            if len(matches) >= limit:
+                break
+            if game is not exact and wanted <= set(_words(game["name"])):
+                matches.append(game)
+        return matches[:limit]
+
+    def expire_tokens(self):
+        """Invalidates every issued token, as if they had all expired."""
+        with self._lock:
+            self._tokens.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"requests": dict(self.requests), "throttled": self.throttled, "tokens": len(self._tokens)}
+
+    def serve_forever(self):
+        """Serves in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """Serves from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _issue_token(self):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.time() + self.token_ttl
+        return token
+
+    def _authorized(self, headers):
+        token = (headers.get("Authorization") or "")[len("Bearer "):]
+        with self._lock:
+            expires_at = self._tokens.get(token)
+        return headers.get("Client-ID") == self.CLIENT_ID and expires_at is not None and expires_at > time.time()
+
+    def _throttle(self):
+        """Returns True if the current API request should be answered with 429."""
+        with self._lock:
+            self._api_requests += 1
+            if self.throttle_every and self._api_requests % self.throttle_every == 0:
+                self.throttled += 1
+                return True
+            if self.rate_limit:
+                now = time.monotonic()
+                while self._recent and self._recent[0] <= now - 1:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit:
+                    self.throttled += 1
+                    return True
+                self._recent.append(now)
+        return False
+
+    def _games(self, query):
+        match = _SEARCH_RE.search(query)
+        limit = int(_LIMIT_RE.search(query).group(1)) if _LIMIT_RE.search(query) else 10
+        if not match:
+            with self._lock:
+                return self.games[:limit]
+        return self.search(_unquote(match.group(1)), limit)
+
+    def _multiquery(self, query):
+        subqueries = _SUBQUERY_RE.findall(query)
+        if not subqueries or len(subqueries) > self.MULTIQUERY_LIMIT:
+            return None
+        return [
+            {"name": _unquote(name), "result": self._games(body) if endpoint == "games" else []}
+            for endpoint, name, body in subqueries
+        ]
+
+    def _external_games(self, query):
+        category = _CATEGORY_RE.search(query)
+        uids = _UIDS_RE.search(query)
+        if not uids or not category or int(category.group(1)) != self.STEAM_CATEGORY:
+            return []
+        results = []
+        for uid in re.findall(_STRING, uids.group(1)):
+            game = self._by_steam_appid.get(_unquote(uid))
+            if game:
+                results.append({"id": game["id"], "uid": _unquote(uid), "game": game})
+        return results
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled client connections are reused
+    protocol_version = "HTTP/1.1"
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        if isinstance(body, (list, dict)):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _begin(self):
+        path = urlsplit(self.path).path
+        with self.fake._lock:
+            self.fake.requests[path] += 1
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        return path
+
+    def do_POST(self):
+        path = self._begin()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+
+        if path == "/oauth2/token":
+            params = parse_qs(urlsplit(self.path).query)
+            if (params.get("client_id") != [self.fake.CLIENT_ID]
+                    or params.get("client_secret") != [self.fake.CLIENT_SECRET]
+                    or params.get("grant_type") != ["client_credentials"]):
+                self._send(400, {"status": 400, "message": "invalid client"})
+                return
+            token = self.fake._issue_token()
+            self._send(200, {"access_token": token, "expires_in": self.fake.token_ttl, "token_type": "bearer"})
+            return
+
+        endpoints = {
+            "/v4/games": self.fake._games,
+            "/v4/multiquery": self.fake._multiquery,
+            "/v4/external_games": self.fake._external_games,
+        }
+        if path not in endpoints:
+            self._send(404, {"message": "not found"})
+            return
+        if not self.fake._authorized(self.headers):
+            self._send(401, {"message": "Authorization Failure"})
+            return
+        if self.fake._throttle():
+            self._send(429, {"message": "Too Many Requests"}, headers={"Retry-After": str(self.fake.retry_after)})
+            return
+        result = endpoints[path](body)
+        if result is None:
+            self._send(400, {"title": "Syntax Error"})
+            return
+        self._send(200, result)
+
+    def do_GET(self):
+        path = self._begin()
+        match = _COVER_RE.match(path)
+        if not match:
+            self._send(404, b"", content_type="text/plain")
+            return
+        image_id = match.group(2)
+        etag = f'"{image_id}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        game_id = int(image_id[2:])
+        rgb = (game_id * 53 % 256, game_id * 97 % 256, game_id * 193 % 256)
+        self._send(200, render_png(*self.fake.cover_size, rgb), content_type="image/png", headers={"ETag": etag})
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local IGDB/Twitch stand-in server")
+    parser.add_argument("--port", type=int, default=8400, help="Port to listen on")
+    parser.add_argument("--catalog", type=int, default=10000, help="Synthetic games in the catalog")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--rate-limit", type=float, default=None, help="API requests per second before 429")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="Access token lifetime in seconds")
+    args = parser.parse_args()
+
+    server = FakeIGDBServer(catalog_size=args.catalog, latency=args.latency, rate_limit=args.rate_limit,
+                            token_ttl=args.token_ttl, port=args.port)
+    print(f"Serving {args.catalog} games. Set igdb_auth_url to {server.auth_url}, igdb_api_url to "
+          f"{server.api_url}, igdb_client_id to {server.CLIENT_ID} and igdb_client_secret to "
+          f"{server.CLIENT_SECRET}.")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+In-process stand-in for Sunshine's admin API (/api/apps), for offline tests
+of the API backend and for timing library updates against it.
+
+Serves plain HTTP; point sunshine_api_url at the printed address.
+
+Usage:
+    python -m benchmarks.fake_sunshine [--port 47990] [--username admin] [--password admin]
+"""
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_DELETE_RE = re.compile(r"^/api/apps/(\d+)$")
+
+class FakeSunshineServer:
+    """
+    Threaded HTTP server keeping an apps list the way Sunshine's web UI
+    does: GET /api/apps returns it, POST /api/apps replaces the app at
+    "index" or appends it for -1, DELETE /api/apps/<index> removes one.
+    Every request needs HTTP basic auth.
+    """
+    def __init__(self, username="admin", password="admin", apps=None, latency=0.0, host="127.0.0.1", port=0):
+        """
+        Args:
+            username (str, optional): Accepted user name.
+            password (str, optional): Accepted password.
+            apps (list, optional): Initial apps.
+            latency (float, optional): Seconds every response is delayed by.
+            host (str, optional): Interface to listen on.
+            port (int, optional): Port to listen on; 0 picks a free one.
+        """
+        self.credentials = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+        self.apps = list(apps or [])
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+
+    def serve_forever(self):
+        """Serves in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """Serves from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so the client's session reuses its connection
+    protocol_version = "HTTP/1.1"
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _begin(self):
+        """Counts the request; returns False after answering it with 401."""
+        with self.fake._lock:
+            self.fake.requests[f"{self.command} {self.path}"] += 1
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        # The body has to be consumed even when the request is refused
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+        if self.headers.get("Authorization") != f"Basic {self.fake.credentials}":
+            self._send(401, {"status": False, "error": "Unauthorized"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._begin():
+            return
+        if self.path != "/api/apps":
+            self._send(404, {"status": False})
+            return
+        with self.fake._lock:
+            self._send(200, {"env": {}, "apps": self.fake.apps})
+
+    def do_POST(self):
+        if not self._begin():
+            return
+        if self.path != "/api/apps":
+            self._send(404, {"status": False})
+            return
+        try:
+            app = json.loads(self.body)
+            index = int(app.pop("index", -1))
+        except ValueError:
+            self._send(400, {"status": False, "error": "Invalid JSON"})
+            return
+        with self.fake._lock:
+            if index == -1:
+                self.fake.apps.append(app)
+            elif 0 <= index < len(self.fake.apps):
+                self.fake.apps[index] = app
+            else:
+                self._send(400, {"status": False, "error": "Index out of range"})
+                return
+        self._send(200, {"status": True})
+
+    def do_DELETE(self):
+        if not self._begin():
+            return
+        match = _DELETE_RE.match(self.path)
+        with self.fake._lock:
+            if not match or int(match.group(1)) >= len(self.fake.apps):
+                self._send(400, {"status": False, "error": "Index out of range"})
+                return
+            del self.fake.apps[int(match.group(1))]
+        self._send(200, {"status": True})
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Sunshine admin API stand-in")
+    parser.add_argument("--port", type=int, default=47990, help="Port to listen on")
+    parser.add_argument("--username", default="admin", help="Accepted user name")
+    parser.add_argument("--password", default="admin", help="Accepted password")
+    args = parser.parse_args()
+
+    server = FakeSunshineServer(args.username, args.password, port=args.port)
+    print(f"Serving the Sunshine API at {server.base_url}.")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
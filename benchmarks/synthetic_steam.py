@@ -0,0 +1,170 @@
+"""
+Generates realistic fake Steam installs on disk for tests and benchmarks.
+
+Usage:
+    python -m benchmarks.synthetic_steam OUTPUT_DIR [--libraries 3] [--manifests 500] [--malformed 0.02]
+"""
+import argparse
+import os
+import random
+
+MANIFEST_TEMPLATE = """"AppState"
+{{
+	"appid"		"{appid}"
+	"Universe"		"1"
+	"name"		"{name}"
+	"StateFlags"		"4"
+	"installdir"		"{installdir}"
+	"LastUpdated"		"{last_updated}"
+	"SizeOnDisk"		"12345678901"
+	"buildid"		"9876543"
+	"LastOwner"		"76561198000000000"
+	"BytesToDownload"		"0"
+	"BytesDownloaded"		"0"
+	"AutoUpdateBehavior"		"0"
+	"AllowOtherDownloadsWhileRunning"		"0"
+	"ScheduledAutoUpdate"		"0"
+	"InstalledDepots"
+	{{
+{depots}	}}
+	"UserConfig"
+	{{
+		"language"		"english"
+	}}
+	"MountedConfig"
+	{{
+		"language"		"english"
+	}}
+}}
+"""
+
+DEPOT_TEMPLATE = """		"{depot}"
+		{{
+			"manifest"		"{manifest}"
+			"size"		"{size}"
+		}}
+"""
+
+WORDS = (
+    "Dark", "Legend", "Space", "Quest", "Tactics", "Rogue", "Empire", "Shadow", "Racing",
+    "Souls", "Kingdom", "Frontier", "Galaxy", "Dungeon", "Heroes", "Odyssey", "Zero", "Storm"
+)
+
+# Kinds of broken manifests seen in the wild
+MALFORMED_KINDS = ("truncated", "missing_name", "empty", "binary", "unbalanced")
+
+def render_manifest(appid, name, installdir=None, depots=4, last_updated=1700000000):
+    """Returns the text of an appmanifest_<appid>.acf file."""
+    depot_text = "".join(
+        DEPOT_TEMPLATE.format(depot=appid * 10 + d, manifest=1234567890123456789 + d, size=1000000 * (d + 1))
+        for d in range(depots)
+    )
+    escaped_name = name.replace("\\", "\\\\").replace('"', '\\"')
+    return MANIFEST_TEMPLATE.format(
+        appid=appid,
+        name=escaped_name,
+        installdir=installdir or escaped_name,
+        depots=depot_text,
+        last_updated=last_updated
+    )
+
+def render_malformed(kind, appid):
+    """Returns the content of a broken manifest of the given kind."""
+    text = render_manifest(appid, f"Broken {appid}")
+    if kind == "truncated":
+        # Cut off inside the header, before "name"
+        return text[:text.index('"name"') + 4]
+    if kind == "missing_name":
+        return text.replace(f'\t"name"\t\t"Broken {appid}"\n', "")
+    if kind == "empty":
+        return ""
+    if kind == "binary":
+        return "\x00\x07\x1b" * 64
+    if kind == "unbalanced":
+        return text.replace('"AppState"\n{', '"AppState"\n', 1)
+    raise ValueError(f"Unknown malformed kind: {kind}")
+
+def render_library_folders(library_paths, apps_per_library):
+    """Returns a modern, nested libraryfolders.vdf."""
+    lines = ['"libraryfolders"', "{"]
+    for i, path in enumerate(library_paths):
+        escaped = path.replace("\\", "\\\\")
+        lines += [
+            f'\t"{i}"', "\t{",
+            f'\t\t"path"\t\t"{escaped}"',
+            '\t\t"label"\t\t""',
+            f'\t\t"contentid"\t\t"{1000 + i}"',
+            '\t\t"totalsize"\t\t"0"',
+            '\t\t"apps"', "\t\t{",
+        ]
+        lines += [f'\t\t\t"{appid}"\t\t"1000000"' for appid in apps_per_library[i]]
+        lines += ["\t\t}", "\t}"]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def generate_steam_install(root, libraries=3, manifests=500, malformed=0.02, depots=4, seed=0):
+    """
+    Builds a fake Steam install with several library folders.
+
+    The first library is the Steam folder itself (root/Steam); the others are
+    root/Library1..N-1, mirroring extra drives.
+
+    Args:
+        root (str): Directory to create the install in.
+        libraries (int, optional): Number of library folders.
+        manifests (int, optional): App manifests per library.
+        malformed (float, optional): Fraction of manifests that are broken.
+        depots (int, optional): Installed depots per manifest.
+        seed (int, optional): Random seed, for reproducible installs.
+
+    Returns:
+        dict: {"steam_path", "library_paths", "games", "malformed"} where games
+        is the number of valid manifests and malformed the number of broken ones.
+    """
+    rng = random.Random(seed)
+    steam_path = os.path.join(root, "Steam")
+    library_paths = [steam_path] + [os.path.join(root, f"Library{i}") for i in range(1, libraries)]
+
+    apps_per_library = []
+    valid = 0
+    broken = 0
+    appid = 1000
+    for lib_path in library_paths:
+        steamapps_path = os.path.join(lib_path, "steamapps")
+        os.makedirs(os.path.join(steamapps_path, "common"), exist_ok=True)
+        appids = []
+        for _ in range(manifests):
+            appid += 10
+            appids.append(appid)
+            path = os.path.join(steamapps_path, f"appmanifest_{appid}.acf")
+            if rng.random() < malformed:
+                content = render_malformed(rng.choice(MALFORMED_KINDS), appid)
+                broken += 1
+            else:
+                name = " ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {appid}"
+                content = render_manifest(appid, name, depots=depots,
+                                          last_updated=1600000000 + rng.randint(0, 10 ** 8))
+                valid += 1
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        apps_per_library.append(appids)
+
+    with open(os.path.join(steam_path, "steamapps", "libraryfolders.vdf"), "w", encoding="utf-8") as f:
+        f.write(render_library_folders(library_paths, apps_per_library))
+
+    return {"steam_path": steam_path, "library_paths": library_paths, "games": valid, "malformed": broken}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Steam install")
+    parser.add_argument("output", help="Directory to create the install in")
+    parser.add_argument("--libraries", type=int, default=3, help="Number of library folders")
+    parser.add_argument("--manifests", type=int, default=500, help="Manifests per library")
+    parser.add_argument("--malformed", type=float, default=0.02, help="Fraction of broken manifests")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    result = generate_steam_install(args.output, args.libraries, args.manifests, args.malformed, seed=args.seed)
+    print(f"Created {result['games']} games and {result['malformed']} malformed manifests in {result['steam_path']}")
+
+if __name__ == "__main__":
+    main()
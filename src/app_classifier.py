@@ -0,0 +1,109 @@
+import logging
+import re
+from collections import Counter
+
+# Steam apps that are installed like games but are runtimes, compatibility
+# tools, redistributables or SDKs
+NON_GAME_APPIDS = {
+    "228980": "Steamworks Common Redistributables",
+    "1070560": "Steam Linux Runtime 1.0 (scout)",
+    "1391110": "Steam Linux Runtime 2.0 (soldier)",
+    "1628350": "Steam Linux Runtime 3.0 (sniper)",
+    "858280": "Proton 3.7",
+    "930400": "Proton 3.16",
+    "961940": "Proton 4.2",
+    "1054830": "Proton 4.11",
+    "1113280": "Proton 5.0",
+    "1245040": "Proton 5.13",
+    "1420170": "Proton 6.3",
+    "1580130": "Proton 7.0",
+    "2348590": "Proton 8.0",
+    "2805730": "Proton 9.0",
+    "1493710": "Proton Experimental",
+    "2180100": "Proton Hotfix",
+    "1826330": "Proton BattlEye Runtime",
+    "1887720": "Proton EasyAntiCheat Runtime",
+    "250820": "SteamVR",
+    "243730": "Source SDK Base 2013 Singleplayer",
+    "243750": "Source SDK Base 2013 Multiplayer",
+    "211": "Source SDK",
+    "215": "Source SDK Base 2006",
+    "218": "Source SDK Base 2007",
+}
+# Name patterns of tools that are not covered by an appid, matched case-insensitively
+NON_GAME_NAME_PATTERNS = (
+    r"\bredistributables?\b",
+    r"^steamworks\b",
+    r"^proton\b",
+    r"^steam linux runtime\b",
+    r"^steamvr\b",
+    r"\bdedicated server\b",
+    r"\bsdk\b",
+)
+# appinfo.vdf app types that are never launched as a game
+NON_GAME_TYPES = {"tool", "config", "dlc", "music", "video", "driver", "hardware", "series", "advertising"}
+
+class AppClassifier:
+    """
+    Tells games apart from the runtimes, tools and servers that launchers
+    install alongside them.
+
+    An entry is excluded when appinfo.vdf gives it a non-game app type, when
+    its Steam appid is on the denylist, or when its name matches one of the
+    denylist patterns. User entries extend the built-in lists. Exclusions are
+    counted by reason for the scan report.
+    """
+    def __init__(self, excluded_appids=(), excluded_names=(), excluded_types=None):
+        """
+        Args:
+            excluded_appids (iterable, optional): Steam appids to exclude in addition to NON_GAME_APPIDS.
+            excluded_names (iterable, optional): Regular expressions to exclude in addition
+                to NON_GAME_NAME_PATTERNS.
+            excluded_types (iterable, optional): App types to exclude. NON_GAME_TYPES if None.
+        """
+        self.excluded_appids = set(NON_GAME_APPIDS) | {str(appid) for appid in excluded_appids}
+        self.name_patterns = []
+        for pattern in (*NON_GAME_NAME_PATTERNS, *excluded_names):
+            try:
+                self.name_patterns.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                logging.warning(f"Ignoring invalid exclusion pattern {pattern!r}: {e}")
+        self.excluded_types = set(NON_GAME_TYPES if excluded_types is None else excluded_types)
+        # {reason: count}
+        self.excluded = Counter()
+
+    def classify(self, game):
+        """
+        Returns:
+            str: Why the entry is not a game, or None if it is one.
+        """
+        if game.get("app_type") in self.excluded_types:
+            return f"app type {game['app_type']}"
+        if game.get("platform") == "steam" and str(game.get("appid")) in self.excluded_appids:
+            return "denylisted appid"
+        name = game.get("name") or ""
+        for pattern in self.name_patterns:
+            if pattern.search(name):
+                return "denylisted name"
+        return None
+
+    def is_game(self, game):
+        """Classifies an entry, counting it if it is excluded."""
+        reason = self.classify(game)
+        if reason is None:
+            return True
+        self.excluded[reason] += 1
+        logging.debug(f"Skipping {game.get('name')}: {reason}")
+        return False
+
+    def reset_stats(self):
+        self.excluded = Counter()
+
+    def stats(self):
+        return dict(self.excluded)
+
+    def log_stats(self):
+        total = sum(self.excluded.values())
+        if total:
+            reasons = ", ".join(f"{count} {reason}" for reason, count in self.excluded.most_common())
+            logging.info(f"Excluded {total} non-game entries ({reasons}).")
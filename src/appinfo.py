@@ -0,0 +1,268 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+
+# appinfo.vdf versions: 27 (pre-2022), 28 (adds a binary data hash) and
+# 29 (keys moved to a string table at the end of the file)
+MAGIC_V27 = 0x07564427
+MAGIC_V28 = 0x07564428
+MAGIC_V29 = 0x07564429
+
+# Binary KeyValues node types
+TYPE_SECTION = 0x00
+TYPE_STRING = 0x01
+TYPE_INT32 = 0x02
+TYPE_FLOAT32 = 0x03
+TYPE_POINTER = 0x04
+TYPE_WSTRING = 0x05
+TYPE_COLOR = 0x06
+TYPE_UINT64 = 0x07
+TYPE_END = 0x08
+TYPE_INT64 = 0x0A
+TYPE_END_ALT = 0x0B
+
+_FIXED_SIZES = {TYPE_INT32: 4, TYPE_FLOAT32: 4, TYPE_POINTER: 4, TYPE_COLOR: 4, TYPE_UINT64: 8, TYPE_INT64: 8}
+_FIXED_FORMATS = {TYPE_INT32: "<i", TYPE_FLOAT32: "<f", TYPE_POINTER: "<I", TYPE_COLOR: "<I",
+                  TYPE_UINT64: "<Q", TYPE_INT64: "<q"}
+
+# appid, size, info_state, last_updated, pics_token, sha1, change_number
+_ENTRY_HEADER = struct.Struct("<IIIIQ20sI")
+_HASH_SIZE = 20
+
+class AppInfoError(ValueError):
+    """Raised when appinfo.vdf is malformed or of an unknown version."""
+
+class AppInfoReader:
+    """
+    Reads Steam's binary appcache/appinfo.vdf without loading it.
+
+    The file is memory-mapped and an {appid: offset} index is built by hopping
+    from one entry header to the next, which only touches a few bytes per app.
+    The index is cached on disk and reused while the file's (mtime, size) is
+    unchanged, so looking up an app costs a single seek and the parse of that
+    one app's KeyValues block.
+    """
+    VERSION = 1
+
+    def __init__(self, path, index_path=None):
+        """
+        Args:
+            path (str): Path of appinfo.vdf.
+            index_path (str, optional): Path of the persistent offset index. In-memory only if None.
+        """
+        self.path = path
+        self.index_path = index_path
+        self.offsets = {}
+        self._file = None
+        self._map = None
+        self._magic = None
+        self._strings = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """Maps the file and loads or builds the offset index."""
+        if self._map is not None:
+            return
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._magic, _ = struct.unpack_from("<II", self._map, 0)
+            if self._magic not in (MAGIC_V27, MAGIC_V28, MAGIC_V29):
+                raise AppInfoError(f"Unsupported appinfo.vdf version: {self._magic:#x}")
+            stat = os.fstat(self._file.fileno())
+            signature = [stat.st_mtime_ns, stat.st_size]
+            if not self._load_index(signature):
+                self.offsets = self._build_index()
+                self._save_index(signature)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._strings = None
+
+    def _load_index(self, signature):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION or data.get("signature") != signature:
+                return False
+            self.offsets = {int(appid): offset for appid, offset in data["offsets"].items()}
+            return True
+        except Exception as e:
+            logging.warning(f"Failed to load appinfo index {self.index_path}: {e}")
+            return False
+
+    def _save_index(self, signature):
+        if not self.index_path:
+            return
+        try:
+            index_dir = os.path.dirname(self.index_path)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.VERSION, "signature": signature, "offsets": self.offsets}, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logging.error(f"Failed to save appinfo index {self.index_path}: {e}")
+
+    def _data_start(self):
+        # v29 stores the string table offset right after the header
+        return 16 if self._magic == MAGIC_V29 else 8
+
+    def _build_index(self):
+        """Walks the entry headers once and returns {appid: offset of the entry}."""
+        data = self._map
+        end = len(data)
+        offsets = {}
+        pos = self._data_start()
+        while pos + 8 <= end:
+            appid, size = struct.unpack_from("<II", data, pos)
+            if appid == 0:
+                break
+            offsets[appid] = pos
+            # size counts everything after the size field itself
+            pos += 8 + size
+        if pos > end:
+            raise AppInfoError("Truncated appinfo.vdf")
+        logging.info(f"Indexed {len(offsets)} apps in {self.path}")
+        return offsets
+
+    def _string_table(self):
+        if self._strings is None:
+            (table_offset,) = struct.unpack_from("<q", self._map, 8)
+            (count,) = struct.unpack_from("<I", self._map, table_offset)
+            strings = []
+            pos = table_offset + 4
+            for _ in range(count):
+                nul = self._map.find(b"\x00", pos)
+                strings.append(self._map[pos:nul].decode("utf-8", "replace"))
+                pos = nul + 1
+            self._strings = strings
+        return self._strings
+
+    def get(self, appid):
+        """
+        Returns the parsed KeyValues of an app, or None if it is not in the file.
+
+        Args:
+            appid (int or str): Steam appid.
+        """
+        if self._map is None:
+            self.open()
+        offset = self.offsets.get(int(appid))
+        if offset is None:
+            return None
+        pos = offset + _ENTRY_HEADER.size
+        if self._magic != MAGIC_V27:
+            pos += _HASH_SIZE
+        with self._lock:
+            # The string table is built once; parsing itself only reads the map
+            strings = self._string_table() if self._magic == MAGIC_V29 else None
+        data, _ = self._parse_section(pos, strings)
+        return data.get("appinfo", data)
+
+    def _read_cstring(self, pos):
+        nul = self._map.find(b"\x00", pos)
+        if nul < 0:
+            raise AppInfoError("Unterminated string")
+        return self._map[pos:nul].decode("utf-8", "replace"), nul + 1
+
+    def _parse_section(self, pos, strings):
+        """Parses binary KeyValues from pos up to its end marker; returns (dict, next_pos)."""
+        data = self._map
+        result = {}
+        while True:
+            node_type = data[pos]
+            pos += 1
+            if node_type == TYPE_END or node_type == TYPE_END_ALT:
+                return result, pos
+            if strings is not None:
+                (key_index,) = struct.unpack_from("<I", data, pos)
+                key = strings[key_index]
+                pos += 4
+            else:
+                key, pos = self._read_cstring(pos)
+
+            if node_type == TYPE_SECTION:
+                result[key], pos = self._parse_section(pos, strings)
+            elif node_type == TYPE_STRING:
+                result[key], pos = self._read_cstring(pos)
+            elif node_type == TYPE_WSTRING:
+                nul = pos
+                while data[nul:nul + 2] != b"\x00\x00":
+                    nul += 2
+                result[key] = data[pos:nul].decode("utf-16-le", "replace")
+                pos = nul + 2
+            elif node_type in _FIXED_SIZES:
+                (result[key],) = struct.unpack_from(_FIXED_FORMATS[node_type], data, pos)
+                pos += _FIXED_SIZES[node_type]
+            else:
+                raise AppInfoError(f"Unknown node type {node_type:#x} at offset {pos - 1}")
+
+    def launch_info(self, appid, os_name="windows"):
+        """
+        Summarizes what is needed to start an app.
+
+        Args:
+            appid (int or str): Steam appid.
+            os_name (str, optional): Launch entries for other platforms are ignored.
+
+        Returns:
+            dict: {"name", "type", "installdir", "executable", "arguments"}, with
+            executable relative to the install folder, or None if the app is unknown.
+        """
+        data = self.get(appid)
+        if data is None:
+            return None
+        common = data.get("common", {})
+        config = data.get("config", {})
+        launch = self._pick_launch(config.get("launch", {}), os_name)
+        return {
+            "name": common.get("name"),
+            "type": (common.get("type") or "").lower() or None,
+            "installdir": config.get("installdir"),
+            "executable": launch.get("executable") if launch else None,
+            "arguments": launch.get("arguments") if launch else None,
+        }
+
+    @staticmethod
+    def _pick_launch(entries, os_name):
+        """Chooses the default launch option for the platform, in Steam's order."""
+        best = None
+        best_rank = None
+        for key in sorted(entries, key=lambda k: int(k) if str(k).isdigit() else 0):
+            entry = entries[key]
+            if not isinstance(entry, dict) or not entry.get("executable"):
+                continue
+            entry_config = entry.get("config", {})
+            oslist = entry_config.get("oslist")
+            if oslist and os_name not in oslist.split(","):
+                continue
+            if entry_config.get("betakey"):
+                continue
+            launch_type = (entry.get("type") or "default").lower()
+            # Default entries first, then "none"; options, editors and servers last
+            rank = {"default": 0, "none": 1}.get(launch_type, 2)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = entry, rank
+        return best
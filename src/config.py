@@ -8,9 +8,48 @@ class Config:
         "driver_tool_path": r"C:\Path\To\VirtualDriverControl.exe",
         "virtual_display_driver_url": "https://github.com/itsmikethetech/Virtual-Display-Driver/releases/download/23.12.2/Virtual-Display-Driver_23.12.2.zip",
         "deps_path": "deps",
-        "driver_checksum": ""
+        "driver_checksum": "",
         "igdb_client_id": "",
-        "igdb_client_secret": ""
+        "igdb_client_secret": "",
+        "igdb_api_url": "https://api.igdb.com/v4",
+        "igdb_auth_url": "https://id.twitch.tv/oauth2/token",
+        "cache_path": "cache",
+        "steam_path": "",
+        "scan_workers": 4,
+        "launchers": ["steam", "epic", "gog", "ea", "xbox"],
+        "launcher_timeout": 120,
+        "launcher_preference": ["steam", "epic", "gog", "ea", "xbox"],
+        "resolve_executables": True,
+        "use_appinfo": True,
+        "local_artwork": True,
+        "exclude_non_games": True,
+        "excluded_appids": [],
+        "excluded_names": [],
+        "max_games": 0,
+        "pinned_games": [],
+        "metadata_cache_ttl": 30 * 86400,
+        "metadata_negative_ttl": 86400,
+        "igdb_batch_size": 80,
+        "igdb_rate_limit": 4.0,
+        "igdb_max_in_flight": 8,
+        "cover_download_workers": 8,
+        "normalize_covers": True,
+        "cover_size": [600, 800],
+        "cover_workers": None,
+        "http_pool_size": 10,
+        "http_connect_timeout": 5.0,
+        "http_read_timeout": 30.0,
+        "http_max_retries": 3,
+        "sunshine_backend": "auto",
+        "sunshine_api_url": "https://localhost:47990",
+        "sunshine_api_username": "",
+        "sunshine_api_password": "",
+        "sunshine_api_verify": False,
+        "game_gpu_preference": False,
+        "tune_encoder": False,
+        "encoder_settings": {},
+        "watch_debounce": 2.0,
+        "watch_poll_interval": 5.0
     }
 
     def __init__(self, config_path="config/settings.json"):
@@ -49,6 +88,28 @@ class Config:
             self.config["igdb_client_id"] = os.environ.get("IGDB_CLIENT_ID")
         if os.environ.get("IGDB_CLIENT_SECRET"):
             self.config["igdb_client_secret"] = os.environ.get("IGDB_CLIENT_SECRET")
+        if os.environ.get("SUNSHINE_API_USERNAME"):
+            self.config["sunshine_api_username"] = os.environ.get("SUNSHINE_API_USERNAME")
+        if os.environ.get("SUNSHINE_API_PASSWORD"):
+            self.config["sunshine_api_password"] = os.environ.get("SUNSHINE_API_PASSWORD")
+        if os.environ.get("IGDB_API_URL"):
+            self.config["igdb_api_url"] = os.environ.get("IGDB_API_URL")
+        if os.environ.get("IGDB_AUTH_URL"):
+            self.config["igdb_auth_url"] = os.environ.get("IGDB_AUTH_URL")
+        if os.environ.get("CACHE_PATH"):
+            self.config["cache_path"] = os.environ.get("CACHE_PATH")
+        if os.environ.get("STEAM_PATH"):
+            self.config["steam_path"] = os.environ.get("STEAM_PATH")
 
     def get(self, key):
         return self.config.get(key)
+
+    def get_path(self, key):
+        """
+        Returns a path setting, resolving relative paths against the project root.
+        """
+        path = self.config.get(key)
+        if not path or os.path.isabs(path):
+            return path
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(base_dir, path)
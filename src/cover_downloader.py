@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .http_client import default_client
+
+class CoverDownloader:
+    """
+    Downloads cover art concurrently and only when it changed.
+
+    The ETag, Last-Modified and SHA-256 of every downloaded cover are kept in
+    a small state file, so rescans send conditional requests and unchanged
+    covers come back as empty 304 responses. Downloads are written to a
+    temporary file and renamed into place, so an interrupted download never
+    leaves a truncated image behind. State is kept per URL and cover path, so
+    games sharing a cover URL do not overwrite each other's validators.
+    Covers whose content is identical to one already on disk are hardlinked
+    to it instead of storing a second copy, so every game still has a file
+    of its own that a later download for another game cannot change.
+    """
+    # 2: every entry points at its own dest_path, not another game's cover
+    # 3: entries keyed by (url, dest_path), stored as a list
+    VERSION = 3
+
+    def __init__(self, state_path=None, http=None, max_workers=8):
+        """
+        Args:
+            state_path (str, optional): Path of the persistent download state. In-memory only if None.
+            http (HttpClient, optional): Client for downloads. The shared default client if None.
+            max_workers (int, optional): Downloads running at once in download_many.
+        """
+        self.state_path = state_path
+        self.http = http or default_client()
+        self.max_workers = max(1, max_workers)
+        # {(url, dest_path): {"etag", "last_modified", "sha256", "path", "size"}}
+        self.entries = {}
+        # {sha256: path} of covers on disk, for deduplication
+        self.by_hash = {}
+        self.downloaded = 0
+        self.not_modified = 0
+        self.deduplicated = 0
+        self.failed = 0
+        self.bytes_downloaded = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = {(entry.pop("url"), entry["path"]): entry for entry in data.get("entries", [])}
+                self.by_hash = {entry["sha256"]: entry["path"] for entry in self.entries.values()}
+        except Exception as e:
+            logging.warning(f"Failed to load cover state {self.state_path}: {e}")
+            self.entries = {}
+            self.by_hash = {}
+
+    def save(self):
+        if not self.state_path or not self._dirty:
+            return True
+        try:
+            state_dir = os.path.dirname(self.state_path)
+            if state_dir:
+                os.makedirs(state_dir, exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with self._lock:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    entries = [dict(entry, url=url) for (url, _), entry in self.entries.items()]
+                    json.dump({"version": self.VERSION, "entries": entries}, f)
+                self._dirty = False
+            os.replace(tmp_path, self.state_path)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to save cover state {self.state_path}: {e}")
+            return False
+
+    @staticmethod
+    def _on_disk(entry):
+        """True if the file recorded for an entry is still there, unchanged in size."""
+        try:
+            return os.path.getsize(entry["path"]) == entry.get("size")
+        except OSError:
+            return False
+
+    def download(self, url, dest_path):
+        """
+        Downloads a cover unless the copy on disk is still current.
+
+        Args:
+            url (str): Cover URL.
+            dest_path (str): Where to store the cover if it is new.
+
+        Returns:
+            str: Path of the cover on disk, or None on failure.
+        """
+        with self._lock:
+            entry = self.entries.get((url, dest_path))
+        headers = {}
+        if entry and self._on_disk(entry):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        tmp_path = None
+        try:
+            response = self.http.get(url, headers=headers, stream=True)
+            if response.status_code == 304:
+                response.close()
+                with self._lock:
+                    self.not_modified += 1
+                return entry["path"]
+            response.raise_for_status()
+
+            sha256 = hashlib.sha256()
+            size = 0
+            # Unique per download: titles may sanitize to the same dest_path
+            fd, tmp_path = tempfile.mkstemp(suffix=".part", prefix=f"{os.path.basename(dest_path)}.",
+                                            dir=os.path.dirname(dest_path) or None)
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+            digest = sha256.hexdigest()
+
+            with self._lock:
+                self.downloaded += 1
+                self.bytes_downloaded += size
+                existing = self.by_hash.get(digest)
+                linked = False
+                if existing and existing != dest_path and self._on_disk({"path": existing, "size": size}):
+                    # Same image as another game's cover; share its data
+                    link_path = f"{tmp_path}.link"
+                    try:
+                        os.link(existing, link_path)
+                        os.replace(link_path, dest_path)
+                        linked = True
+                    except OSError:
+                        # Different drive or no hardlink support; keep the download
+                        if os.path.exists(link_path):
+                            os.remove(link_path)
+                if linked:
+                    self.deduplicated += 1
+                    os.remove(tmp_path)
+                else:
+                    os.replace(tmp_path, dest_path)
+                # Hashes of what dest_path held before no longer describe it
+                for stale in [h for h, path in self.by_hash.items() if path == dest_path]:
+                    del self.by_hash[stale]
+                if not linked:
+                    self.by_hash[digest] = dest_path
+                self.entries[(url, dest_path)] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "sha256": digest,
+                    "path": dest_path,
+                    "size": size,
+                }
+                self._dirty = True
+            return dest_path
+        except Exception as e:
+            logging.error(f"Failed to download cover art from {url}: {e}")
+            with self._lock:
+                self.failed += 1
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+    def download_many(self, jobs):
+        """
+        Downloads several covers concurrently.
+
+        Args:
+            jobs (list): (url, dest_path) pairs.
+
+        Returns:
+            dict: {dest_path: path on disk or None}
+        """
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            paths = executor.map(lambda job: self.download(*job), jobs)
+            return {dest_path: path for (_, dest_path), path in zip(jobs, paths)}
+
+    def stats(self):
+        return {
+            "downloaded": self.downloaded,
+            "not_modified": self.not_modified,
+            "deduplicated": self.deduplicated,
+            "failed": self.failed,
+            "bytes": self.bytes_downloaded,
+        }
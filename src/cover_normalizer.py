@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Pillow is optional; without it covers are used as downloaded
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+# Box art size recommended by Sunshine (3:4)
+BOX_ART_SIZE = (600, 800)
+
+def normalize_image(source_path, dest_path, size=BOX_ART_SIZE):
+    """
+    Scales and center-crops an image to exactly size and saves it as PNG.
+    Runs in worker processes, so it must stay a picklable module-level function.
+
+    Returns:
+        str: dest_path
+    """
+    with Image.open(source_path) as image:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        fitted = ImageOps.fit(image, tuple(size), Image.LANCZOS, centering=(0.5, 0.5))
+    tmp_path = f"{dest_path}.part"
+    fitted.save(tmp_path, "PNG", optimize=True)
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
+def _file_hash(path):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+class CoverNormalizer:
+    """
+    Resizes and crops covers to Sunshine's box art size.
+
+    Output files are named after the SHA-256 of their source and the target
+    size, so every distinct image is decoded and resized once; later scans
+    only hash the source. Image work is CPU-bound and runs in a process pool.
+    """
+    def __init__(self, output_dir, size=BOX_ART_SIZE, max_workers=None):
+        """
+        Args:
+            output_dir (str): Folder for normalized covers.
+            size (tuple, optional): (width, height) of the output.
+            max_workers (int, optional): Worker processes. Defaults to the CPU count.
+        """
+        self.output_dir = output_dir
+        self.size = tuple(size)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.processed = 0
+        self.cached = 0
+        self.failed = 0
+        self._executor = None
+
+    @staticmethod
+    def is_available():
+        return Image is not None
+
+    def _output_path(self, source_path):
+        width, height = self.size
+        return os.path.join(self.output_dir, f"{_file_hash(source_path)}_{width}x{height}.png")
+
+    def normalize_many(self, source_paths):
+        """
+        Normalizes covers, reusing earlier output for images already processed.
+
+        Args:
+            source_paths (iterable): Cover files as downloaded or copied.
+
+        Returns:
+            dict: {source_path: normalized path}. Sources that could not be
+            processed, or all of them without Pillow, map to themselves.
+        """
+        results = {}
+        # {output_path: source_path}; identical sources are processed once
+        pending = {}
+        duplicates = {}
+        for source_path in dict.fromkeys(source_paths):
+            if not self.is_available():
+                results[source_path] = source_path
+                continue
+            try:
+                output_path = self._output_path(source_path)
+            except OSError as e:
+                logging.warning(f"Cannot read cover {source_path}: {e}")
+                results[source_path] = source_path
+                continue
+            if os.path.exists(output_path):
+                self.cached += 1
+                results[source_path] = output_path
+            elif output_path in pending:
+                duplicates[source_path] = output_path
+            else:
+                pending[output_path] = source_path
+
+        if not pending:
+            return results
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if len(pending) == 1 or self.max_workers == 1:
+            # Not worth starting worker processes for
+            outcomes = {}
+            for output_path, source_path in pending.items():
+                try:
+                    outcomes[source_path] = normalize_image(source_path, output_path, self.size)
+                except Exception as e:
+                    outcomes[source_path] = e
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            futures = {
+                source_path: self._executor.submit(normalize_image, source_path, output_path, self.size)
+                for output_path, source_path in pending.items()
+            }
+            outcomes = {}
+            for source_path, future in futures.items():
+                try:
+                    outcomes[source_path] = future.result()
+                except Exception as e:
+                    outcomes[source_path] = e
+
+        for source_path, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                logging.warning(f"Failed to normalize cover {source_path}: {outcome}")
+                self.failed += 1
+                results[source_path] = source_path
+            else:
+                self.processed += 1
+                results[source_path] = outcome
+        for source_path, output_path in duplicates.items():
+            self.cached += 1
+            results[source_path] = results[pending[output_path]]
+        return results
+
+    def normalize(self, source_path):
+        """Normalizes a single cover; returns the path to use."""
+        return self.normalize_many([source_path])[source_path]
+
+    def stats(self):
+        return {"processed": self.processed, "cached": self.cached, "failed": self.failed}
+
+    def close(self):
+        """Shuts down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,193 @@
+import difflib
+import json
+import logging
+import math
+import os
+import re
+import threading
+
+# Words in executable names that are never the game itself
+JUNK_WORDS = {
+    "unins", "uninstall", "uninstaller", "setup", "installer", "launcher", "crash", "crashpad",
+    "handler", "reporter", "report", "redist", "vcredist", "dxsetup", "dotnet", "directx",
+    "helper", "updater", "update", "prereq", "prerequisites", "cheat", "battleye", "eac",
+    "cef", "webhelper", "benchmark", "config", "configurator", "settings", "server",
+    "editor", "cleanup", "touchup", "activation", "register"
+}
+# Splits "UnityCrashHandler64" / "vc_redist.x64" into words
+_WORD_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+# Folders that only ship redistributables and tooling
+JUNK_DIRS = {
+    "_commonredist", "commonredist", "redist", "redistributables", "directx", "dotnet",
+    "vcredist", "support", "__installer", "installer", "_installer", "easyanticheat",
+    "battleye", "prereqs", "engine", "tools"
+}
+
+def _is_junk(stem):
+    return any(word.lower().startswith(("unins", "vcredist")) or word.lower() in JUNK_WORDS
+               for word in _WORD_RE.findall(stem))
+
+def _normalize(text):
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+class ExecutableResolver:
+    """
+    Finds the main executable of an installed game.
+
+    Game folders are walked with a bounded, depth-limited os.scandir traversal
+    and candidate .exe files are ranked by size, name similarity to the game
+    and known junk (launchers, crash handlers, redistributables). Results are
+    cached on disk and reused while the game folder's mtime is unchanged, so a
+    game tree is walked once rather than on every scan.
+    """
+    VERSION = 1
+
+    def __init__(self, cache_path=None, max_depth=4, max_entries=5000):
+        """
+        Args:
+            cache_path (str, optional): Path of the persistent cache. In-memory only if None.
+            max_depth (int, optional): Folder levels below the game folder to search.
+            max_entries (int, optional): Directory entries inspected per game at most.
+        """
+        self.cache_path = cache_path
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data.get("entries", {})
+        except Exception as e:
+            logging.warning(f"Failed to load executable cache {self.cache_path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        if not self.cache_path or not self._dirty:
+            return True
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with self._lock:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"version": self.VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logging.error(f"Failed to save executable cache {self.cache_path}: {e}")
+            return False
+
+    def resolve(self, game_dir, name=None):
+        """
+        Returns the most likely main executable in a game folder.
+
+        Args:
+            game_dir (str): The game's install folder.
+            name (str, optional): The game's display name, used for ranking.
+
+        Returns:
+            str: Full path of the executable, or None if none was found.
+        """
+        try:
+            dir_mtime = os.stat(game_dir).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self.entries.get(game_dir)
+        if entry is not None and entry["mtime"] == dir_mtime and self._still_valid(entry):
+            self.hits += 1
+            return entry["exe"]
+
+        self.misses += 1
+        exe = self._find_best(game_dir, name or os.path.basename(game_dir))
+        entry = {"mtime": dir_mtime, "exe": exe}
+        if exe:
+            entry["parent_mtime"] = os.stat(os.path.dirname(exe)).st_mtime_ns
+        with self._lock:
+            self.entries[game_dir] = entry
+            self._dirty = True
+        return exe
+
+    def _still_valid(self, entry):
+        # The game folder mtime only reflects its direct children, so the
+        # folder holding the executable is checked as well
+        exe = entry["exe"]
+        if not exe:
+            return True
+        try:
+            return os.stat(os.path.dirname(exe)).st_mtime_ns == entry.get("parent_mtime")
+        except OSError:
+            return False
+
+    def _find_best(self, game_dir, name):
+        best = None
+        best_score = None
+        for path, size, depth in self._iter_candidates(game_dir):
+            score = self.score(path, size, depth, name)
+            if best_score is None or score > best_score:
+                best, best_score = path, score
+        return best
+
+    def _iter_candidates(self, game_dir):
+        """Yields (path, size, depth) for .exe files, breadth first."""
+        budget = self.max_entries
+        pending = [(game_dir, 0)]
+        while pending and budget > 0:
+            next_level = []
+            for directory, depth in pending:
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            budget -= 1
+                            if budget <= 0:
+                                return
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if depth < self.max_depth and entry.name.lower() not in JUNK_DIRS:
+                                        next_level.append((entry.path, depth + 1))
+                                elif entry.name.lower().endswith(".exe"):
+                                    yield entry.path, entry.stat().st_size, depth
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+            pending = next_level
+
+    @staticmethod
+    def score(path, size, depth, name):
+        """
+        Ranks a candidate executable; higher is better.
+
+        Args:
+            path (str): Executable path.
+            size (int): File size in bytes. Game binaries are usually the largest.
+            depth (int): Folder levels below the game folder.
+            name (str): Game name to compare the file name against.
+        """
+        stem = os.path.splitext(os.path.basename(path))[0]
+        normalized = _normalize(stem)
+        similarity = difflib.SequenceMatcher(None, normalized, _normalize(name)).ratio()
+
+        score = math.log2(size + 1) + 10 * similarity - depth
+        if normalized.endswith("shipping"):
+            # Unreal Engine game binary; the top-level exe is only a bootstrapper
+            score += 8
+        if _is_junk(stem):
+            score -= 100
+        return score
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
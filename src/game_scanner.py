@@ -1,75 +1,436 @@
+import functools
 import os
 import logging
-import re
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import launchers, vdf
+from .appinfo import AppInfoReader
+from .manifest_index import ManifestIndex
 
 try:
     import winreg
 except ImportError:
     winreg = None
 
+MANIFEST_FIELDS = ("appid", "name", "installdir", "LastUpdated")
+
+class _ProducerDone:
+    """Queue marker for a finished producer in iter_concurrently."""
+    __slots__ = ("elapsed", "error")
+
+    def __init__(self, elapsed, error):
+        self.elapsed = elapsed
+        self.error = error
+
+def _raise_error(key, elapsed, error):
+    if error:
+        raise error
+
+def iter_concurrently(producers, max_workers, ordered=False, on_done=None, timeout=None):
+    """
+    Runs several generators in worker threads and yields their items as they
+    are produced.
+
+    Args:
+        producers (list): (key, callable) pairs; each callable returns an iterable.
+        max_workers (int): Maximum number of producers running at once.
+        ordered (bool, optional): Give every producer its own queue and yield
+            producers one after another in list order, instead of interleaving
+            items from a shared queue as they arrive.
+        on_done (callable, optional): Called as on_done(key, elapsed, error) in
+            the consuming thread when a producer finishes. error is None on
+            success and a TimeoutError for producers abandoned after timeout.
+        timeout (float, optional): Overall time limit in seconds. Producers still
+            running when it expires are abandoned and left to finish in the background;
+            the output of producers that had finished is still yielded.
+
+    Yields:
+        Items from all producers.
+    """
+    if ordered:
+        queues = [queue.Queue() for _ in producers]
+    else:
+        queues = [queue.Queue()] * len(producers)
+
+    # Producers whose done marker is queued; only added to by workers
+    finished = set()
+
+    def run(i, produce):
+        start = time.perf_counter()
+        error = None
+        try:
+            for item in produce():
+                queues[i].put((i, item))
+        except Exception as e:
+            error = e
+        queues[i].put((i, _ProducerDone(time.perf_counter() - start, error)))
+        finished.add(i)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(producers))))
+    deadline = time.monotonic() + timeout if timeout else None
+    pending = set(range(len(producers)))
+    try:
+        for i, (_, produce) in enumerate(producers):
+            executor.submit(run, i, produce)
+
+        while pending:
+            q = queues[min(pending)] if ordered else queues[0]
+            try:
+                wait = None if deadline is None else max(0, deadline - time.monotonic())
+                i, item = q.get(timeout=wait)
+            except queue.Empty:
+                # Producers that already finished are drained; their output is all queued
+                for i in sorted(pending - finished):
+                    pending.discard(i)
+                    if on_done:
+                        on_done(producers[i][0], None, TimeoutError(f"timed out after {timeout}s"))
+                continue
+
+            if i not in pending:
+                # Late output of an abandoned producer
+                continue
+            if isinstance(item, _ProducerDone):
+                pending.discard(i)
+                if on_done:
+                    on_done(producers[i][0], item.elapsed, item.error)
+                continue
+            yield item
+    finally:
+        # Without a timeout all producers are joined, so nothing touches shared
+        # state (such as the manifest index) after the caller moves on
+        executor.shutdown(wait=deadline is None, cancel_futures=True)
+
+def find_steam_path(steam_path=None):
+    """
+    Returns the Steam install directory: steam_path if given, otherwise the
+    one registered by the Steam client.
+    """
+    if steam_path:
+        return os.path.normpath(steam_path)
+
+    hkey = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam")
+    steam_path, _ = winreg.QueryValueEx(hkey, "SteamPath")
+    winreg.CloseKey(hkey)
+
+    # Allow for paths with forward slashes
+    return os.path.normpath(steam_path)
+
+class GameRecord:
+    """
+    Compact record for a scanned game.
+
+    Uses __slots__ to keep very large libraries cheap in memory, and supports
+    read-only mapping access (record["name"], record.get("appid")) so code
+    written against the previous dict results keeps working.
+    """
+    __slots__ = ("name", "cmd", "working_dir", "platform", "appid", "executable", "app_type", "last_updated")
+
+    def __init__(self, name, cmd, working_dir, platform, appid=None, executable=None, app_type=None,
+                 last_updated=None):
+        self.name = name
+        self.cmd = cmd
+        self.working_dir = working_dir
+        self.platform = platform
+        self.appid = appid
+        # Main game binary, when known or resolved
+        self.executable = executable
+        # Steam app type from appinfo.vdf ("game", "tool", "application", ...)
+        self.app_type = app_type
+        # Unix time the launcher last installed or updated the game
+        self.last_updated = last_updated
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field) for field in cls.__slots__})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"GameRecord(name={self.name!r}, platform={self.platform!r}, appid={self.appid!r})"
+
 class GameScanner:
-    def __init__(self):
-        pass
+    def __init__(self, steam_path=None, index_path=None, max_workers=1, launchers=("steam",), launcher_timeout=None,
+                 exe_resolver=None, use_appinfo=True, appinfo_index_path=None):
+        """
+        Args:
+            steam_path (str, optional): Steam install directory. Looked up in the registry if None.
+            index_path (str, optional): Path of the persistent manifest index. Disabled if None.
+            max_workers (int, optional): Number of library folders scanned concurrently.
+                1 (the default) scans them one after another.
+            launchers (iterable, optional): Launchers scanned by scan_system, e.g.
+                ("steam", "epic", "gog", "ea", "xbox").
+            launcher_timeout (float, optional): Seconds after which a slow launcher
+                scan is abandoned. No limit if None.
+            exe_resolver (ExecutableResolver, optional): Fills in GameRecord.executable
+                for games whose launcher does not name it.
+            use_appinfo (bool, optional): Read app types and launch executables of
+                Steam games from appcache/appinfo.vdf.
+            appinfo_index_path (str, optional): Path of the persistent appinfo.vdf
+                offset index. Rebuilt on every scan if None.
+        """
+        self.steam_path = steam_path
+        self.manifest_index = ManifestIndex(index_path) if index_path else None
+        self.max_workers = max(1, max_workers or 1)
+        self.launchers = list(launchers)
+        self.launcher_timeout = launcher_timeout
+        self.exe_resolver = exe_resolver
+        self.use_appinfo = use_appinfo
+        self.appinfo_index_path = appinfo_index_path
+        self.appinfo = None
+        self.library_timings = {}
+        self.launcher_timings = {}
+        self.launcher_errors = {}
+
+    def find_steam_path(self):
+        """Returns the Steam install directory from config or the registry."""
+        return find_steam_path(self.steam_path)
 
     def scan_steam_library(self):
         """
         Scans Steam library for installed games.
-        Returns a list of dicts: {"name": str, "path": str, "platform": "steam"}
+        Returns a list of GameRecord objects in library order.
         """
-        games = []
-        try:
-            # Find Steam Path
-            hkey = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam")
-            steam_path, _ = winreg.QueryValueEx(hkey, "SteamPath")
-            winreg.CloseKey(hkey)
+        return list(self.iter_steam_library(ordered=True))
 
-            # Allow for paths with forward slashes
-            steam_path = os.path.normpath(steam_path)
+    def iter_steam_library(self, ordered=False, with_paths=False):
+        """
+        Scans Steam library for installed games, yielding each game as soon as
+        its manifest has been read.
 
-            library_vdf_path = os.path.join(steam_path, "steamapps", "libraryfolders.vdf")
-            if not os.path.exists(library_vdf_path):
-                logging.warning(f"Steam library folders file not found: {library_vdf_path}")
-                return games
+        When a manifest index is configured, only manifests that were added or
+        changed since the previous scan are parsed; removed ones are evicted.
 
-            library_paths = self._parse_library_folders(library_vdf_path)
+        Args:
+            ordered (bool, optional): With concurrent scanning, yield games in
+                library order instead of as soon as any library produces them.
+            with_paths (bool, optional): Yield (manifest path, GameRecord) pairs.
 
-            # Add main steam path if not discovered (usually it is in libraryfolders.vdf)
-            if steam_path not in library_paths:
-                 library_paths.append(steam_path)
+        Yields:
+            GameRecord: One record per installed game.
+        """
+        index = self.manifest_index
+        if index:
+            index.reset_stats()
+        seen_manifests = set()
+        self.library_timings = {}
+        complete = False
 
-            for lib_path in library_paths:
-                steamapps_path = os.path.join(lib_path, "steamapps")
-                if not os.path.exists(steamapps_path):
-                    continue
+        try:
+            library_paths = self.find_library_paths()
+            self.appinfo = self._open_appinfo()
 
-                for filename in os.listdir(steamapps_path):
-                    if filename.startswith("appmanifest_") and filename.endswith(".acf"):
-                        manifest_path = os.path.join(steamapps_path, filename)
-                        game = self._parse_app_manifest(manifest_path, steamapps_path)
-                        if game:
-                            games.append(game)
+            if self.max_workers > 1 and len(library_paths) > 1:
+                # One task per library: each drive is read sequentially by its
+                # own worker, while separate drives are read in parallel
+                producers = [
+                    (lib_path, functools.partial(self._iter_library, lib_path, seen_manifests, with_paths))
+                    for lib_path in library_paths
+                ]
+                yield from iter_concurrently(producers, self.max_workers, ordered=ordered, on_done=_raise_error)
+            else:
+                for lib_path in library_paths:
+                    yield from self._iter_library(lib_path, seen_manifests, with_paths)
+
+            complete = True
 
         except Exception as e:
             logging.error(f"Error scanning Steam library: {e}")
 
-        return games
+        finally:
+            if self.appinfo:
+                self.appinfo.close()
+                self.appinfo = None
+            if index:
+                # Only evict after a complete scan so a transient error (or a
+                # consumer that stopped early) does not wipe the index
+                if complete:
+                    index.prune(seen_manifests)
+                index.save()
+                stats = index.stats()
+                logging.info(f"Manifest index: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evicted.")
+
+    def find_library_paths(self):
+        """Returns the library folders that contain a steamapps directory."""
+        steam_path = self.find_steam_path()
+
+        library_vdf_path = os.path.join(steam_path, "steamapps", "libraryfolders.vdf")
+        if not os.path.exists(library_vdf_path):
+            logging.warning(f"Steam library folders file not found: {library_vdf_path}")
+            return []
+
+        library_paths = self._parse_library_folders(library_vdf_path)
+
+        # Add main steam path if not discovered (usually it is in libraryfolders.vdf)
+        if steam_path not in library_paths:
+             library_paths.append(steam_path)
+
+        return [p for p in library_paths if os.path.exists(os.path.join(p, "steamapps"))]
+
+    def _iter_library(self, lib_path, seen_manifests, with_paths=False):
+        """
+        Scans a single library folder, recording its scan time in library_timings.
+
+        Yields:
+            GameRecord: One record per parsable manifest, or (manifest path, GameRecord) with with_paths.
+        """
+        start = time.perf_counter()
+        steamapps_path = os.path.join(lib_path, "steamapps")
+        index = self.manifest_index
+        count = 0
+
+        for manifest_path, signature in self._list_manifests(steamapps_path):
+            seen_manifests.add(manifest_path)
+            count += 1
+            if index:
+                found, data = index.lookup(manifest_path, signature)
+                if found:
+                    game = GameRecord.from_dict(data) if data else None
+                else:
+                    game = self._parse_app_manifest(manifest_path, steamapps_path)
+                    index.store(manifest_path, signature, game.to_dict() if game else None)
+            else:
+                game = self._parse_app_manifest(manifest_path, steamapps_path)
+            if game:
+                # Applied after indexing: appinfo.vdf changes independently of the manifests
+                self._apply_appinfo(game)
+                yield (manifest_path, game) if with_paths else game
+
+        elapsed = time.perf_counter() - start
+        self.library_timings[lib_path] = elapsed
+        logging.info(f"Scanned {count} manifests in {lib_path} ({elapsed:.3f}s)")
+
+    def _open_appinfo(self):
+        """Returns an open AppInfoReader for the Steam install, or None if unavailable."""
+        if not self.use_appinfo:
+            return None
+        path = os.path.join(self.find_steam_path(), "appcache", "appinfo.vdf")
+        if not os.path.exists(path):
+            return None
+        reader = AppInfoReader(path, self.appinfo_index_path)
+        try:
+            reader.open()
+        except Exception as e:
+            logging.warning(f"Cannot read {path}: {e}")
+            return None
+        return reader
+
+    def _apply_appinfo(self, game, reader=None):
+        """Fills in the app type and launch executable of a Steam game from appinfo.vdf."""
+        reader = reader or self.appinfo
+        if not reader or not game.appid:
+            return
+        try:
+            info = reader.launch_info(game.appid)
+        except Exception as e:
+            logging.warning(f"Error reading appinfo for {game.appid}: {e}")
+            return
+        if not info:
+            return
+        game.app_type = info["type"]
+        if info["executable"] and not game.executable:
+            relative = info["executable"].replace("\\", os.sep).replace("/", os.sep)
+            game.executable = os.path.normpath(os.path.join(game.working_dir, relative))
+
+    def load_manifest(self, manifest_path, reader=None):
+        """
+        Parses a single app manifest, e.g. one reported by LibraryWatcher, adds
+        its appinfo.vdf details and resolves its executable when a resolver is
+        configured. The resolver cache is not saved; load_manifests does that
+        once per batch.
+
+        Args:
+            manifest_path (str): Path of the appmanifest_<appid>.acf file.
+            reader (AppInfoReader, optional): Open appinfo.vdf reader; self.appinfo if None.
+
+        Returns:
+            GameRecord: The game, or None if the manifest cannot be parsed.
+        """
+        game = self._parse_app_manifest(manifest_path, os.path.dirname(manifest_path))
+        if game:
+            self._apply_appinfo(game, reader)
+        if game and self.exe_resolver and not game.executable:
+            game.executable = self.exe_resolver.resolve(game.working_dir, game.name)
+        return game
+
+    def load_manifests(self, manifest_paths):
+        """
+        Parses a batch of app manifests as load_manifest does, opening
+        appinfo.vdf once for the batch and saving the resolver cache once at
+        the end.
+
+        Args:
+            manifest_paths (iterable): Paths of appmanifest_<appid>.acf files.
+
+        Yields:
+            tuple: (manifest path, GameRecord or None if it cannot be parsed).
+        """
+        reader = self.appinfo or self._open_appinfo()
+        try:
+            for manifest_path in manifest_paths:
+                yield manifest_path, self.load_manifest(manifest_path, reader)
+        finally:
+            if reader and reader is not self.appinfo:
+                reader.close()
+            if self.exe_resolver:
+                self.exe_resolver.save()
+
+    def _list_manifests(self, steamapps_path):
+        """
+        Lists app manifests in a steamapps folder with a single os.scandir.
+
+        Returns:
+            list: (manifest_path, signature) tuples sorted by file name.
+        """
+        manifests = []
+        with os.scandir(steamapps_path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("appmanifest_") and name.endswith(".acf"):
+                    # DirEntry.stat() is served from the directory listing on Windows
+                    signature = ManifestIndex.signature(entry.stat(follow_symlinks=False))
+                    manifests.append((name, entry.path, signature))
+        manifests.sort()
+        return [(path, signature) for _, path, signature in manifests]
 
     def _parse_library_folders(self, vdf_path):
         """
         Parses libraryfolders.vdf to find all library paths.
-        This is a simple parser as VDF is somewhat like JSON but not quite.
+        Supports both the current nested layout ("1" { "path" "..." }) and
+        the legacy flat layout ("1" "D:\\SteamLibrary").
         """
         paths = []
         try:
             with open(vdf_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Simple regex to find "path" "..."
-                # Modern VDF looks like: "1" { "path" "C:\\Games\\Steam" ... }
-                matches = re.findall(r'"path"\s+"([^"]+)"', content)
-                for m in matches:
-                    # Unescape double backslashes
-                    path = m.replace(r'\\', '\\')
-                    paths.append(path)
+                data = vdf.load(f)
+            folders = next(iter(data.values()), {})
+            if isinstance(folders, dict):
+                for key, value in folders.items():
+                    if isinstance(value, dict):
+                        path = value.get("path")
+                    elif key.isdigit():
+                        path = value
+                    else:
+                        path = None
+                    if path:
+                        paths.append(path)
         except Exception as e:
             logging.error(f"Error parsing libraryfolders.vdf: {e}")
         return paths
@@ -77,50 +438,108 @@ class GameScanner:
     def _parse_app_manifest(self, manifest_path, steamapps_path):
         """
         Parses an app manifest to get game details.
+        Only the header fields are read; the file is not read past them.
         """
         try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            fields = vdf.extract_file(manifest_path, MANIFEST_FIELDS)
 
-            name_match = re.search(r'"name"\s+"([^"]+)"', content)
-            install_dir_match = re.search(r'"installdir"\s+"([^"]+)"', content)
-
-            if name_match and install_dir_match:
-                name = name_match.group(1)
-                install_dir = install_dir_match.group(1)
+            name = fields.get("name")
+            install_dir = fields.get("installdir")
 
+            if name and install_dir:
                 # Construct full path
                 # Game is usually in steamapps/common/install_dir
-                full_path = os.path.join(os.path.dirname(steamapps_path), "common", install_dir)
+                full_path = os.path.join(steamapps_path, "common", install_dir)
 
                 # We need an executable. This is tricky without knowing the exact exe name.
                 # For now, we will store the directory. Sunshine can often infer or we might need to find the largest EXE.
                 # Or we can use the steam protocol command: steam://rungameid/<id>
 
-                appid_match = re.search(r'"appid"\s+"(\d+)"', content)
-                appid = appid_match.group(1) if appid_match else None
+                appid = fields.get("appid")
+                if appid and not appid.isdigit():
+                    appid = None
 
                 cmd = f"steam://rungameid/{appid}" if appid else full_path
+                last_updated = fields.get("LastUpdated")
 
-                return {
-                    "name": name,
-                    "cmd": cmd, # Using steam protocol is safer for launching
-                    "working_dir": full_path, # Not always needed for steam protocol but good to have
-                    "platform": "steam"
-                }
+                return GameRecord(
+                    name=name,
+                    cmd=cmd, # Using steam protocol is safer for launching
+                    working_dir=full_path, # Not always needed for steam protocol but good to have
+                    platform="steam",
+                    appid=appid,
+                    last_updated=int(last_updated) if last_updated and last_updated.isdigit() else None
+                )
         except Exception as e:
             logging.warning(f"Error parsing manifest {manifest_path}: {e}")
 
         return None
 
-    def scan_system(self):
+    def iter_system(self, ordered=False):
         """
-        Scans the system for all supported games.
+        Scans the system for all supported games, yielding each game as soon
+        as it is found.
+
+        Every enabled launcher runs in its own worker, so the total time is
+        close to that of the slowest launcher. A launcher that fails or
+        exceeds launcher_timeout is logged and skipped; the others still
+        complete. Per-launcher results end up in launcher_timings and
+        launcher_errors.
+
+        Args:
+            ordered (bool, optional): Yield launchers one after another in
+                configured order instead of interleaving them.
         """
-        all_games = []
-        logging.info("Scanning Steam library...")
-        all_games.extend(self.scan_steam_library())
+        self.launcher_timings = {}
+        self.launcher_errors = {}
 
-        # Add other scanners here (Epic, GOG, etc.)
+        producers = []
+        for name in self.launchers:
+            if name == "steam":
+                producers.append((name, functools.partial(self.iter_steam_library, ordered=ordered)))
+                continue
+            try:
+                scanner = launchers.load_scanner(name)
+                if not scanner.is_available():
+                    logging.info(f"{name} launcher not found, skipping.")
+                    continue
+            except Exception as e:
+                logging.error(f"Failed to load {name} scanner: {e}")
+                self.launcher_errors[name] = str(e)
+                continue
+            producers.append((name, scanner.scan))
+
+        if not producers:
+            return
+
+        def on_done(name, elapsed, error):
+            if error:
+                logging.error(f"Error scanning {name} games: {error}")
+                self.launcher_errors[name] = str(error)
+            else:
+                self.launcher_timings[name] = elapsed
+                logging.info(f"Scanned {name} games in {elapsed:.3f}s")
+
+        logging.info(f"Scanning launchers: {', '.join(name for name, _ in producers)}...")
+        games = iter_concurrently(
+            producers, len(producers), ordered=ordered, on_done=on_done, timeout=self.launcher_timeout
+        )
+        if not self.exe_resolver:
+            yield from games
+            return
+
+        try:
+            for game in games:
+                if not game.executable and game.working_dir:
+                    game.executable = self.exe_resolver.resolve(game.working_dir, game.name)
+                yield game
+        finally:
+            self.exe_resolver.save()
+            stats = self.exe_resolver.stats()
+            logging.info(f"Executable cache: {stats['hits']} hits, {stats['misses']} misses.")
 
-        return all_games
+    def scan_system(self):
+        """
+        Scans the system for all supported games.
+        """
+        return list(self.iter_system(ordered=True))
@@ -4,6 +4,11 @@ try:
 except ImportError:
     winreg = None
 
+try:
+    import win32api
+except ImportError:
+    win32api = None
+
 class GPUManager:
     """
     Configures NVIDIA settings to force dGPU usage.
@@ -80,3 +85,39 @@ class GPUManager:
         except Exception as e:
             logging.error(f"Failed to set GPU preference: {e}")
             return False
+
+    def _display_devices(self):
+        """Returns (DeviceName, DeviceString) of every display output, e.g. ("\\\\.\\DISPLAY1", "NVIDIA GeForce RTX 4060")."""
+        devices = []
+        if not win32api:
+            return devices
+        i = 0
+        while True:
+            try:
+                device = win32api.EnumDisplayDevices(None, i)
+            except Exception:
+                break
+            devices.append((device.DeviceName, device.DeviceString))
+            i += 1
+        return devices
+
+    def list_adapters(self):
+        """
+        Returns:
+            list: Names of the display adapters, e.g. "NVIDIA GeForce RTX 4060", each once.
+        """
+        adapters = []
+        for _, adapter in self._display_devices():
+            if adapter and adapter not in adapters:
+                adapters.append(adapter)
+        return adapters
+
+    def display_adapter(self, device_name):
+        """
+        Returns:
+            str: Name of the adapter driving the display device_name, or None if unknown.
+        """
+        for name, adapter in self._display_devices():
+            if name == device_name:
+                return adapter or None
+        return None
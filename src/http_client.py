@@ -0,0 +1,168 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class HttpClient:
+    """
+    Shared HTTP client for all network I/O.
+
+    Wraps a requests.Session so connections are kept alive and pooled per
+    host, applies connect/read timeouts to every request, and retries
+    connection errors, timeouts, 429 and 5xx responses with exponential
+    backoff and jitter, honoring Retry-After when the server sends it.
+    Per-host request counts and latencies are available from stats().
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, pool_size=10, connect_timeout=5.0, read_timeout=30.0, max_retries=3, backoff=0.5,
+                 max_backoff=30.0):
+        """
+        Args:
+            pool_size (int, optional): Keep-alive connections kept per host.
+            connect_timeout (float, optional): Seconds to wait for a connection.
+            read_timeout (float, optional): Seconds to wait between bytes of the response.
+            max_retries (int, optional): Retries after the first attempt.
+            backoff (float, optional): Base delay in seconds, doubled on every retry.
+            max_backoff (float, optional): Upper bound for a single delay, including Retry-After.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        # Retries are handled here so they are visible in the statistics
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method, url, rate_limiter=None, **kwargs):
+        """
+        Sends a request, retrying transient failures.
+
+        Accepts the keyword arguments of requests.Session.request. The last
+        response is returned even if it is an error; call raise_for_status()
+        as with requests.
+
+        Args:
+            rate_limiter (RateLimiter, optional): Every attempt, retries included,
+                waits for it, and 429 responses make it back off.
+
+        Raises:
+            requests.RequestException: If the last attempt failed without a response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            if rate_limiter:
+                rate_limiter.acquire()
+            start = time.perf_counter()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if rate_limiter:
+                    rate_limiter.release()
+                self._record(host, time.perf_counter() - start, error=True)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logging.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            except Exception:
+                if rate_limiter:
+                    rate_limiter.release()
+                raise
+            else:
+                self._record(host, time.perf_counter() - start, error=response.status_code >= 400)
+                if rate_limiter:
+                    rate_limiter.release(response.status_code)
+                if response.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_delay(attempt, response)
+                if rate_limiter and response.status_code == 429:
+                    rate_limiter.backoff(delay)
+                logging.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+
+            attempt += 1
+            with self._lock:
+                self._stats[host]["retries"] += 1
+            time.sleep(delay)
+
+    def _retry_delay(self, attempt, response=None):
+        """Returns the delay before the next attempt, preferring the server's Retry-After."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # HTTP date form
+                try:
+                    delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0), self.max_backoff)
+        # Exponential backoff with jitter, so parallel clients do not retry in lockstep
+        delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _record(self, host, elapsed, error=False):
+        with self._lock:
+            stats = self._stats.setdefault(
+                host, {"requests": 0, "errors": 0, "retries": 0, "total_time": 0.0, "max_time": 0.0}
+            )
+            stats["requests"] += 1
+            stats["errors"] += error
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {host: {"requests", "errors", "retries", "avg_ms", "max_ms"}}
+        """
+        with self._lock:
+            return {
+                host: {
+                    "requests": s["requests"],
+                    "errors": s["errors"],
+                    "retries": s["retries"],
+                    "avg_ms": 1000 * s["total_time"] / s["requests"] if s["requests"] else 0.0,
+                    "max_ms": 1000 * s["max_time"],
+                }
+                for host, s in self._stats.items()
+            }
+
+    def log_stats(self):
+        for host, s in sorted(self.stats().items()):
+            logging.info(f"{host}: {s['requests']} requests, {s['retries']} retries, {s['errors']} errors, "
+                         f"{s['avg_ms']:.0f} ms avg, {s['max_ms']:.0f} ms max")
+
+    def close(self):
+        self.session.close()
+
+_default_client = None
+_default_lock = threading.Lock()
+
+def default_client():
+    """Returns the process-wide HttpClient used when none is passed explicitly."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
@@ -4,9 +4,9 @@ import os
 import subprocess
 import zipfile
 
-import requests
+from .http_client import default_client
 
-def download_file(url, dest, checksum=None):
+def download_file(url, dest, checksum=None, http=None):
     """
     Downloads a file from a URL to a destination path.
 
@@ -14,13 +14,14 @@ def download_file(url, dest, checksum=None):
         url (str): The URL to download from.
         dest (str): The file path where the downloaded content will be saved.
         checksum (str, optional): The SHA256 checksum to verify the file. Defaults to None.
+        http (HttpClient, optional): Client to download with. The shared default client if None.
 
     Returns:
         bool: True if download was successful and verified, False otherwise.
     """
     try:
         logging.info(f"Downloading {url} to {dest}...")
-        response = requests.get(url, stream=True)
+        response = (http or default_client()).get(url, stream=True)
         response.raise_for_status()
         with open(dest, 'wb') as f:
             for chunk in response.iter_content(chunk_size=8192):
@@ -0,0 +1,27 @@
+import importlib
+
+# Launcher name -> "module:Class". Modules are imported only when the
+# launcher is enabled, so unused launchers cost nothing at startup.
+LAUNCHER_SCANNERS = {
+    "epic": ".epic:EpicScanner",
+    "gog": ".gog:GOGScanner",
+    "ea": ".ea:EAScanner",
+    "xbox": ".xbox:XboxScanner",
+}
+
+def load_scanner(name):
+    """
+    Imports and instantiates the scanner plugin for a launcher.
+
+    Args:
+        name (str): Launcher name, e.g. "epic".
+
+    Returns:
+        LauncherScanner: The scanner instance.
+
+    Raises:
+        KeyError: If no scanner is registered under that name.
+    """
+    module_name, class_name = LAUNCHER_SCANNERS[name].split(":")
+    module = importlib.import_module(module_name, __name__)
+    return getattr(module, class_name)()
@@ -0,0 +1,20 @@
+class LauncherScanner:
+    """
+    Common interface for launcher scanner plugins.
+
+    Subclasses set `name` and implement `scan`, which yields GameRecord
+    objects. Scanners run in worker threads; any exception they raise is
+    reported for that launcher only and does not affect the others.
+    """
+    name = None
+
+    def is_available(self):
+        """Returns False when the launcher cannot be present on this system."""
+        return True
+
+    def scan(self):
+        """
+        Yields:
+            GameRecord: One record per installed game.
+        """
+        raise NotImplementedError
@@ -0,0 +1,86 @@
+import logging
+import os
+import xml.etree.ElementTree as ET
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+from ..game_scanner import GameRecord
+from .base import LauncherScanner
+
+class EAScanner(LauncherScanner):
+    """
+    Reads EA app / Origin installs from the registry. The launch offer ids
+    come from the __Installer\\installerdata.xml file in each install folder.
+    """
+    name = "ea"
+    REG_PATHS = (r"SOFTWARE\WOW6432Node\Electronic Arts", r"SOFTWARE\WOW6432Node\EA Games")
+    # Registry entries that belong to the launcher itself
+    IGNORED_KEYS = {"EA Desktop", "EA Core", "EA Installer", "Origin"}
+
+    def is_available(self):
+        return winreg is not None
+
+    def scan(self):
+        seen = set()
+        for reg_path in self.REG_PATHS:
+            try:
+                root = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path)
+            except OSError:
+                continue
+            try:
+                i = 0
+                while True:
+                    try:
+                        key_name = winreg.EnumKey(root, i)
+                    except OSError:
+                        break
+                    i += 1
+                    if key_name in self.IGNORED_KEYS:
+                        continue
+                    game = self._read_game(root, key_name)
+                    if game and game.working_dir not in seen:
+                        seen.add(game.working_dir)
+                        yield game
+            finally:
+                winreg.CloseKey(root)
+
+    def _read_game(self, root, key_name):
+        try:
+            key = winreg.OpenKey(root, key_name)
+        except OSError:
+            return None
+        try:
+            install_dir, _ = winreg.QueryValueEx(key, "Install Dir")
+        except OSError:
+            return None
+        finally:
+            winreg.CloseKey(key)
+
+        install_dir = os.path.normpath(install_dir)
+        if not os.path.isdir(install_dir):
+            return None
+
+        offer_ids = self._read_offer_ids(install_dir)
+        cmd = f"origin2://game/launch?offerIds={','.join(offer_ids)}" if offer_ids else install_dir
+
+        return GameRecord(
+            name=key_name,
+            cmd=cmd,
+            working_dir=install_dir,
+            platform=self.name,
+            appid=offer_ids[0] if offer_ids else None
+        )
+
+    def _read_offer_ids(self, install_dir):
+        installer_data = os.path.join(install_dir, "__Installer", "installerdata.xml")
+        if not os.path.exists(installer_data):
+            return []
+        try:
+            tree = ET.parse(installer_data)
+            return [node.text.strip() for node in tree.iter("contentID") if node.text]
+        except Exception as e:
+            logging.warning(f"Error parsing {installer_data}: {e}")
+            return []
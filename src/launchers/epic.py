@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+
+from ..game_scanner import GameRecord
+from .base import LauncherScanner
+
+class EpicScanner(LauncherScanner):
+    """
+    Reads the Epic Games Launcher install manifests (*.item JSON files).
+    """
+    name = "epic"
+
+    def __init__(self, manifests_dir=None):
+        if manifests_dir is None:
+            program_data = os.environ.get("PROGRAMDATA", r"C:\ProgramData")
+            manifests_dir = os.path.join(program_data, "Epic", "EpicGamesLauncher", "Data", "Manifests")
+        self.manifests_dir = manifests_dir
+
+    def is_available(self):
+        return os.path.isdir(self.manifests_dir)
+
+    def scan(self):
+        entries = sorted(
+            (entry.name, entry.path) for entry in os.scandir(self.manifests_dir)
+            if entry.name.endswith(".item")
+        )
+        for _, path in entries:
+            game = self._parse_item(path)
+            if game:
+                yield game
+
+    def _parse_item(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.warning(f"Error parsing Epic manifest {path}: {e}")
+            return None
+
+        if data.get("bIsIncompleteInstall"):
+            return None
+        # DLC manifests point at their base game
+        app_name = data.get("AppName")
+        if data.get("MainGameAppName") and data.get("MainGameAppName") != app_name:
+            return None
+
+        name = data.get("DisplayName")
+        install_location = data.get("InstallLocation")
+        if not name or not install_location:
+            return None
+
+        launch_executable = data.get("LaunchExecutable")
+        executable = os.path.join(install_location, launch_executable) if launch_executable else None
+
+        namespace = data.get("CatalogNamespace")
+        item_id = data.get("CatalogItemId")
+        if namespace and item_id and app_name:
+            cmd = f"com.epicgames.launcher://apps/{namespace}%3A{item_id}%3A{app_name}?action=launch&silent=true"
+        else:
+            cmd = executable or install_location
+
+        return GameRecord(
+            name=name,
+            cmd=cmd,
+            working_dir=install_location,
+            platform=self.name,
+            appid=app_name,
+            executable=executable
+        )
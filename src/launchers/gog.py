@@ -0,0 +1,69 @@
+import logging
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
+
+from ..game_scanner import GameRecord
+from .base import LauncherScanner
+
+class GOGScanner(LauncherScanner):
+    """
+    Reads GOG Galaxy installs from HKLM\\SOFTWARE\\WOW6432Node\\GOG.com\\Games.
+    """
+    name = "gog"
+    REG_PATH = r"SOFTWARE\WOW6432Node\GOG.com\Games"
+
+    def is_available(self):
+        return winreg is not None
+
+    def scan(self):
+        try:
+            root = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, self.REG_PATH)
+        except OSError:
+            return
+        try:
+            i = 0
+            while True:
+                try:
+                    game_id = winreg.EnumKey(root, i)
+                except OSError:
+                    break
+                i += 1
+                game = self._read_game(root, game_id)
+                if game:
+                    yield game
+        finally:
+            winreg.CloseKey(root)
+
+    def _read_game(self, root, game_id):
+        try:
+            key = winreg.OpenKey(root, game_id)
+        except OSError:
+            return None
+        try:
+            values = {}
+            for value_name in ("gameName", "path", "exe", "dependsOn"):
+                try:
+                    values[value_name], _ = winreg.QueryValueEx(key, value_name)
+                except OSError:
+                    pass
+        finally:
+            winreg.CloseKey(key)
+
+        # DLC entries depend on their base game
+        if values.get("dependsOn"):
+            return None
+        if not values.get("gameName") or not values.get("path"):
+            logging.debug(f"Skipping incomplete GOG entry {game_id}")
+            return None
+
+        return GameRecord(
+            name=values["gameName"],
+            cmd=values.get("exe") or values["path"],
+            working_dir=values["path"],
+            platform=self.name,
+            appid=game_id,
+            executable=values.get("exe")
+        )
@@ -0,0 +1,66 @@
+import logging
+import os
+import string
+import xml.etree.ElementTree as ET
+
+from ..game_scanner import GameRecord
+from .base import LauncherScanner
+
+class XboxScanner(LauncherScanner):
+    """
+    Finds Xbox app (PC Game Pass) installs in <drive>:\\XboxGames by reading
+    each game's Content\\MicrosoftGame.config.
+    """
+    name = "xbox"
+
+    def __init__(self, roots=None):
+        self.roots = roots
+
+    def _find_roots(self):
+        if self.roots is not None:
+            return self.roots
+        roots = []
+        for letter in string.ascii_uppercase[2:]:
+            root = f"{letter}:\\XboxGames"
+            if os.path.isdir(root):
+                roots.append(root)
+        return roots
+
+    def is_available(self):
+        return bool(self._find_roots())
+
+    def scan(self):
+        for root in self._find_roots():
+            entries = sorted((entry.name, entry.path) for entry in os.scandir(root) if entry.is_dir())
+            for _, game_dir in entries:
+                game = self._parse_game_config(game_dir)
+                if game:
+                    yield game
+
+    def _parse_game_config(self, game_dir):
+        content_dir = os.path.join(game_dir, "Content")
+        config_path = os.path.join(content_dir, "MicrosoftGame.config")
+        if not os.path.exists(config_path):
+            return None
+        try:
+            root = ET.parse(config_path).getroot()
+        except Exception as e:
+            logging.warning(f"Error parsing {config_path}: {e}")
+            return None
+
+        identity = root.find("Identity")
+        visuals = root.find("ShellVisuals")
+        executable = root.find("ExecutableList/Executable")
+
+        name = visuals.get("DefaultDisplayName") if visuals is not None else None
+        name = name or os.path.basename(game_dir)
+        exe_path = os.path.join(content_dir, executable.get("Name")) if executable is not None else None
+
+        return GameRecord(
+            name=name,
+            cmd=exe_path or content_dir,
+            working_dir=content_dir,
+            platform=self.name,
+            appid=identity.get("Name") if identity is not None else None,
+            executable=exe_path
+        )
@@ -0,0 +1,126 @@
+import glob
+import logging
+import os
+
+from . import vdf
+from .title_index import canonical_title
+
+# Where localconfig.vdf keeps per-app play data
+_APPS_PATH = ("UserLocalConfigStore", "Software", "Valve", "Steam", "apps")
+
+def _child(block, key):
+    """Looks up key in a parsed VDF block case-insensitively, as Steam does."""
+    if not isinstance(block, dict):
+        return None
+    if key in block:
+        return block[key]
+    key = key.lower()
+    return next((value for name, value in block.items() if name.lower() == key), None)
+
+def _int(value):
+    return int(value) if isinstance(value, str) and value.isdigit() else 0
+
+def read_play_stats(steam_path):
+    """
+    Reads when and how long each Steam game was played from the
+    userdata/<account>/config/localconfig.vdf files of every account that
+    signed in on this machine.
+
+    Args:
+        steam_path (str): Steam install directory.
+
+    Returns:
+        dict: {appid: {"last_played": unix time, "playtime": minutes}}, with
+        the latest time and the longest playtime across accounts.
+    """
+    stats = {}
+    for path in glob.glob(os.path.join(steam_path, "userdata", "*", "config", "localconfig.vdf")):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                apps = vdf.load(f)
+        except Exception as e:
+            logging.warning(f"Failed to read {path}: {e}")
+            continue
+        for key in _APPS_PATH:
+            apps = _child(apps, key)
+        if not isinstance(apps, dict):
+            continue
+        for appid, data in apps.items():
+            if not isinstance(data, dict):
+                continue
+            entry = stats.setdefault(appid, {"last_played": 0, "playtime": 0})
+            entry["last_played"] = max(entry["last_played"], _int(_child(data, "LastPlayed")))
+            entry["playtime"] = max(entry["playtime"], _int(_child(data, "Playtime")))
+    return stats
+
+class LibraryCurator:
+    """
+    Cuts the scanned library down to the games worth showing in Moonlight.
+
+    Pinned games always come first, in the order they are pinned, so their
+    place in the app grid never moves between scans. The remaining slots up
+    to max_games go to the most recently used games: when last played, or
+    for games never played when last installed or updated, with playtime
+    and then name breaking ties. Games without play data, such as those of
+    other launchers, rank last unless pinned.
+    """
+    def __init__(self, max_games=None, pinned=(), play_stats=None):
+        """
+        Args:
+            max_games (int, optional): Most games kept, pinned ones included; pinned games
+                are kept even beyond it. No limit if None or 0.
+            pinned (iterable, optional): Titles or Steam appids that are always kept.
+            play_stats (dict, optional): Steam play data as returned by read_play_stats.
+        """
+        self.max_games = max_games or None
+        self.pinned = [str(pin) for pin in pinned]
+        self.play_stats = play_stats or {}
+        self.dropped = 0
+
+    def _pin_rank(self, game, ranks):
+        """Returns the position of the first pin matching game, or None."""
+        appid = game.get("appid") if game.get("platform") == "steam" else None
+        positions = [ranks[key] for key in (str(appid) if appid else None, canonical_title(game.get("name")))
+                     if key in ranks]
+        return min(positions) if positions else None
+
+    def recency(self, game):
+        """
+        Returns:
+            tuple: Sort key, larger for games used more recently.
+        """
+        stats = {}
+        if game.get("platform") == "steam":
+            stats = self.play_stats.get(str(game.get("appid")), {})
+        last_played = stats.get("last_played", 0)
+        return last_played or game.get("last_updated") or 0, stats.get("playtime", 0)
+
+    def curate(self, games):
+        """
+        Args:
+            games (iterable): Games, e.g. GameRecord objects.
+
+        Returns:
+            tuple: (kept games in display order, dropped games).
+        """
+        ranks = {}
+        for i, pin in enumerate(self.pinned):
+            ranks.setdefault(pin, i)
+            ranks.setdefault(canonical_title(pin), i)
+
+        pinned = []
+        others = []
+        for game in games:
+            rank = self._pin_rank(game, ranks)
+            if rank is None:
+                others.append(game)
+            else:
+                pinned.append((rank, game))
+        pinned = [game for _, game in sorted(pinned, key=lambda item: item[0])]
+        others.sort(key=lambda game: canonical_title(game.get("name")))
+        others.sort(key=self.recency, reverse=True)
+
+        slots = len(others) if self.max_games is None else max(0, self.max_games - len(pinned))
+        kept, dropped = pinned + others[:slots], others[slots:]
+        self.dropped = len(dropped)
+        return kept, dropped
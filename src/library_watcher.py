@@ -0,0 +1,176 @@
+import logging
+import os
+import time
+
+# Handle Windows-specific imports
+try:
+    import win32con
+    import win32event
+    import win32file
+except ImportError:
+    win32con = None
+    win32event = None
+    win32file = None
+
+CREATED = "created"
+CHANGED = "changed"
+DELETED = "deleted"
+
+class LibraryWatcher:
+    """
+    Watches steamapps directories for added, changed or removed app manifests.
+
+    On Windows, directory change notifications wake the watcher up; elsewhere
+    (or if they are unavailable) it falls back to polling the directories with
+    os.scandir. Either way the actual changes are found by diffing cheap
+    (mtime, size) snapshots, and bursts of events are debounced so a Steam
+    update that rewrites a manifest several times is reported once.
+    """
+    def __init__(self, directories, debounce=2.0, poll_interval=5.0, use_native=True):
+        """
+        Args:
+            directories (list): steamapps directories to watch.
+            debounce (float, optional): Seconds without further changes before a burst is reported.
+            poll_interval (float, optional): Seconds between polls when native notifications are not used.
+            use_native (bool, optional): Use Windows change notifications when available.
+        """
+        self.directories = list(directories)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.native = use_native and win32file is not None
+        self._handles = []
+        self.snapshot = self.take_snapshot()
+
+    @staticmethod
+    def _snapshot_directory(directory):
+        manifests = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("appmanifest_") and name.endswith(".acf"):
+                        stat = entry.stat(follow_symlinks=False)
+                        manifests[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logging.warning(f"Cannot read {directory}: {e}")
+        return manifests
+
+    def take_snapshot(self):
+        """Returns {manifest_path: (mtime_ns, size)} for all watched directories."""
+        snapshot = {}
+        for directory in self.directories:
+            snapshot.update(self._snapshot_directory(directory))
+        return snapshot
+
+    @staticmethod
+    def diff(old, new):
+        """
+        Compares two snapshots.
+
+        Returns:
+            dict: {manifest_path: CREATED | CHANGED | DELETED}
+        """
+        changes = {}
+        for path, signature in new.items():
+            if path not in old:
+                changes[path] = CREATED
+            elif old[path] != signature:
+                changes[path] = CHANGED
+        for path in old:
+            if path not in new:
+                changes[path] = DELETED
+        return changes
+
+    def _open_native(self):
+        flags = (win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+                 | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+                 | win32con.FILE_NOTIFY_CHANGE_SIZE)
+        try:
+            for directory in self.directories:
+                self._handles.append(win32file.FindFirstChangeNotification(directory, False, flags))
+        except Exception as e:
+            logging.warning(f"Change notifications unavailable, falling back to polling: {e}")
+            self.close()
+            self.native = False
+
+    def close(self):
+        """Releases native change notification handles."""
+        for handle in self._handles:
+            try:
+                win32file.FindCloseChangeNotification(handle)
+            except Exception:
+                pass
+        self._handles = []
+
+    def _wait_for_event(self, timeout):
+        """
+        Blocks until something may have changed or the timeout expires.
+
+        Returns:
+            bool: True if woken by a change notification (always False when polling).
+        """
+        if self.native and not self._handles:
+            self._open_native()
+        if not self.native:
+            time.sleep(min(timeout, self.poll_interval) if timeout is not None else self.poll_interval)
+            return False
+
+        wait_ms = win32event.INFINITE if timeout is None else int(timeout * 1000)
+        result = win32event.WaitForMultipleObjects(self._handles, False, wait_ms)
+        if result == win32event.WAIT_TIMEOUT:
+            return False
+        index = result - win32event.WAIT_OBJECT_0
+        if 0 <= index < len(self._handles):
+            win32file.FindNextChangeNotification(self._handles[index])
+        return True
+
+    def wait_for_changes(self, timeout=None):
+        """
+        Waits for manifest changes and returns them once they have settled.
+
+        Changes within one burst are coalesced against the snapshot taken
+        before it, so a manifest that was created and removed again is not
+        reported, and several rewrites count as a single change.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for a first change.
+
+        Returns:
+            dict: {manifest_path: CREATED | CHANGED | DELETED}, empty on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return {}
+
+            self._wait_for_event(remaining)
+            current = self.take_snapshot()
+            if current == self.snapshot:
+                continue
+
+            # Debounce: wait until the directories stop changing
+            while True:
+                time.sleep(self.debounce)
+                settled = self.take_snapshot()
+                if settled == current:
+                    break
+                current = settled
+
+            changes = self.diff(self.snapshot, current)
+            self.snapshot = current
+            if changes:
+                return changes
+
+    def watch(self, callback, should_stop=None):
+        """
+        Calls callback(changes) for every settled burst of changes until
+        should_stop() returns True or the process is interrupted.
+        """
+        try:
+            while not (should_stop and should_stop()):
+                changes = self.wait_for_changes(timeout=self.poll_interval if should_stop else None)
+                if changes:
+                    callback(changes)
+        finally:
+            self.close()
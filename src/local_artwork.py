@@ -0,0 +1,102 @@
+import logging
+import os
+import shutil
+
+# Portrait art Steam keeps in appcache/librarycache, best first
+COVER_NAMES = ("library_600x900_2x.jpg", "library_600x900.jpg", "library_600x900_2x.png", "library_600x900.png")
+
+class SteamArtworkSource:
+    """
+    Finds cover art that the Steam client has already cached locally.
+
+    Older clients store files as librarycache/<appid>_library_600x900.jpg;
+    newer ones use librarycache/<appid>/library_600x900.jpg, sometimes one
+    hashed folder deeper. Covers are hardlinked into place when possible,
+    which is instant and takes no extra disk space, and copied otherwise.
+    """
+    def __init__(self, steam_path):
+        """
+        Args:
+            steam_path (str): Steam install directory.
+        """
+        self.cache_dir = os.path.join(steam_path, "appcache", "librarycache")
+        self.hits = 0
+        self.misses = 0
+
+    def is_available(self):
+        return os.path.isdir(self.cache_dir)
+
+    def find_cover(self, appid):
+        """
+        Returns the path of the best cached portrait cover for a Steam app, or None.
+        """
+        if not appid:
+            return None
+        for name in COVER_NAMES:
+            path = os.path.join(self.cache_dir, f"{appid}_{name}")
+            if os.path.isfile(path):
+                return path
+
+        app_dir = os.path.join(self.cache_dir, str(appid))
+        if not os.path.isdir(app_dir):
+            return None
+        candidates = {}
+        try:
+            with os.scandir(app_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name in COVER_NAMES:
+                        candidates.setdefault(entry.name, entry.path)
+                    elif entry.is_dir():
+                        with os.scandir(entry.path) as sub:
+                            for sub_entry in sub:
+                                if sub_entry.is_file() and sub_entry.name in COVER_NAMES:
+                                    candidates.setdefault(sub_entry.name, sub_entry.path)
+        except OSError as e:
+            logging.warning(f"Cannot read {app_dir}: {e}")
+            return None
+        for name in COVER_NAMES:
+            if name in candidates:
+                return candidates[name]
+        return None
+
+    def copy_cover(self, appid, dest_base):
+        """
+        Places the cached cover of an app next to dest_base.
+
+        Args:
+            appid (str): Steam appid.
+            dest_base (str): Destination path without extension; the source's
+                extension (.jpg or .png) is appended.
+
+        Returns:
+            str: The destination path, or None if Steam has no cover for the app.
+        """
+        source = self.find_cover(appid)
+        if not source:
+            self.misses += 1
+            return None
+
+        dest_path = dest_base + os.path.splitext(source)[1]
+        try:
+            if os.path.exists(dest_path) and os.path.samefile(source, dest_path):
+                self.hits += 1
+                return dest_path
+            tmp_path = f"{dest_path}.tmp"
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                # Different drive or no hardlink support
+                shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, dest_path)
+        except OSError as e:
+            logging.warning(f"Failed to copy cover {source}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return dest_path
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
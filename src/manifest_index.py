@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import threading
+
+class ManifestIndex:
+    """
+    Persistent on-disk index of parsed Steam app manifests.
+
+    Entries are keyed by manifest path and validated against the file's
+    (mtime, size, inode) signature, so an unchanged manifest is never
+    re-opened. Manifests that failed to parse are cached as well (with a
+    None game) to avoid re-reading malformed files on every scan.
+    """
+    # Bumped whenever a cached record would differ from a fresh parse:
+    # 3 for GameRecord.last_updated, 4 for Steam working_dir moving from
+    # <library>/common to <library>/steamapps/common
+    VERSION = 4
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        # Libraries may be scanned from several threads at once
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def signature(stat_result):
+        """
+        Builds the change-detection signature from a stat result.
+
+        Args:
+            stat_result (os.stat_result): Usually taken from os.DirEntry.stat(),
+                which is served from the directory listing on Windows.
+
+        Returns:
+            list: [mtime_ns, size, inode]
+        """
+        return [stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino]
+
+    def load(self):
+        """Loads the index from disk. A missing or corrupt index starts empty."""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data.get("entries", {})
+            else:
+                logging.info("Manifest index version changed, rebuilding.")
+        except Exception as e:
+            logging.warning(f"Failed to load manifest index {self.index_path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        """
+        Writes the index to disk if it changed since it was loaded.
+
+        Returns:
+            bool: True if the index is persisted (or unchanged), False on error.
+        """
+        if not self._dirty:
+            return True
+        try:
+            index_dir = os.path.dirname(self.index_path)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logging.error(f"Failed to save manifest index {self.index_path}: {e}")
+            return False
+
+    def lookup(self, manifest_path, signature):
+        """
+        Looks up a manifest by path and signature.
+
+        Returns:
+            tuple: (found, game). game may be None for a cached parse failure.
+        """
+        with self._lock:
+            entry = self.entries.get(manifest_path)
+            if entry is not None and entry["sig"] == signature:
+                self.hits += 1
+                return True, entry["game"]
+            self.misses += 1
+            return False, None
+
+    def store(self, manifest_path, signature, game):
+        """Stores the parse result for a manifest."""
+        with self._lock:
+            self.entries[manifest_path] = {"sig": signature, "game": game}
+            self._dirty = True
+
+    def prune(self, seen_paths):
+        """
+        Drops entries for manifests that were not seen during the last scan.
+
+        Args:
+            seen_paths (set): Manifest paths encountered in the scan.
+
+        Returns:
+            int: Number of evicted entries.
+        """
+        removed = [path for path in self.entries if path not in seen_paths]
+        for path in removed:
+            del self.entries[path]
+        if removed:
+            self._dirty = True
+        self.evictions += len(removed)
+        return len(removed)
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Returns hit/miss/eviction counters for the current scan."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries)
+        }
@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .title_index import canonical_title
+
+# Stored as PRAGMA user_version. 2: searches keyed by canonical_title; the
+# searches of older databases are dropped as their keys no longer match
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    provider TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS searches (
+    title TEXT PRIMARY KEY,
+    result TEXT,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steam_games (
+    appid TEXT PRIMARY KEY,
+    result TEXT,
+    expires_at REAL
+);
+"""
+
+class MetadataCache:
+    """
+    SQLite store for IGDB access tokens and search results.
+
+    Search results are keyed by canonical title, the key TitleIndex merges
+    spellings under, and expire after ttl seconds.
+    Titles without a match are stored as negative entries with their own,
+    usually shorter, negative_ttl so that newly catalogued games are picked up
+    again eventually. Steam appid to IGDB game mappings never expire, as an
+    appid always names the same game; appids IGDB does not know yet are
+    retried after negative_ttl. A rescan of an unchanged library is answered
+    entirely from the cache.
+    """
+    def __init__(self, db_path, ttl=30 * 86400, negative_ttl=86400):
+        """
+        Args:
+            db_path (str): Path of the SQLite database, or ":memory:".
+            ttl (float, optional): Seconds a search result stays valid.
+            negative_ttl (float, optional): Seconds a "no match" result stays valid.
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+        db_dir = os.path.dirname(db_path) if db_path != ":memory:" else ""
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # One connection shared by all threads, serialized by the lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version < SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS searches")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def _search_key(title):
+        # Titles of only symbols have no canonical key; keep them apart
+        return canonical_title(title) or title
+
+    def get_token(self, provider="igdb"):
+        """
+        Returns:
+            tuple: (token, expires_at) if a token that is still valid is stored, else None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT token, expires_at FROM tokens WHERE provider = ?", (provider,)
+            ).fetchone()
+        if row and row[1] > time.time():
+            return row
+        return None
+
+    def set_token(self, token, expires_at, provider="igdb"):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tokens (provider, token, expires_at) VALUES (?, ?, ?)",
+                (provider, token, expires_at)
+            )
+
+    def get_search(self, title):
+        """
+        Looks up a cached search.
+
+        Returns:
+            tuple: (found, result). found is False on a miss or an expired entry;
+            result is None for a cached "no match".
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, expires_at FROM searches WHERE title = ?", (self._search_key(title),)
+            ).fetchone()
+        if not row or row[1] <= time.time():
+            self.misses += 1
+            return False, None
+        if row[0] is None:
+            self.negative_hits += 1
+            return True, None
+        self.hits += 1
+        return True, json.loads(row[0])
+
+    def set_search(self, title, result):
+        """Stores a search result; None records that the title has no match."""
+        if result is None:
+            payload, ttl = None, self.negative_ttl
+        else:
+            payload, ttl = json.dumps(result), self.ttl
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (title, result, expires_at) VALUES (?, ?, ?)",
+                (self._search_key(title), payload, time.time() + ttl)
+            )
+
+    def get_steam_game(self, appid):
+        """
+        Looks up the IGDB game mapped to a Steam appid.
+
+        Returns:
+            tuple: (found, result) as for get_search.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, expires_at FROM steam_games WHERE appid = ?", (str(appid),)
+            ).fetchone()
+        if not row or (row[1] is not None and row[1] <= time.time()):
+            self.misses += 1
+            return False, None
+        if row[0] is None:
+            self.negative_hits += 1
+            return True, None
+        self.hits += 1
+        return True, json.loads(row[0])
+
+    def set_steam_game(self, appid, result):
+        """Stores the IGDB game for a Steam appid permanently; None expires after negative_ttl."""
+        if result is None:
+            payload, expires_at = None, time.time() + self.negative_ttl
+        else:
+            payload, expires_at = json.dumps(result), None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO steam_games (appid, result, expires_at) VALUES (?, ?, ?)",
+                (str(appid), payload, expires_at)
+            )
+
+    def prune(self, everything=False):
+        """
+        Deletes expired entries, or all of them.
+
+        Returns:
+            int: Number of deleted entries.
+        """
+        now = float("inf") if everything else time.time()
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute("DELETE FROM searches WHERE expires_at <= ?", (now,)).rowcount
+                if everything:
+                    removed += self._conn.execute("DELETE FROM steam_games").rowcount
+                else:
+                    removed += self._conn.execute(
+                        "DELETE FROM steam_games WHERE expires_at <= ?", (now,)
+                    ).rowcount
+                removed += self._conn.execute("DELETE FROM tokens WHERE expires_at <= ?", (now,)).rowcount
+            self._conn.execute("VACUUM")
+        logging.info(f"Pruned {removed} metadata cache entries.")
+        return removed
+
+    def stats(self):
+        with self._lock:
+            positive, negative = self._conn.execute(
+                "SELECT COUNT(result), COUNT(*) - COUNT(result) FROM searches"
+            ).fetchone()
+            (mapped,) = self._conn.execute("SELECT COUNT(result) FROM steam_games").fetchone()
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "entries": positive,
+            "negative_entries": negative,
+            "steam_mappings": mapped,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,17 +1,55 @@
-import requests
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .http_client import default_client
+
+def _quote(text):
+    """Quotes a string for an Apicalypse query."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
 
 class IGDBMetadataProvider:
     AUTH_URL = "https://id.twitch.tv/oauth2/token"
     API_URL = "https://api.igdb.com/v4"
+    # IGDB accepts at most 10 sub-queries per multiquery request
+    MULTIQUERY_LIMIT = 10
+    SEARCH_FIELDS = "fields name,cover.url; where cover != null; limit 1;"
+    # external_games category for Steam, and the most records IGDB returns per request
+    STEAM_CATEGORY = 1
+    EXTERNAL_GAMES_LIMIT = 500
 
-    def __init__(self, client_id, client_secret):
+    def __init__(self, client_id, client_secret, cache=None, http=None, rate_limiter=None, api_url=None,
+                 auth_url=None):
+        """
+        Args:
+            client_id (str): Twitch application client ID.
+            client_secret (str): Twitch application client secret.
+            cache (MetadataCache, optional): Persists the access token and search results across runs.
+            http (HttpClient, optional): Client for all requests. The shared default client if None.
+            rate_limiter (RateLimiter, optional): Paces API requests and bounds how many
+                search_games sends at once. Requests are sent one at a time if None.
+            api_url (str, optional): Base URL of the IGDB API. API_URL if None.
+            auth_url (str, optional): Twitch OAuth token endpoint. AUTH_URL if None.
+        """
         self.client_id = client_id
         self.client_secret = client_secret
+        self.cache = cache
+        self.http = http or default_client()
+        self.rate_limiter = rate_limiter
+        self.api_url = (api_url or self.API_URL).rstrip("/")
+        self.auth_url = auth_url or self.AUTH_URL
         self.access_token = None
         self.token_expiry = 0
+        # IGDB and Twitch API requests sent by this provider
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._auth_lock = threading.Lock()
+
+    def _count_request(self):
+        with self._count_lock:
+            self.request_count += 1
 
     def authenticate(self):
         """Authenticates with Twitch to get an access token."""
@@ -19,20 +57,34 @@ class IGDBMetadataProvider:
             logging.error("IGDB Client ID or Secret is missing.")
             return False
 
+        with self._auth_lock:
+            return self._authenticate()
+
+    def _authenticate(self):
         if self.access_token and time.time() < self.token_expiry:
             return True
 
+        if self.cache:
+            cached = self.cache.get_token()
+            if cached:
+                self.access_token, self.token_expiry = cached
+                return True
+
         params = {
             "client_id": self.client_id,
             "client_secret": self.client_secret,
             "grant_type": "client_credentials"
         }
         try:
-            response = requests.post(self.AUTH_URL, params=params)
+            self._count_request()
+            # Twitch's OAuth endpoint is not subject to the IGDB API rate limit
+            response = self.http.post(self.auth_url, params=params)
             response.raise_for_status()
             data = response.json()
             self.access_token = data["access_token"]
             self.token_expiry = time.time() + data["expires_in"] - 60 # Buffer
+            if self.cache:
+                self.cache.set_token(self.access_token, self.token_expiry)
             logging.info("Successfully authenticated with IGDB.")
             return True
         except Exception as e:
@@ -44,28 +96,170 @@ class IGDBMetadataProvider:
         Searches for a game by name on IGDB.
         Returns the first match with a cover.
         """
+        if self.cache:
+            found, cached = self.cache.get_search(game_name)
+            if found:
+                return cached
+
         if not self.authenticate():
             return None
 
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.access_token}"
-        }
-
         # Search for game and get cover
-        query = f'search "{game_name}"; fields name,cover.url; where cover != null; limit 1;'
+        query = f'search {_quote(game_name)}; {self.SEARCH_FIELDS}'
 
         try:
-            response = requests.post(f"{self.API_URL}/games", headers=headers, data=query)
-            response.raise_for_status()
-            data = response.json()
-            if data:
-                return data[0]
-            return None
+            data = self._post("games", query)
+            result = data[0] if data else None
+            # Only real answers are cached; errors are retried on the next scan
+            if self.cache:
+                self.cache.set_search(game_name, result)
+            return result
         except Exception as e:
             logging.error(f"Failed to search game {game_name}: {e}")
             return None
 
+    def search_games(self, game_names):
+        """
+        Searches for several games at once, packing up to MULTIQUERY_LIMIT
+        searches into each request to the multiquery endpoint. With a rate
+        limiter, up to its max_in_flight requests are sent concurrently at
+        the allowed rate.
+
+        Args:
+            game_names (iterable): Game names to look up.
+
+        Returns:
+            dict: {name: first match with a cover, or None}
+        """
+        results = {}
+        pending = []
+        for name in dict.fromkeys(game_names):
+            if self.cache:
+                found, cached = self.cache.get_search(name)
+                if found:
+                    results[name] = cached
+                    continue
+            pending.append(name)
+
+        if pending and not self.authenticate():
+            pending = []
+
+        batches = [pending[i:i + self.MULTIQUERY_LIMIT] for i in range(0, len(pending), self.MULTIQUERY_LIMIT)]
+        workers = min(self.rate_limiter.max_in_flight, len(batches)) if self.rate_limiter else 1
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for batch_results in executor.map(self._search_batch, batches):
+                    results.update(batch_results)
+        else:
+            for batch in batches:
+                results.update(self._search_batch(batch))
+        return results
+
+    def lookup_steam_games(self, appids):
+        """
+        Resolves Steam appids to IGDB games through IGDB's external_games
+        records, up to EXTERNAL_GAMES_LIMIT appids per request. Unlike a title
+        search this is exact, and resolved appids are cached permanently.
+
+        Args:
+            appids (iterable): Steam appids.
+
+        Returns:
+            dict: {appid: game data like search_game returns, or None if IGDB
+            has no record of the appid or the lookup failed}
+        """
+        results = {}
+        pending = []
+        for appid in dict.fromkeys(str(appid) for appid in appids if appid):
+            if self.cache:
+                found, cached = self.cache.get_steam_game(appid)
+                if found:
+                    results[appid] = cached
+                    continue
+            pending.append(appid)
+
+        if pending and not self.authenticate():
+            pending = []
+
+        for start in range(0, len(pending), self.EXTERNAL_GAMES_LIMIT):
+            batch = pending[start:start + self.EXTERNAL_GAMES_LIMIT]
+            uids = ",".join(_quote(appid) for appid in batch)
+            query = (f"fields uid,game.name,game.cover.url; "
+                     f"where category = {self.STEAM_CATEGORY} & uid = ({uids}); limit {self.EXTERNAL_GAMES_LIMIT};")
+            try:
+                data = self._post("external_games", query)
+            except Exception as e:
+                logging.error(f"Failed to look up {len(batch)} Steam games: {e}")
+                results.update((appid, None) for appid in batch)
+                continue
+
+            found = {}
+            for record in data:
+                game = record.get("game")
+                if isinstance(game, dict):
+                    found.setdefault(record.get("uid"), game)
+            for appid in batch:
+                game = found.get(appid)
+                if self.cache:
+                    self.cache.set_steam_game(appid, game)
+                results[appid] = game
+        return results
+
+    def _search_batch(self, batch):
+        """Runs up to MULTIQUERY_LIMIT searches in one multiquery request."""
+        # Sub-queries are named by their position in the batch
+        query = "".join(
+            f'query games "{i}" {{ search {_quote(name)}; {self.SEARCH_FIELDS} }};\n'
+            for i, name in enumerate(batch)
+        )
+        try:
+            data = self._post("multiquery", query)
+        except Exception as e:
+            logging.error(f"Failed to search {len(batch)} games: {e}")
+            return {name: None for name in batch}
+
+        results = {}
+        answers = {item.get("name"): item.get("result") for item in data}
+        for i, name in enumerate(batch):
+            matches = answers.get(str(i))
+            result = matches[0] if matches else None
+            if self.cache and matches is not None:
+                self.cache.set_search(name, result)
+            results[name] = result
+        return results
+
+    def _post(self, endpoint, query):
+        """Sends an Apicalypse query and returns the decoded JSON response."""
+        token = self.access_token
+        response = self._send(endpoint, query, token)
+        if response.status_code == 401:
+            # The token expired early or was revoked; authenticate again and retry once
+            self._drop_token(token)
+            if self.authenticate():
+                response = self._send(endpoint, query, self.access_token)
+        response.raise_for_status()
+        return response.json()
+
+    def _send(self, endpoint, query, token):
+        headers = {
+            "Client-ID": self.client_id,
+            "Authorization": f"Bearer {token}"
+        }
+        self._count_request()
+        return self.http.post(
+            f"{self.api_url}/{endpoint}", headers=headers, data=query, rate_limiter=self.rate_limiter
+        )
+
+    def _drop_token(self, token):
+        """Forgets a rejected token, unless another thread has already replaced it."""
+        with self._auth_lock:
+            if self.access_token != token:
+                return
+            self.access_token = None
+            self.token_expiry = 0
+            if self.cache:
+                self.cache.set_token("", 0)
+
     def get_cover_art(self, game_data):
         """Extracts the cover art URL from game data."""
         if not game_data or "cover" not in game_data or "url" not in game_data["cover"]:
@@ -81,13 +275,18 @@ class IGDBMetadataProvider:
 
     def download_cover_art(self, url, save_path):
         """Downloads the cover art to the specified path."""
+        tmp_path = f"{save_path}.part"
         try:
-            response = requests.get(url, stream=True)
+            response = self.http.get(url, stream=True)
             response.raise_for_status()
-            with open(save_path, 'wb') as f:
+            with open(tmp_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
+            # Never leave a truncated image at save_path
+            os.replace(tmp_path, save_path)
             return True
         except Exception as e:
             logging.error(f"Failed to download cover art from {url}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
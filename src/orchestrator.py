@@ -3,19 +3,40 @@ import logging
 import os
 import sys
 import time
+from collections import namedtuple
 
 from .config import Config
+from .app_classifier import AppClassifier
+from .cover_downloader import CoverDownloader
+from .cover_normalizer import CoverNormalizer
 from .display_manager import DisplayManager
 from .gpu_manager import GPUManager
+from .http_client import HttpClient
+from .rate_limiter import RateLimiter
 from .installer import download_file, extract_zip, install_driver
-from .game_scanner import GameScanner
+from .library_curator import LibraryCurator, read_play_stats
+from .library_watcher import DELETED, LibraryWatcher
+from .exe_resolver import ExecutableResolver
+from .game_scanner import GameScanner, find_steam_path
+from .local_artwork import SteamArtworkSource
+from .metadata_cache import MetadataCache
 from .metadata_provider import IGDBMetadataProvider
+from .sunshine_api import SunshineApiManager
+from .sunshine_conf import encoder_profile
 from .sunshine_manager import SunshineManager
+from .title_index import TitleIndex, canonical_title
 from .utils import setup_logging
 
 # Configure logging
 setup_logging()
 
+# Components shared by scan_games and watch_games; artwork, downloader and
+# normalizer are optional and may be None
+GamePipeline = namedtuple(
+    "GamePipeline",
+    ["metadata_provider", "sunshine_manager", "covers_dir", "artwork", "downloader", "normalizer"]
+)
+
 class Orchestrator:
     """
     Main orchestrator for handling the streaming lifecycle.
@@ -24,6 +45,12 @@ class Orchestrator:
         self.config = Config()
         self.display_manager = DisplayManager()
         self.gpu_manager = GPUManager()
+        self.http = HttpClient(
+            pool_size=self.config.get("http_pool_size"),
+            connect_timeout=self.config.get("http_connect_timeout"),
+            read_timeout=self.config.get("http_read_timeout"),
+            max_retries=self.config.get("http_max_retries")
+        )
 
         self.sunshine_path = self.config.get("sunshine_path")
         self.driver_tool_path = self.config.get("driver_tool_path")
@@ -69,6 +96,10 @@ class Orchestrator:
             logging.error("Failed to set resolution. Aborting setup.")
             return
 
+        # Match Sunshine's encoder to the GPU behind the virtual display
+        if self.config.get("tune_encoder"):
+            self.tune_encoder(virtual_display_device)
+
         # 4. Turn off physical display
         logging.info("Turning off physical display...")
         if not self.display_manager.toggle_physical_display(enable=False):
@@ -76,6 +107,36 @@ class Orchestrator:
 
         logging.info("Setup complete. Ready for streaming.")
 
+    def tune_encoder(self, device_name=None):
+        """
+        Writes encoder settings for the detected GPUs to sunshine.conf.
+
+        The profile is chosen by encoder_profile; entries in encoder_settings
+        override it, and None there drops a key. Unchanged keys are not
+        touched. Sunshine reads sunshine.conf when it starts.
+
+        Args:
+            device_name (str, optional): Device name of the virtual display.
+
+        Returns:
+            dict: {key: (old value, new value)} for the changed settings, or None on failure.
+        """
+        adapters = self.gpu_manager.list_adapters()
+        display_adapter = self.gpu_manager.display_adapter(device_name) if device_name else None
+        settings = encoder_profile(adapters, display_adapter=display_adapter, output_name=device_name)
+        settings.update(self.config.get("encoder_settings") or {})
+        if settings.get("encoder"):
+            logging.info(f"Encoder profile for {settings.get('adapter_name', 'the CPU')}: {settings['encoder']}")
+        else:
+            logging.info("No known GPU detected, leaving the encoder choice to Sunshine.")
+
+        diff = SunshineManager(self.sunshine_path).update_conf(settings)
+        if diff:
+            logging.info("Restart Sunshine for the new encoder settings to take effect.")
+        elif diff is not None:
+            logging.info("Sunshine encoder settings are up to date.")
+        return diff
+
     def stop(self):
         """
         Stops the streaming setup and reverts changes.
@@ -94,61 +155,489 @@ class Orchestrator:
 
         logging.info("Teardown complete.")
 
-    def scan_games(self):
+    def _create_scanner(self):
+        """Builds a GameScanner from the current configuration."""
+        cache_dir = self.config.get_path("cache_path")
+        exe_resolver = None
+        if self.config.get("resolve_executables"):
+            exe_resolver = ExecutableResolver(os.path.join(cache_dir, "exe_cache.json"))
+        return GameScanner(
+            steam_path=self.config.get("steam_path") or None,
+            index_path=os.path.join(cache_dir, "manifest_index.json"),
+            max_workers=self.config.get("scan_workers"),
+            launchers=self.config.get("launchers"),
+            launcher_timeout=self.config.get("launcher_timeout"),
+            exe_resolver=exe_resolver,
+            use_appinfo=self.config.get("use_appinfo"),
+            appinfo_index_path=os.path.join(cache_dir, "appinfo_index.json")
+        )
+
+    def _init_game_pipeline(self):
         """
-        Scans for games, fetches metadata from IGDB, and updates Sunshine config.
+        Sets up the metadata provider, Sunshine manager, covers directory and
+        cover sources and stages shared by scan_games and watch_games.
+
+        Returns:
+            GamePipeline: The pipeline, or None on failure. artwork is None when
+            local Steam artwork is disabled or missing, normalizer when cover
+            normalization is disabled or Pillow is not installed.
         """
         client_id = self.config.get("igdb_client_id")
         client_secret = self.config.get("igdb_client_secret")
 
         if not client_id or not client_secret:
             logging.error("IGDB credentials not found. Please set IGDB_CLIENT_ID and IGDB_CLIENT_SECRET in environment or config.")
-            return
-
-        logging.info("Initializing game scanner...")
-        scanner = GameScanner()
-        games = scanner.scan_system()
-        logging.info(f"Found {len(games)} games.")
+            return None
 
         logging.info("Initializing metadata provider...")
-        metadata_provider = IGDBMetadataProvider(client_id, client_secret)
+        metadata_provider = IGDBMetadataProvider(
+            client_id, client_secret, cache=self._create_metadata_cache(), http=self.http,
+            rate_limiter=RateLimiter(
+                rate=self.config.get("igdb_rate_limit"), max_in_flight=self.config.get("igdb_max_in_flight")
+            ),
+            api_url=self.config.get("igdb_api_url"),
+            auth_url=self.config.get("igdb_auth_url")
+        )
         if not metadata_provider.authenticate():
             logging.error("Failed to authenticate with IGDB. Aborting.")
-            return
+            return None
 
         logging.info("Initializing Sunshine manager...")
-        sunshine_manager = SunshineManager(self.sunshine_path)
+        sunshine_manager = self._create_sunshine_manager()
 
         # Create covers directory
         covers_dir = os.path.join(os.path.dirname(sunshine_manager.config_path), "covers")
         os.makedirs(covers_dir, exist_ok=True)
 
-        for game in games:
-            name = game["name"]
-            logging.info(f"Processing {name}...")
+        downloader = CoverDownloader(
+            os.path.join(self.config.get_path("cache_path"), "covers.json"),
+            http=self.http,
+            max_workers=self.config.get("cover_download_workers")
+        )
+        normalizer = None
+        if self.config.get("normalize_covers"):
+            if CoverNormalizer.is_available():
+                normalizer = CoverNormalizer(
+                    os.path.join(covers_dir, "boxart"),
+                    size=self.config.get("cover_size"),
+                    max_workers=self.config.get("cover_workers")
+                )
+            else:
+                logging.info("Pillow is not installed, covers are used as downloaded.")
+        return GamePipeline(
+            metadata_provider, sunshine_manager, covers_dir, self._create_artwork_source(), downloader, normalizer
+        )
+
+    def _create_sunshine_manager(self):
+        """
+        Returns the Sunshine backend: the admin API when credentials are
+        configured and it answers, so changes apply without a restart, and
+        otherwise the apps.json file backend, which the API backend also
+        falls back to.
+        """
+        file_manager = SunshineManager(self.sunshine_path)
+        username = self.config.get("sunshine_api_username")
+        if self.config.get("sunshine_backend") == "file" or not username:
+            return file_manager
+
+        api_manager = SunshineApiManager(
+            self.config.get("sunshine_api_url"),
+            username,
+            self.config.get("sunshine_api_password"),
+            verify=self.config.get("sunshine_api_verify"),
+            fallback=file_manager
+        )
+        if api_manager.is_available():
+            logging.info(f"Using the Sunshine API at {api_manager.base_url}")
+            return api_manager
+        logging.warning(f"Sunshine API at {api_manager.base_url} is not available, editing apps.json instead.")
+        api_manager.close()
+        return file_manager
+
+    def _create_classifier(self):
+        """Returns the AppClassifier that keeps non-game entries out of Sunshine, or None if disabled."""
+        if not self.config.get("exclude_non_games"):
+            return None
+        return AppClassifier(
+            excluded_appids=self.config.get("excluded_appids"),
+            excluded_names=self.config.get("excluded_names")
+        )
+
+    def _create_curator(self, scanner):
+        """
+        Returns the LibraryCurator that caps and orders the app list, or None
+        if neither max_games nor pinned_games is set.
+        """
+        max_games = self.config.get("max_games")
+        pinned = self.config.get("pinned_games") or []
+        if not max_games and not pinned:
+            return None
+        try:
+            play_stats = read_play_stats(scanner.find_steam_path())
+        except Exception as e:
+            logging.info(f"Steam play data not available, ranking by update time only: {e}")
+            play_stats = {}
+        return LibraryCurator(max_games=max_games, pinned=pinned, play_stats=play_stats)
+
+    def _create_metadata_cache(self):
+        """Opens the persistent IGDB token and search cache."""
+        return MetadataCache(
+            os.path.join(self.config.get_path("cache_path"), "metadata.sqlite3"),
+            ttl=self.config.get("metadata_cache_ttl"),
+            negative_ttl=self.config.get("metadata_negative_ttl")
+        )
+
+    def _create_artwork_source(self):
+        """Returns a SteamArtworkSource for the local Steam install, or None."""
+        if not self.config.get("local_artwork"):
+            return None
+        try:
+            steam_path = find_steam_path(self.config.get("steam_path") or None)
+        except Exception as e:
+            logging.info(f"Steam not found, local artwork disabled: {e}")
+            return None
+        artwork = SteamArtworkSource(steam_path)
+        return artwork if artwork.is_available() else None
+
+    @staticmethod
+    def _cover_base(covers_dir, name):
+        """Returns the cover path for a game, without extension."""
+        # Sanitize filename
+        safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
+        return os.path.join(covers_dir, safe_name)
+
+    def _local_cover(self, game, covers_dir, artwork):
+        """Copies Steam's own cached art into covers_dir; returns its path or ""."""
+        if not artwork or game.get("platform") != "steam":
+            return ""
+        image_path = artwork.copy_cover(game.get("appid"), self._cover_base(covers_dir, game["name"])) or ""
+        if image_path:
+            logging.info(f"Using local Steam cover for {game['name']}")
+        return image_path
+
+    def _add_game(self, game, sunshine_manager, image_path):
+        """Adds a processed game to Sunshine."""
+        # Run the game itself on the dGPU, not only Sunshine
+        if self.config.get("game_gpu_preference") and game.get("executable"):
+            self.gpu_manager.force_high_performance(game["executable"])
+
+        # Update Sunshine
+        sunshine_manager.add_game(game["name"], game["cmd"], game["working_dir"], image_path)
+
+    def _add_games(self, games, sunshine_manager, image_paths, order=False):
+        """
+        Adds processed games to Sunshine with a single apps.json update.
+
+        Args:
+            order (bool, optional): List the games' apps in the order of games.
+
+        Returns:
+            dict: Counts as returned by SunshineManager.add_games, or None on failure.
+        """
+        if self.config.get("game_gpu_preference"):
+            for game in games:
+                if game.get("executable"):
+                    self.gpu_manager.force_high_performance(game["executable"])
+        return sunshine_manager.add_games(
+            [(game["name"], game["cmd"], game["working_dir"], image_path)
+             for game, image_path in zip(games, image_paths)],
+            order=order
+        )
+
+    @staticmethod
+    def _find_metadata(games, metadata_provider):
+        """
+        Looks up IGDB data for several games: Steam games are matched exactly
+        by appid, and only games left without a match are searched by title.
+
+        Returns:
+            list: Game data or None, in the order of games.
+        """
+        def steam_appid(game):
+            return str(game.get("appid")) if game.get("platform") == "steam" and game.get("appid") else None
+
+        appids = [steam_appid(game) for game in games]
+        by_appid = metadata_provider.lookup_steam_games([a for a in appids if a]) if any(appids) else {}
+        results = [by_appid.get(appid) if appid else None for appid in appids]
+
+        names = [game["name"] for game, result in zip(games, results) if result is None]
+        by_name = metadata_provider.search_games(names) if names else {}
+        return [result if result is not None else by_name.get(game["name"]) for game, result in zip(games, results)]
+
+    def _process_game(self, game, metadata_provider, sunshine_manager, covers_dir, artwork=None, downloader=None,
+                      normalizer=None):
+        """
+        Fetches metadata and cover art for one game and adds it to Sunshine.
+
+        Args:
+            downloader (CoverDownloader, optional): Downloads covers only when they
+                changed. metadata_provider.download_cover_art is used if None.
+            normalizer (CoverNormalizer, optional): Resizes the cover to box art size.
+        """
+        name = game["name"]
+        logging.info(f"Processing {name}...")
+
+        # Steam's own cached art needs no network round trip
+        image_path = self._local_cover(game, covers_dir, artwork)
 
-            # Search IGDB
-            game_data = metadata_provider.search_game(name)
-            image_path = ""
+        if not image_path:
+            # Look up IGDB
+            game_data = self._find_metadata([game], metadata_provider)[0]
 
             if game_data:
                 cover_url = metadata_provider.get_cover_art(game_data)
                 if cover_url:
-                    # Sanitize filename
-                    safe_name = "".join([c for c in name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-                    local_cover_path = os.path.join(covers_dir, f"{safe_name}.jpg")
+                    local_cover_path = self._cover_base(covers_dir, name) + ".jpg"
 
-                    if metadata_provider.download_cover_art(cover_url, local_cover_path):
+                    if downloader:
+                        image_path = downloader.download(cover_url, local_cover_path) or ""
+                    elif metadata_provider.download_cover_art(cover_url, local_cover_path):
                         image_path = local_cover_path
+                    if image_path:
                         logging.info(f"Downloaded cover for {name}")
             else:
                 logging.warning(f"No metadata found for {name}")
 
-            # Update Sunshine
-            sunshine_manager.add_game(name, game["cmd"], game["working_dir"], image_path)
+        if image_path and normalizer:
+            image_path = normalizer.normalize(image_path)
+
+        self._add_game(game, sunshine_manager, image_path)
+
+    def _process_batch(self, games, metadata_provider, sunshine_manager, covers_dir, artwork=None, downloader=None,
+                       normalizer=None):
+        """
+        Finds covers for a batch of games: IGDB is queried in as few requests
+        as possible, the missing covers are downloaded concurrently and all
+        covers are normalized in parallel worker processes. The games are
+        not added to Sunshine; see _add_games.
+
+        Returns:
+            list: Cover path of each game, "" where none was found.
+        """
+        image_paths = [self._local_cover(game, covers_dir, artwork) for game in games]
+        missing = [i for i, image_path in enumerate(image_paths) if not image_path]
+        metadata = self._find_metadata([games[i] for i in missing], metadata_provider)
+
+        jobs = {}
+        for i, game_data in zip(missing, metadata):
+            game = games[i]
+            cover_url = metadata_provider.get_cover_art(game_data) if game_data else None
+            if cover_url:
+                jobs[i] = (cover_url, self._cover_base(covers_dir, game["name"]) + ".jpg")
+            else:
+                logging.warning(f"No metadata found for {game['name']}")
+        if downloader:
+            downloaded = downloader.download_many(list(jobs.values()))
+        else:
+            downloaded = {
+                dest: dest if metadata_provider.download_cover_art(url, dest) else None
+                for url, dest in jobs.values()
+            }
+
+        for i in jobs:
+            image_paths[i] = downloaded.get(jobs[i][1]) or ""
+
+        if normalizer:
+            normalized = normalizer.normalize_many([path for path in image_paths if path])
+            image_paths = [normalized.get(path, path) for path in image_paths]
+
+        return image_paths
 
+    def scan_games(self):
+        """
+        Scans for games, fetches metadata from IGDB, and updates Sunshine config.
+        """
+        pipeline = self._init_game_pipeline()
+        if not pipeline:
+            return
+
+        logging.info("Initializing game scanner...")
+        scanner = self._create_scanner()
+        classifier = self._create_classifier()
+        curator = self._create_curator(scanner)
+
+        # Games are processed in batches as the scanner yields them, so lookups
+        # start before the slowest library has been read while each batch
+        # costs only a few multiquery requests. Batches hold canonical title
+        # keys, so every distinct game is looked up once however many
+        # launchers installed it. Curation ranks the whole library, so it
+        # waits for the scan, and only the games it keeps are looked up.
+        titles = TitleIndex(self.config.get("launcher_preference"))
+        batch_size = max(1, self.config.get("igdb_batch_size"))
+        batch = []
+
+        def process(keys):
+            image_paths = self._process_batch([titles.get(key) for key in keys], *pipeline)
+            titles.covers.update(zip(keys, image_paths))
+
+        try:
+            for game in scanner.iter_system():
+                if classifier and not classifier.is_game(game):
+                    continue
+                key, status, other = titles.add(game)
+                if status == TitleIndex.DUPLICATE:
+                    logging.info(f"Skipping {game['name']} ({game['platform']}), "
+                                 f"already found as {other['name']} ({other['platform']}).")
+                    continue
+                if status == TitleIndex.REPLACED:
+                    # A processed title keeps its cover; a pending batch picks up the preferred entry
+                    logging.info(f"Preferring {game['name']} ({game['platform']}) "
+                                 f"over {other['name']} ({other['platform']}).")
+                    continue
+                batch.append(key)
+                if not curator and len(batch) >= batch_size:
+                    process(batch)
+                    batch = []
+            dropped = []
+            if curator:
+                games, dropped = curator.curate(titles.games())
+                batch = [canonical_title(game["name"]) for game in games]
+            for start in range(0, len(batch), batch_size):
+                process(batch[start:start + batch_size])
+        finally:
+            if pipeline.normalizer:
+                pipeline.normalizer.close()
+
+        # apps.json is read, merged and written once for the whole library
+        if curator:
+            image_paths = [titles.covers.get(key, "") for key in batch]
+            self._add_games(games, pipeline.sunshine_manager, image_paths, order=True)
+            if dropped:
+                # Games that fell out of the selection since the last scan
+                pipeline.sunshine_manager.remove_games([game["name"] for game in dropped])
+        else:
+            image_paths = [titles.covers.get(key, "") for key in titles.entries]
+            self._add_games(titles.games(), pipeline.sunshine_manager, image_paths)
+
+        logging.info(f"Found {len(titles)} games ({titles.duplicates} duplicates merged).")
+        if curator:
+            logging.info(f"Kept {len(games)} games for Sunshine, left out {len(dropped)} played least recently.")
+        if classifier:
+            classifier.log_stats()
+        metadata_provider = pipeline.metadata_provider
+        logging.info(f"Made {metadata_provider.request_count} IGDB requests.")
+        if metadata_provider.rate_limiter and metadata_provider.rate_limiter.throttled:
+            logging.warning(f"IGDB rate limited {metadata_provider.rate_limiter.throttled} requests.")
+        self.http.log_stats()
+        cache = metadata_provider.cache
+        if cache:
+            stats = cache.stats()
+            logging.info(f"Metadata cache: {stats['hits']} hits, {stats['negative_hits']} cached misses, "
+                         f"{stats['misses']} lookups.")
+        artwork = pipeline.artwork
+        if artwork:
+            stats = artwork.stats()
+            logging.info(f"Local Steam covers: {stats['hits']} used, {stats['misses']} not cached locally.")
+        downloader = pipeline.downloader
+        if downloader:
+            downloader.save()
+            stats = downloader.stats()
+            logging.info(f"Cover downloads: {stats['downloaded']} downloaded ({stats['bytes'] / 1024:.0f} KiB), "
+                         f"{stats['not_modified']} unchanged, {stats['deduplicated']} duplicates, "
+                         f"{stats['failed']} failed.")
+        if pipeline.normalizer:
+            stats = pipeline.normalizer.stats()
+            logging.info(f"Cover normalization: {stats['processed']} processed, {stats['cached']} cached, "
+                         f"{stats['failed']} failed.")
         logging.info("Game scan and update complete.")
 
+    def watch_games(self, should_stop=None):
+        """
+        Watches the Steam libraries and pushes only added, changed or removed
+        games through metadata lookup and Sunshine, instead of full rescans.
+
+        Args:
+            should_stop (callable, optional): Returns True to end the watch. Runs until interrupted if None.
+        """
+        pipeline = self._init_game_pipeline()
+        if not pipeline:
+            return
+        sunshine_manager = pipeline.sunshine_manager
+
+        scanner = self._create_scanner()
+        classifier = self._create_classifier()
+        try:
+            library_paths = scanner.find_library_paths()
+        except Exception as e:
+            logging.error(f"Failed to locate Steam libraries: {e}")
+            return
+        if not library_paths:
+            logging.error("No Steam libraries found to watch.")
+            return
+
+        steamapps_dirs = [os.path.join(lib_path, "steamapps") for lib_path in library_paths]
+        watcher = LibraryWatcher(
+            steamapps_dirs,
+            debounce=self.config.get("watch_debounce"),
+            poll_interval=self.config.get("watch_poll_interval")
+        )
+
+        # Remember names of installed games so removals can be applied. One
+        # library pass reuses the manifest index and opens appinfo.vdf once;
+        # executables are not needed for names.
+        known_games = {}
+        for manifest_path, game in scanner.iter_steam_library(with_paths=True):
+            if not classifier or classifier.is_game(game):
+                known_games[manifest_path] = game["name"]
+
+        def on_changes(changes):
+            logging.info(f"Detected {len(changes)} library change(s).")
+            changed = []
+            for manifest_path, change in sorted(changes.items()):
+                if change != DELETED:
+                    changed.append(manifest_path)
+                    continue
+                name = known_games.pop(manifest_path, None)
+                if name:
+                    logging.info(f"{name} was uninstalled.")
+                    sunshine_manager.remove_game(name)
+
+            for manifest_path, game in scanner.load_manifests(changed):
+                if not game:
+                    continue
+                old_name = known_games.get(manifest_path)
+                if old_name and old_name != game["name"]:
+                    sunshine_manager.remove_game(old_name)
+                if classifier and not classifier.is_game(game):
+                    known_games.pop(manifest_path, None)
+                    continue
+                known_games[manifest_path] = game["name"]
+                self._process_game(game, *pipeline)
+            if pipeline.downloader:
+                pipeline.downloader.save()
+            if classifier:
+                classifier.log_stats()
+                classifier.reset_stats()
+
+        if classifier:
+            classifier.log_stats()
+            classifier.reset_stats()
+        mode = "change notifications" if watcher.native else f"polling every {watcher.poll_interval}s"
+        logging.info(f"Watching {len(steamapps_dirs)} Steam libraries ({mode}). Press Ctrl+C to stop.")
+        try:
+            watcher.watch(on_changes, should_stop=should_stop)
+        except KeyboardInterrupt:
+            logging.info("Stopped watching.")
+        finally:
+            if pipeline.normalizer:
+                pipeline.normalizer.close()
+
+    def prune_cache(self, everything=False):
+        """
+        Removes expired entries from the metadata cache.
+
+        Args:
+            everything (bool, optional): Empty the cache instead.
+        """
+        cache = self._create_metadata_cache()
+        try:
+            removed = cache.prune(everything=everything)
+            stats = cache.stats()
+            logging.info(f"Removed {removed} entries; {stats['entries']} results and "
+                         f"{stats['negative_entries']} cached misses remain.")
+        finally:
+            cache.close()
+
     def install(self):
         """
         Installs necessary dependencies.
@@ -176,7 +665,7 @@ class Orchestrator:
             os.makedirs(deps_dir)
 
         # Download
-        if download_file(driver_url, zip_path, checksum=driver_checksum):
+        if download_file(driver_url, zip_path, checksum=driver_checksum, http=self.http):
             # Extract
             if extract_zip(zip_path, deps_dir):
                 logging.info(f"Dependencies extracted to {deps_dir}")
@@ -213,6 +702,13 @@ def main():
 
     scan_parser = subparsers.add_parser("scan", help="Scan for games and update Sunshine")
 
+    watch_parser = subparsers.add_parser("watch", help="Watch Steam libraries and update Sunshine as games change")
+
+    prune_parser = subparsers.add_parser("prune-cache", help="Remove expired entries from the metadata cache")
+    prune_parser.add_argument("--all", action="store_true", help="Remove all entries, not only expired ones")
+
+    tune_parser = subparsers.add_parser("tune-encoder", help="Pick Sunshine encoder settings for the detected GPUs")
+
     args = parser.parse_args()
 
     orchestrator = Orchestrator()
@@ -225,6 +721,12 @@ def main():
         orchestrator.install()
     elif args.command == "scan":
         orchestrator.scan_games()
+    elif args.command == "watch":
+        orchestrator.watch_games()
+    elif args.command == "tune-encoder":
+        orchestrator.tune_encoder()
+    elif args.command == "prune-cache":
+        orchestrator.prune_cache(everything=args.all)
     else:
         parser.print_help()
         sys.exit(1)
@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+
+class RateLimiter:
+    """
+    Paces requests at a fixed interval, with a cap on requests in flight,
+    shared by worker threads.
+
+    Request starts are spaced 1/rate seconds apart, with no burst capacity,
+    so concurrent searches run right at the API's limit instead of tripping
+    it. A 429
+    response pauses every caller for the server's Retry-After delay and
+    halves the rate; each later success adds a little of it back, so the
+    limiter settles just below whatever rate the server actually allows.
+    """
+    def __init__(self, rate=4.0, max_in_flight=8, min_rate=0.5):
+        """
+        Args:
+            rate (float, optional): Maximum requests per second.
+            max_in_flight (int, optional): Maximum requests open at once.
+            min_rate (float, optional): Lower bound when backing off after 429s.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.max_in_flight = max(1, max_in_flight)
+        self.throttled = 0
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self._paused_until = 0.0
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        self._slots.acquire()
+        with self._lock:
+            # Reserve the next free start time, then sleep outside the lock
+            now = time.monotonic()
+            start = max(now, self._next_start, self._paused_until)
+            self._next_start = start + 1 / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, status_code=None):
+        """
+        Frees the request's slot and adapts the rate to its outcome.
+
+        Args:
+            status_code (int, optional): HTTP status of the response; None if the request failed.
+        """
+        try:
+            if status_code is not None and status_code != 429:
+                with self._lock:
+                    # Additive increase back towards the configured rate
+                    self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+        finally:
+            self._slots.release()
+
+    def backoff(self, delay):
+        """Pauses all callers for delay seconds and halves the rate after a 429."""
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.rate = max(self.min_rate, self.rate / 2)
+            rate = self.rate
+        logging.warning(f"Rate limited; pausing requests for {delay:.1f}s, now at {rate:.2f} requests/s.")
+
+    def stats(self):
+        return {"rate": self.rate, "throttled": self.throttled}
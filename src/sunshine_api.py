@@ -0,0 +1,147 @@
+import copy
+import logging
+
+import requests
+import urllib3
+
+from .http_client import HttpClient
+from .sunshine_manager import merge_apps
+
+class SunshineApiError(Exception):
+    pass
+
+class SunshineApiManager:
+    """
+    Applies app changes through Sunshine's local admin API instead of
+    editing apps.json, so they take effect immediately without a restart.
+
+    Offers the same add_game, add_games and remove_game methods as
+    SunshineManager. All calls share one keep-alive session with the
+    credentials attached. A bulk update costs one request to list the apps
+    plus one per app that actually changed. When the API cannot be reached,
+    the update is handed to the fallback file backend instead.
+    """
+    def __init__(self, base_url, username, password, verify=False, http=None, fallback=None):
+        """
+        Args:
+            base_url (str): Sunshine web UI, e.g. "https://localhost:47990".
+            username (str): Web UI user name.
+            password (str): Web UI password.
+            verify (bool or str, optional): TLS verification, or a CA bundle path. Sunshine
+                serves a self-signed certificate, so it is off by default.
+            http (HttpClient, optional): Client for the API; a dedicated one if None.
+            fallback (SunshineManager, optional): File backend used when the API is unreachable.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.fallback = fallback
+        # Localhost either answers at once or is down; do not wait long for it
+        self.http = http or HttpClient(pool_size=2, connect_timeout=2.0, read_timeout=10.0, max_retries=1)
+        self.http.session.auth = (username, password)
+        self.http.session.verify = verify
+        if verify is False:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.request_count = 0
+
+    @property
+    def config_path(self):
+        """apps.json of the fallback backend; covers are stored next to it."""
+        return self.fallback.config_path if self.fallback else None
+
+    def _request(self, method, path, **kwargs):
+        self.request_count += 1
+        try:
+            response = self.http.request(method, f"{self.base_url}{path}", **kwargs)
+        except requests.RequestException as e:
+            raise SunshineApiError(f"Sunshine API unreachable: {e}") from e
+        if response.status_code == 401:
+            raise SunshineApiError("Sunshine API rejected the credentials")
+        if response.status_code >= 400:
+            raise SunshineApiError(f"{method} {path} failed with HTTP {response.status_code}")
+        return response.json() if response.content else {}
+
+    def is_available(self):
+        """True if the API answers and accepts the credentials."""
+        try:
+            self.list_apps()
+            return True
+        except SunshineApiError as e:
+            logging.info(str(e))
+            return False
+
+    def list_apps(self):
+        """
+        Returns:
+            list: App dicts as stored in apps.json.
+        """
+        return self._request("GET", "/api/apps").get("apps", [])
+
+    def add_game(self, name, cmd, working_dir, image_path):
+        """
+        Adds or updates a game in Sunshine.
+        """
+        return self.add_games([(name, cmd, working_dir, image_path)]) is not None
+
+    def add_games(self, games, order=False):
+        """
+        Adds or updates several games; only apps that changed are sent.
+
+        Args:
+            games (iterable): (name, cmd, working_dir, image_path) tuples.
+            order (bool, optional): List the games' apps in the order of games.
+
+        Returns:
+            dict: {"added", "updated", "unchanged"} game counts, or None on failure.
+        """
+        games = list(games)
+        try:
+            apps = self.list_apps()
+            merged = copy.deepcopy(apps)
+            counts, changed = merge_apps(merged, games, order)
+            for i in changed:
+                # Sunshine replaces the app at index, or appends it for -1
+                self._request("POST", "/api/apps", json=dict(merged[i], index=i if i < len(apps) else -1))
+        except SunshineApiError as e:
+            return self._fall_back("add_games", e, games, order)
+        logging.info(f"Updated Sunshine apps: {counts['added']} added, {counts['updated']} updated, "
+                     f"{counts['unchanged']} unchanged.")
+        return counts
+
+    def remove_game(self, name):
+        """
+        Removes a game from Sunshine.
+        """
+        return self.remove_games([name]) is not None
+
+    def remove_games(self, names):
+        """
+        Removes several games, listing the apps once.
+
+        Args:
+            names (iterable): Exact app names.
+
+        Returns:
+            int: Number of apps removed, or None on failure.
+        """
+        names = set(names)
+        if not names:
+            return 0
+        try:
+            indexes = [i for i, app in enumerate(self.list_apps()) if app.get("name") in names]
+            # From the end, so earlier indexes stay valid
+            for i in reversed(indexes):
+                self._request("DELETE", f"/api/apps/{i}")
+        except SunshineApiError as e:
+            return self._fall_back("remove_games", e, names)
+        if indexes:
+            logging.info(f"Removed {len(indexes)} games from Sunshine.")
+        return len(indexes)
+
+    def _fall_back(self, method, error, *args):
+        if not self.fallback:
+            logging.error(f"Failed to update Sunshine: {error}")
+            return None
+        logging.warning(f"{error}; updating {self.fallback.config_path} instead.")
+        return getattr(self.fallback, method)(*args)
+
+    def close(self):
+        self.http.close()
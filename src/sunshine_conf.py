@@ -0,0 +1,192 @@
+import os
+
+# Encoder settings per GPU vendor, in sunshine.conf syntax. Keys a profile
+# does not name are left as they are.
+ENCODER_PROFILES = {
+    "nvidia": {
+        "encoder": "nvenc",
+        # P1 is the fastest preset and the one with the least added latency
+        "nvenc_preset": "1",
+        "nvenc_twopass": "quarter_res",
+    },
+    "amd": {
+        "encoder": "amdvce",
+        "amd_usage": "ultralowlatency",
+        "amd_quality": "speed",
+    },
+    "intel": {
+        "encoder": "quicksync",
+        "qsv_preset": "veryfast",
+    },
+    "software": {
+        "encoder": "software",
+        "sw_preset": "superfast",
+        "sw_tune": "zerolatency",
+    },
+}
+# Overrides for laptops with an iGPU next to the dGPU, where the game and
+# the encoder share one mobile GPU and a second pass costs frame time
+HYBRID_OVERRIDES = {
+    "nvidia": {"nvenc_twopass": "disabled"},
+}
+# Matched case-insensitively against the adapter name Windows reports
+_NO_ENCODER_MARKERS = (
+    "microsoft basic", "microsoft remote", "virtual display", "iddsampledriver", "parsec", "displaylink",
+)
+_VENDOR_MARKERS = (
+    ("nvidia", ("nvidia", "geforce", "quadro", "rtx ")),
+    ("amd", ("amd", "radeon", "ati ")),
+    ("intel", ("intel", "iris", "uhd graphics", "arc ")),
+)
+
+def gpu_vendor(adapter_name):
+    """
+    Returns:
+        str: "nvidia", "amd" or "intel", or None if adapter_name names none of them.
+    """
+    name = f"{(adapter_name or '').lower()} "
+    for vendor, markers in _VENDOR_MARKERS:
+        if any(marker in name for marker in markers):
+            return vendor
+    return None
+
+def _has_no_encoder(adapter_name):
+    name = adapter_name.lower()
+    return any(marker in name for marker in _NO_ENCODER_MARKERS)
+
+def encoder_profile(adapters, display_adapter=None, output_name=None, cpu_count=None):
+    """
+    Picks encoder settings for this machine.
+
+    Sunshine encodes on the adapter that drives the virtual display when it
+    is known, as that saves a copy between GPUs; otherwise on a discrete GPU
+    before an integrated one. The software encoder is only picked when every
+    listed adapter is known to have no encoder, such as the Microsoft Basic
+    Display Adapter. When no adapters were listed or one is not recognized,
+    no encoder is named and Sunshine keeps detecting it itself.
+
+    Args:
+        adapters (iterable): Names of the installed display adapters.
+        display_adapter (str, optional): Name of the adapter driving the virtual display.
+        output_name (str, optional): Device name of the virtual display, as returned by
+            DisplayManager.create_virtual_display, so Sunshine captures it instead of the built-in panel.
+        cpu_count (int, optional): Logical CPUs; os.cpu_count() if None.
+
+    Returns:
+        dict: sunshine.conf settings.
+    """
+    adapters = [name for name in adapters if name]
+    vendors = {gpu_vendor(name) for name in adapters} - {None}
+    hybrid = len(vendors) > 1
+
+    adapter = display_adapter if gpu_vendor(display_adapter) else None
+    if adapter is None:
+        for preferred in ("nvidia", "amd", "intel"):
+            adapter = next((name for name in adapters if gpu_vendor(name) == preferred), None)
+            if adapter:
+                break
+    vendor = gpu_vendor(adapter)
+    if vendor is None:
+        if not adapters or not all(_has_no_encoder(name) for name in adapters):
+            return {"output_name": output_name} if output_name else {}
+        vendor = "software"
+
+    settings = dict(ENCODER_PROFILES[vendor])
+    if hybrid:
+        settings.update(HYBRID_OVERRIDES.get(vendor, {}))
+    if adapter:
+        settings["adapter_name"] = adapter
+        # Desktop Duplication; the alternatives need Sunshine to run outside its service
+        settings["capture"] = "ddx"
+    if output_name:
+        settings["output_name"] = output_name
+    # Slices the CPU encodes in parallel; only the software encoder needs many
+    cpus = cpu_count or os.cpu_count() or 2
+    settings["min_threads"] = str(max(2, cpus // 2) if vendor == "software" else 2)
+    return settings
+
+class SunshineConf:
+    """
+    sunshine.conf, edited without losing anything Sunshine or the user put
+    there.
+
+    The file is a list of "key = value" lines. Comments, blank lines, keys
+    this project does not know and the order of lines are kept as read;
+    only the lines of changed keys are rewritten, and new keys are appended.
+    """
+    def __init__(self, text=""):
+        """
+        Args:
+            text (str, optional): Content of sunshine.conf.
+        """
+        self.newline = "\r\n" if "\r\n" in text else "\n"
+        self.trailing_newline = text.endswith(("\n", "\r")) or not text
+        self.lines = text.splitlines()
+
+    @staticmethod
+    def _parse(line):
+        """Returns (key, value) for a setting line, or None for anything else."""
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") or "=" not in stripped:
+            return None
+        key, _, value = stripped.partition("=")
+        return key.strip(), value.strip()
+
+    def _find(self, key):
+        """Returns the index of the line setting key; the last one, as it is the one in effect."""
+        for i in range(len(self.lines) - 1, -1, -1):
+            setting = self._parse(self.lines[i])
+            if setting and setting[0] == key:
+                return i
+        return None
+
+    def get(self, key, default=None):
+        i = self._find(key)
+        return default if i is None else self._parse(self.lines[i])[1]
+
+    def items(self):
+        """Returns the settings as a dict."""
+        return dict(setting for setting in map(self._parse, self.lines) if setting)
+
+    def set(self, key, value):
+        """
+        Sets key to value, or removes it for None.
+
+        Returns:
+            bool: True if the file content changed.
+        """
+        i = self._find(key)
+        if value is None:
+            if i is None:
+                return False
+            del self.lines[i]
+            return True
+        value = str(value)
+        if i is None:
+            self.lines.append(f"{key} = {value}")
+            return True
+        if self._parse(self.lines[i])[1] == value:
+            return False
+        self.lines[i] = f"{key} = {value}"
+        return True
+
+    def apply(self, settings):
+        """
+        Applies settings, touching only keys whose value differs.
+
+        Returns:
+            dict: {key: (old value, new value)} for every key that changed;
+            None stands for a key that was absent or removed.
+        """
+        diff = {}
+        for key, value in settings.items():
+            old = self.get(key)
+            if self.set(key, value):
+                diff[key] = (old, None if value is None else str(value))
+        return diff
+
+    def dumps(self):
+        text = self.newline.join(self.lines)
+        if self.lines and self.trailing_newline:
+            text += self.newline
+        return text
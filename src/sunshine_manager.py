@@ -3,6 +3,99 @@ import os
 import logging
 import shutil
 
+from .sunshine_conf import SunshineConf
+from .title_index import canonical_title
+from .utils import FileLock, write_atomic
+
+# Marks the apps this project added to Sunshine
+MANAGED_KEY = "managed-by"
+MANAGED_BY = "easy-game-streaming"
+
+def _is_managed(app):
+    return app.get(MANAGED_KEY) == MANAGED_BY
+
+def merge_apps(apps, games, order=False):
+    """
+    Merges games into a list of Sunshine apps in place.
+
+    Existing apps are matched by exact name first and then, for apps this
+    project added (see MANAGED_KEY), by canonical title, through dicts built
+    once, so merging N games costs O(N). Only such apps are renamed to
+    another spelling of their title; apps the user made are updated on an
+    exact name match only.
+
+    Args:
+        apps (list): App dicts as stored in apps.json.
+        games (iterable): (name, cmd, working_dir, image_path) tuples.
+        order (bool, optional): Rearrange the apps of games into the order of
+            games, within the positions they occupy; other apps keep theirs.
+
+    Returns:
+        tuple: ({"added", "updated", "unchanged"} counts, sorted positions in
+        apps of the apps that were added, updated or moved).
+    """
+    original = list(apps)
+    merged = []
+    by_name = {}
+    by_key = {}
+    for app in apps:
+        by_name.setdefault(app.get("name"), app)
+        key = canonical_title(app.get("name"))
+        # Titles of only symbols or suffixes have no key and match nothing
+        if key and _is_managed(app):
+            by_key.setdefault(key, app)
+
+    counts = {"added": 0, "updated": 0, "unchanged": 0}
+    changed = set()
+    for name, cmd, working_dir, image_path in games:
+        key = canonical_title(name)
+        # Check if game exists, also under another spelling of its title
+        existing = by_name.get(name) or (by_key.get(key) if key else None)
+        if existing:
+            before = dict(existing)
+            if existing.get("name") != name:
+                by_name.pop(existing.get("name"), None)
+            existing["name"] = name
+            existing["cmd"] = cmd
+            existing["working_dir"] = working_dir
+            if image_path:
+                existing["image-path"] = image_path
+            if existing != before:
+                counts["updated"] += 1
+                changed.add(id(existing))
+            else:
+                counts["unchanged"] += 1
+            app = existing
+        else:
+            app = {
+                "name": name,
+                "cmd": cmd,
+                "working_dir": working_dir,
+                "image-path": image_path if image_path else "",
+                MANAGED_KEY: MANAGED_BY,
+            }
+            # Optional: Add other fields like "detached", "output", etc. if needed.
+            # Sunshine defaults are usually fine.
+            apps.append(app)
+            counts["added"] += 1
+            changed.add(id(app))
+        by_name[name] = app
+        if key and _is_managed(app):
+            by_key[key] = app
+        merged.append(app)
+
+    if order:
+        ordered = list({id(app): app for app in merged}.values())
+        ids = {id(app) for app in ordered}
+        slots = [i for i, app in enumerate(apps) if id(app) in ids]
+        for i, app in zip(slots, ordered):
+            apps[i] = app
+
+    return counts, [
+        i for i, app in enumerate(apps)
+        if id(app) in changed or i >= len(original) or app is not original[i]
+    ]
+
 class SunshineManager:
     def __init__(self, sunshine_path):
         self.sunshine_path = sunshine_path
@@ -31,53 +124,189 @@ class SunshineManager:
             self.config_path = os.path.join(base_dir, "config", "apps.json")
 
         logging.info(f"Using Sunshine config at: {self.config_path}")
+        # Serializes read-modify-write cycles of apps.json between our processes
+        self.lock_path = f"{self.config_path}.lock"
+        # Sunshine keeps its settings next to apps.json
+        self.conf_path = os.path.join(os.path.dirname(self.config_path), "sunshine.conf")
 
     def add_game(self, name, cmd, working_dir, image_path):
         """
         Adds or updates a game in Sunshine's apps.json.
         """
-        # Ensure config dir exists
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        return self.add_games([(name, cmd, working_dir, image_path)]) is not None
 
-        data = {"env": {}, "apps": []}
+    def add_games(self, games, order=False):
+        """
+        Adds or updates several games with a single read and write of apps.json.
+
+        Games are merged as by merge_apps. The whole read-modify-write cycle
+        holds the apps.json lock.
+
+        Args:
+            games (iterable): (name, cmd, working_dir, image_path) tuples.
+            order (bool, optional): List the games' apps in the order of games.
+
+        Returns:
+            dict: {"added", "updated", "unchanged"} game counts, or None if
+            apps.json could not be read or written.
+        """
+        try:
+            with FileLock(self.lock_path):
+                return self._merge_games(games, order)
+        except OSError as e:
+            # Lock timeouts included
+            logging.error(f"Failed to update Sunshine config: {e}")
+            return None
+
+    def _merge_games(self, games, order=False):
+        data, raw = self._load()
+        if data is None:
+            return None
+
+        counts, changed = merge_apps(data.setdefault("apps", []), games, order)
+        if changed:
+            if not self._save(data, raw):
+                return None
+        logging.info(f"Updated Sunshine config: {counts['added']} added, {counts['updated']} updated, "
+                     f"{counts['unchanged']} unchanged.")
+        return counts
 
+    def _load(self):
+        """
+        Reads apps.json.
+
+        Returns:
+            tuple: (config, raw bytes). An empty config and None if the file does
+            not exist yet; (None, None) if it cannot be read.
+        """
+        data = {"env": {}, "apps": []}
+        raw = None
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    content = f.read()
-                    if content.strip():
-                        data = json.loads(content)
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                content = raw.decode('utf-8-sig')
+                if content.strip():
+                    data = json.loads(content)
             except Exception as e:
                 logging.error(f"Failed to read Sunshine config: {e}")
-                return False
-
-        # Check if game exists
-        found = False
-        for app in data["apps"]:
-            if app["name"] == name:
-                app["cmd"] = cmd
-                app["working_dir"] = working_dir
-                if image_path:
-                    app["image-path"] = image_path
-                found = True
-                break
+                return None, None
+        return data, raw
 
-        if not found:
-            new_app = {
-                "name": name,
-                "cmd": cmd,
-                "working_dir": working_dir,
-                "image-path": image_path if image_path else ""
-            }
-            # Optional: Add other fields like "detached", "output", etc. if needed.
-            # Sunshine defaults are usually fine.
-            data["apps"].append(new_app)
+    def _save(self, data, original=None):
+        """
+        Writes apps.json atomically, unless its bytes would not change.
 
+        Sunshine reloads the config whenever the file changes, and a temp file
+        plus os.replace means a crash or a concurrent reader never sees a
+        truncated file.
+
+        Args:
+            data (dict): The config.
+            original (bytes, optional): The file content it was read from.
+        """
+        content = json.dumps(data, indent=4).encode('utf-8')
+        if content == original:
+            logging.debug("Sunshine config unchanged, not rewriting it.")
+            return True
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(data, f, indent=4)
-            logging.info(f"Updated Sunshine config for game: {name}")
+            # Ensure config dir exists
+            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+            write_atomic(self.config_path, content)
             return True
         except Exception as e:
             logging.error(f"Failed to write Sunshine config: {e}")
             return False
+
+    def read_conf(self):
+        """
+        Reads sunshine.conf.
+
+        Returns:
+            SunshineConf: The settings; empty if the file does not exist yet,
+            None if it cannot be read.
+        """
+        try:
+            with open(self.conf_path, 'rb') as f:
+                return SunshineConf(f.read().decode('utf-8-sig'))
+        except FileNotFoundError:
+            return SunshineConf()
+        except Exception as e:
+            logging.error(f"Failed to read Sunshine settings: {e}")
+            return None
+
+    def update_conf(self, settings):
+        """
+        Applies settings to sunshine.conf as a diff.
+
+        Only keys whose value differs are rewritten; comments and keys not in
+        settings are kept, and the file is not written at all when nothing
+        changed. A value of None removes the key, so Sunshine's default applies.
+
+        Args:
+            settings (dict): {key: value} in sunshine.conf syntax.
+
+        Returns:
+            dict: {key: (old value, new value)} for the keys that changed, or
+            None if sunshine.conf could not be read or written.
+        """
+        try:
+            with FileLock(f"{self.conf_path}.lock"):
+                conf = self.read_conf()
+                if conf is None:
+                    return None
+                diff = conf.apply(settings)
+                if diff:
+                    os.makedirs(os.path.dirname(self.conf_path), exist_ok=True)
+                    write_atomic(self.conf_path, conf.dumps().encode('utf-8'))
+        except OSError as e:
+            # Lock timeouts included
+            logging.error(f"Failed to update Sunshine settings: {e}")
+            return None
+        for key, (old, new) in diff.items():
+            logging.info(f"Sunshine setting {key}: {old} -> {new}")
+        return diff
+
+    def remove_game(self, name):
+        """
+        Removes a game from Sunshine's apps.json.
+        """
+        return self.remove_games([name]) is not None
+
+    def remove_games(self, names):
+        """
+        Removes several games with a single read and write of apps.json.
+
+        Args:
+            names (iterable): Exact app names.
+
+        Returns:
+            int: Number of apps removed, or None on failure.
+        """
+        names = set(names)
+        if not names or not os.path.exists(self.config_path):
+            return 0
+
+        try:
+            with FileLock(self.lock_path):
+                data, raw = self._load()
+                if data is None:
+                    return None
+
+                apps = [app for app in data.get("apps", []) if app.get("name") not in names]
+                removed = len(data.get("apps", [])) - len(apps)
+                if not removed:
+                    return 0
+                data["apps"] = apps
+
+                if not self._save(data, raw):
+                    return None
+        except OSError as e:
+            # Lock timeouts included
+            logging.error(f"Failed to update Sunshine config: {e}")
+            return None
+        if len(names) == 1:
+            logging.info(f"Removed game from Sunshine config: {next(iter(names))}")
+        else:
+            logging.info(f"Removed {removed} games from Sunshine config.")
+        return removed
@@ -0,0 +1,85 @@
+import re
+import unicodedata
+
+# Edition suffixes that name a variant of the same game rather than another game
+_EDITION_RE = re.compile(
+    r"\s+(?:(?:game of the year|goty|definitive|deluxe|digital deluxe|ultimate|gold|premium|standard|complete|"
+    r"enhanced|anniversary|collectors|special|legendary|launch)\s+edition|goty|game of the year|directors cut)$"
+)
+
+def canonical_title(name):
+    """
+    Returns the key under which different spellings of a title are merged.
+
+    Case, accents, trademark signs, punctuation, "&" versus "and" and edition
+    suffixes such as "Game of the Year Edition" are folded away:
+    "DOOM® (Deluxe Edition)" and "Doom" share the key "doom".
+    """
+    text = unicodedata.normalize("NFKD", re.sub(r"[™®©]", "", name or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("&", " and ").replace("'", "")
+    text = " ".join(re.findall(r"[^\W_]+", text))
+    while True:
+        stripped = _EDITION_RE.sub("", text)
+        if stripped == text or not stripped:
+            return text
+        text = stripped
+
+class TitleIndex:
+    """
+    Collapses the same game installed through several launchers, or listed
+    under slightly different names, into one entry per canonical title.
+
+    When duplicates meet, the entry from the launcher listed first in
+    launcher_preference is kept; launchers not listed rank after all listed
+    ones, and ties keep the entry seen first. Covers found for a title are
+    remembered so a replacement entry reuses them instead of another lookup.
+    """
+    NEW = "new"
+    REPLACED = "replaced"
+    DUPLICATE = "duplicate"
+
+    def __init__(self, launcher_preference=()):
+        """
+        Args:
+            launcher_preference (iterable, optional): Launcher names, most preferred first.
+        """
+        self.launcher_rank = {name: rank for rank, name in enumerate(launcher_preference)}
+        # {key: game}, in the order titles were first seen
+        self.entries = {}
+        # {key: cover path}
+        self.covers = {}
+        self.duplicates = 0
+
+    def _rank(self, game):
+        return self.launcher_rank.get(game.get("platform"), len(self.launcher_rank))
+
+    def add(self, game):
+        """
+        Adds a game, merging it with an earlier entry of the same title.
+
+        Returns:
+            tuple: (key, status, other). status is NEW; REPLACED when game
+            displaced the earlier entry, which is returned as other; or
+            DUPLICATE when the earlier entry (other) is kept and game dropped.
+        """
+        key = canonical_title(game.get("name"))
+        current = self.entries.get(key)
+        if current is None:
+            self.entries[key] = game
+            return key, self.NEW, None
+        self.duplicates += 1
+        if self._rank(game) < self._rank(current):
+            self.entries[key] = game
+            return key, self.REPLACED, current
+        return key, self.DUPLICATE, current
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def games(self):
+        """Returns the kept entries in the order their titles were first seen."""
+        return list(self.entries.values())
+
+    def __len__(self):
+        return len(self.entries)
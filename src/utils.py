@@ -1,5 +1,18 @@
 import logging
+import os
 import subprocess
+import time
+
+# Only one of these exists, depending on the platform
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 def setup_logging(level=logging.INFO):
     """
@@ -37,3 +50,89 @@ def run_command(command, shell=False):
     except Exception as e:
         logging.error(f"Exception executing command: {e}")
         return -1, "", str(e)
+
+def write_atomic(path, data):
+    """
+    Replaces a file's content without ever leaving it half-written.
+
+    The data goes to a temporary file in the same folder, which is flushed
+    to disk and then renamed over path.
+
+    Args:
+        path (str): File to write.
+        data (bytes): New content.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class FileLock:
+    """
+    Exclusive lock shared between processes, held on a separate lock file.
+
+    Uses fcntl.flock on POSIX and msvcrt.locking on Windows. Use as a
+    context manager.
+    """
+    def __init__(self, path, timeout=10.0, poll_interval=0.05):
+        """
+        Args:
+            path (str): Lock file; created if missing and never deleted.
+            timeout (float, optional): Seconds to wait for the lock before raising TimeoutError.
+            poll_interval (float, optional): Seconds between attempts while waiting.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def _try_lock(self):
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        lock_dir = os.path.dirname(self.path)
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                self._file.close()
+                self._file = None
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
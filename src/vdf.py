@@ -0,0 +1,226 @@
+import re
+
+# Quoted string (with escapes, quotes kept), brace, comment, or bare token
+_TOKEN_PATTERN = r'("[^"\\]*(?:\\.[^"\\]*)*")|([{}])|(//[^\n]*)|([^\s{}"]+)'
+_TOKEN_RE = re.compile(_TOKEN_PATTERN)
+_NEXT_TOKEN_RE = re.compile(r'\s*(?:' + _TOKEN_PATTERN + ')')
+# Only the escapes Steam writes are decoded; other backslashes are kept literally
+_ESCAPE_RE = re.compile(r'\\([nt\\"])')
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+STRING = "string"
+OPEN = "{"
+CLOSE = "}"
+
+class VDFError(ValueError):
+    """Raised when a KeyValues document is malformed."""
+
+def _blank(text):
+    return not text or text.isspace()
+
+def _unescape(value):
+    if "\\" not in value:
+        return value
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(1)], value)
+
+def _line_tokens(text):
+    """Returns (tokens, rest) for one chunk of text; rest is an unterminated string."""
+    if '\\"' not in text and text.count('"') % 2 == 0:
+        # Fast path: every quote on the line is balanced, let findall do the work
+        return _TOKEN_RE.findall(text), ""
+    tokens = []
+    pos = 0
+    end = len(text)
+    while pos < end:
+        match = _NEXT_TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            rest = text[pos:]
+            return tokens, rest if rest.strip() else ""
+        tokens.append(match.groups())
+        pos = match.end()
+    return tokens, ""
+
+def tokenize(lines):
+    """
+    Tokenizes KeyValues text.
+
+    Args:
+        lines (iterable): An open text file or any iterable of lines.
+
+    Yields:
+        tuple: (kind, value) where kind is STRING, OPEN or CLOSE.
+    """
+    pending = ""
+    for line in lines:
+        if pending:
+            line = pending + line
+        elif "\\" not in line:
+            # Fast paths for the layouts Steam writes: a lone brace, a lone
+            # "key" or a "key" "value" pair on one line
+            parts = line.split('"')
+            count = len(parts)
+            if count == 1:
+                stripped = line.strip()
+                if stripped == "{" or stripped == "}":
+                    yield stripped, stripped
+                    continue
+            elif count == 5:
+                if _blank(parts[0]) and _blank(parts[2]) and parts[2] and _blank(parts[4]):
+                    yield STRING, parts[1]
+                    yield STRING, parts[3]
+                    continue
+            elif count == 3:
+                if _blank(parts[0]) and _blank(parts[2]):
+                    yield STRING, parts[1]
+                    continue
+        tokens, pending = _line_tokens(line)
+        for quoted, brace, comment, bare in tokens:
+            if quoted:
+                yield STRING, _unescape(quoted[1:-1])
+            elif brace:
+                yield brace, brace
+            elif bare:
+                # Platform conditionals such as [$WIN32] are ignored
+                if bare[0] != "[":
+                    yield STRING, bare
+    if pending:
+        raise VDFError("Unterminated string")
+
+def load(lines):
+    """
+    Parses a KeyValues document into nested dicts.
+
+    Args:
+        lines (iterable): An open text file or any iterable of lines.
+
+    Returns:
+        dict: The parsed document. Duplicate keys keep the last value.
+    """
+    root = {}
+    stack = [root]
+    key = None
+    for kind, value in tokenize(lines):
+        if kind == STRING:
+            if key is None:
+                key = value
+            else:
+                stack[-1][key] = value
+                key = None
+        elif kind == OPEN:
+            if key is None:
+                raise VDFError("Block without a key")
+            child = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+        else:
+            if len(stack) == 1:
+                raise VDFError("Unbalanced closing brace")
+            stack.pop()
+    if len(stack) != 1:
+        raise VDFError("Unexpected end of document")
+    return root
+
+def loads(text):
+    """Parses a KeyValues document from a string."""
+    return load(text.splitlines(True))
+
+def extract(lines, keys):
+    """
+    Extracts selected string fields of the root block, e.g. "appid" and
+    "name" from an app manifest. Key matching is case-insensitive, as in Steam.
+    Reading stops as soon as every requested key has been found, so fields
+    near the top of a file never cost a full read.
+
+    Args:
+        lines (iterable): An open text file or any iterable of lines.
+        keys (iterable): Field names to extract.
+
+    Returns:
+        dict: The found fields, keyed by the requested names.
+    """
+    wanted = {k.lower(): k for k in keys}
+    found = {}
+    depth = 0
+    key = None
+    for kind, value in tokenize(lines):
+        if kind == STRING:
+            if key is None:
+                key = value
+                continue
+            if depth == 1:
+                name = wanted.get(key.lower())
+                if name is not None and name not in found:
+                    found[name] = value
+                    if len(found) == len(wanted):
+                        break
+            key = None
+        elif kind == OPEN:
+            depth += 1
+            key = None
+        else:
+            depth -= 1
+            if depth <= 0:
+                break
+    return found
+
+# Enough for the header of any app manifest
+HEADER_READ_SIZE = 4096
+_header_res = {}
+
+def _header_re(keys):
+    """Returns a pattern matching a line that holds only a "key" "value" pair, for one of keys."""
+    pattern = _header_res.get(keys)
+    if pattern is None:
+        names = "|".join(map(re.escape, keys))
+        pattern = _header_res[keys] = re.compile(r'\n[ \t]*"(%s)"[ \t]+"([^"\\\n]*)"[ \t]*(?=\r?\n)' % names)
+    return pattern
+
+def _header_fields(text, keys):
+    """
+    Looks keys up in the lines between the opening brace of the root block
+    and its first nested block, with the exact case and the one pair per
+    line layout Steam writes.
+
+    Returns:
+        dict: The found fields, or None unless all keys were found.
+    """
+    start = text.find("{") + 1
+    end = text.find("{", start)
+    close = text.find("}", start)
+    if close >= 0 and (end < 0 or close < end):
+        end = close
+    if not start or end < 0:
+        return None
+    # Reversed so the first of repeated keys wins, as in extract
+    found = dict(_header_re(keys).findall(text, start, end)[::-1])
+    return found if len(found) == len(keys) else None
+
+def extract_file(path, keys, encoding="utf-8"):
+    """
+    Like extract, for the file at path. Only the first HEADER_READ_SIZE bytes
+    are read, unbuffered and without a text wrapper, and matched against the
+    header fields, which is several times cheaper than opening the file as
+    text and tokenizing it. Files whose fields are not all in a plainly
+    formatted header are read with extract instead.
+
+    Args:
+        path (str): Path of the file.
+        keys (iterable): Field names to extract.
+        encoding (str, optional): Encoding of the file.
+
+    Returns:
+        dict: The found fields, keyed by the requested names.
+    """
+    keys = tuple(keys)
+    with open(path, 'rb', buffering=0) as f:
+        head = f.read(HEADER_READ_SIZE)
+    try:
+        found = _header_fields(head.decode(encoding), keys)
+    except UnicodeDecodeError:
+        # Possibly a character cut at the end of the read
+        found = None
+    if found is not None:
+        return found
+    with open(path, 'r', encoding=encoding) as f:
+        return extract(f, keys)
@@ -0,0 +1,35 @@
+import unittest
+
+from src.app_classifier import AppClassifier
+
+def _steam(name, appid, app_type=None):
+    return {"name": name, "platform": "steam", "appid": str(appid), "app_type": app_type}
+
+class TestAppClassifier(unittest.TestCase):
+    def test_builtin_rules(self):
+        classifier = AppClassifier()
+        self.assertEqual(classifier.classify(_steam("Steamworks Common Redistributables", 228980)), "denylisted appid")
+        self.assertEqual(classifier.classify(_steam("Proton 10.0", 3658110)), "denylisted name")
+        self.assertEqual(classifier.classify(_steam("Counter-Strike 2 Dedicated Server", 730)), "denylisted name")
+        self.assertEqual(classifier.classify(_steam("Wallpaper Tool", 5, app_type="tool")), "app type tool")
+        self.assertIsNone(classifier.classify(_steam("Portal 2", 620, app_type="game")))
+        # Appids are only meaningful for Steam
+        self.assertIsNone(classifier.classify({"name": "Fortnite", "platform": "epic", "appid": "228980"}))
+
+    def test_user_rules_and_stats(self):
+        classifier = AppClassifier(excluded_appids=[620], excluded_names=[r"^demo\b", "("])
+        games = [
+            _steam("Portal 2", 620),
+            _steam("Demo Disc", 1),
+            _steam("SteamVR", 250820),
+            _steam("Half-Life", 70),
+        ]
+        kept = [game["name"] for game in games if classifier.is_game(game)]
+        self.assertEqual(kept, ["Half-Life"])
+        self.assertEqual(classifier.stats(), {"denylisted appid": 2, "denylisted name": 1})
+
+        classifier.reset_stats()
+        self.assertEqual(classifier.stats(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from src.appinfo import AppInfoReader, AppInfoError, MAGIC_V28, MAGIC_V29
+
+def _encode_kv(data, strings=None):
+    """Encodes nested dicts as binary KeyValues; keys go to strings when given (v29)."""
+    out = b""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            node_type, payload = 0x00, _encode_kv(value, strings) + b"\x08"
+        elif isinstance(value, int):
+            node_type, payload = 0x02, struct.pack("<i", value)
+        else:
+            node_type, payload = 0x01, value.encode("utf-8") + b"\x00"
+        if strings is not None:
+            if key not in strings:
+                strings.append(key)
+            encoded_key = struct.pack("<I", strings.index(key))
+        else:
+            encoded_key = key.encode("utf-8") + b"\x00"
+        out += bytes([node_type]) + encoded_key + payload
+    return out
+
+def build_appinfo(path, apps, magic=MAGIC_V29):
+    """Writes an appinfo.vdf holding {appid: keyvalues} in the given format version."""
+    strings = [] if magic == MAGIC_V29 else None
+    body = b""
+    for appid, data in apps.items():
+        kv = _encode_kv({"appinfo": data}, strings) + b"\x08"
+        entry = struct.pack("<IIQ20sI", 2, 1700000000, 0, b"\x00" * 20, 1) + b"\x00" * 20 + kv
+        body += struct.pack("<II", appid, len(entry)) + entry
+    body += struct.pack("<I", 0)
+
+    header_size = 16 if magic == MAGIC_V29 else 8
+    header = struct.pack("<II", magic, 1)
+    if magic == MAGIC_V29:
+        header += struct.pack("<q", header_size + len(body))
+        body += struct.pack("<I", len(strings)) + b"".join(s.encode("utf-8") + b"\x00" for s in strings)
+    with open(path, "wb") as f:
+        f.write(header + body)
+
+APPS = {
+    10: {
+        "appid": 10,
+        "common": {"name": "Counter-Strike", "type": "Game"},
+        "config": {
+            "installdir": "Half-Life",
+            "launch": {
+                "0": {"executable": "hl.exe", "arguments": "-game cstrike", "config": {"oslist": "windows"}},
+                "1": {"executable": "hl_linux", "config": {"oslist": "linux"}},
+            }
+        }
+    },
+    228980: {
+        "appid": 228980,
+        "common": {"name": "Steamworks Common Redistributables", "type": "Tool"},
+        "config": {"installdir": "Steamworks Shared"}
+    },
+    620: {
+        "appid": 620,
+        "common": {"name": "Portal 2", "type": "game"},
+        "config": {
+            "installdir": "Portal 2",
+            "launch": {
+                "0": {"executable": "portal2.exe", "type": "option1", "description": "Workshop tools"},
+                "1": {"executable": "portal2.exe", "arguments": "-novid", "type": "default"},
+                "2": {"executable": "portal2.exe", "config": {"betakey": "beta"}},
+            }
+        }
+    },
+}
+
+class TestAppInfoReader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "appinfo.vdf")
+        self.index_path = os.path.join(self.temp_dir.name, "cache", "appinfo_index.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reads_both_format_versions(self):
+        for magic in (MAGIC_V28, MAGIC_V29):
+            with self.subTest(magic=hex(magic)):
+                build_appinfo(self.path, APPS, magic)
+                with AppInfoReader(self.path) as reader:
+                    self.assertEqual(sorted(reader.offsets), [10, 620, 228980])
+                    self.assertEqual(reader.get(10)["common"]["name"], "Counter-Strike")
+                    self.assertEqual(reader.get("228980")["config"]["installdir"], "Steamworks Shared")
+                    self.assertIsNone(reader.get(99))
+
+    def test_launch_info(self):
+        build_appinfo(self.path, APPS)
+        with AppInfoReader(self.path) as reader:
+            info = reader.launch_info(10)
+            self.assertEqual(info["type"], "game")
+            self.assertEqual(info["executable"], "hl.exe")
+            self.assertEqual(info["arguments"], "-game cstrike")
+            # The default entry wins over options and beta-only entries
+            self.assertEqual(reader.launch_info(620)["arguments"], "-novid")
+            tool = reader.launch_info(228980)
+            self.assertEqual(tool["type"], "tool")
+            self.assertIsNone(tool["executable"])
+
+    def test_offset_index_is_cached_until_file_changes(self):
+        build_appinfo(self.path, APPS)
+        with AppInfoReader(self.path, self.index_path):
+            pass
+        self.assertTrue(os.path.exists(self.index_path))
+
+        with AppInfoReader(self.path, self.index_path) as reader:
+            with mock.patch.object(reader, "_build_index") as build:
+                reader.close()
+                reader.open()
+                build.assert_not_called()
+            self.assertEqual(reader.launch_info(10)["name"], "Counter-Strike")
+
+        apps = dict(APPS)
+        apps[70] = {"common": {"name": "Half-Life", "type": "game"}}
+        build_appinfo(self.path, apps)
+        os.utime(self.path, ns=(1, 1))
+        with AppInfoReader(self.path, self.index_path) as reader:
+            self.assertEqual(reader.launch_info(70)["name"], "Half-Life")
+
+    def test_rejects_unknown_version(self):
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<II", 0x07564420, 1))
+        with self.assertRaises(AppInfoError):
+            AppInfoReader(self.path).open()
+
+if __name__ == '__main__':
+    unittest.main()
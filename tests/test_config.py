@@ -61,5 +61,13 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.get("sunshine_path"), "C:\\Env\\Sunshine.exe")
         self.assertEqual(config.get("driver_tool_path"), "C:\\Custom\\Driver.exe") # From file
 
+    def test_get_path(self):
+        config = Config(config_path="non_existent_file.json")
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(config.get_path("cache_path"), os.path.join(base_dir, "cache"))
+
+        config.config["cache_path"] = os.path.abspath("some_cache")
+        self.assertEqual(config.get_path("cache_path"), os.path.abspath("some_cache"))
+
 if __name__ == '__main__':
     unittest.main()
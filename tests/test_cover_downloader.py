@@ -0,0 +1,150 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from src.cover_downloader import CoverDownloader
+
+def _response(status_code, body=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_content.return_value = [body[i:i + 4] for i in range(0, len(body), 4)]
+    if status_code >= 400:
+        response.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
+    return response
+
+class TestCoverDownloader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.state_path = os.path.join(self.root, "cache", "covers.json")
+        self.http = MagicMock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.root, name)
+
+    def test_rescan_sends_conditional_requests(self):
+        self.http.get.return_value = _response(200, b"jpeg-data", {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"})
+        downloader = CoverDownloader(self.state_path, http=self.http)
+        path = downloader.download("https://img/portal.jpg", self._path("Portal.jpg"))
+        self.assertEqual(path, self._path("Portal.jpg"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"jpeg-data")
+        downloader.save()
+
+        self.http.get.reset_mock()
+        self.http.get.return_value = _response(304)
+        downloader = CoverDownloader(self.state_path, http=self.http)
+        self.assertEqual(downloader.download("https://img/portal.jpg", self._path("Portal.jpg")), path)
+        headers = self.http.get.call_args.kwargs["headers"]
+        self.assertEqual(headers, {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024"})
+        self.assertEqual(downloader.stats()["not_modified"], 1)
+        self.assertEqual(downloader.stats()["bytes"], 0)
+
+        # A cover deleted from disk is downloaded again unconditionally
+        os.remove(path)
+        self.http.get.return_value = _response(200, b"jpeg-data")
+        self.assertEqual(downloader.download("https://img/portal.jpg", path), path)
+        self.assertEqual(self.http.get.call_args.kwargs["headers"], {})
+
+    def test_failed_download_leaves_no_file(self):
+        response = _response(200, b"partial")
+        response.iter_content.side_effect = ConnectionError("reset")
+        self.http.get.return_value = response
+        downloader = CoverDownloader(http=self.http)
+
+        self.assertIsNone(downloader.download("https://img/a.jpg", self._path("A.jpg")))
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertEqual(downloader.stats()["failed"], 1)
+
+    def test_identical_covers_are_deduplicated(self):
+        self.http.get.side_effect = lambda url, **kwargs: _response(200, b"placeholder" if "x" in url else b"unique")
+        downloader = CoverDownloader(http=self.http, max_workers=1)
+
+        paths = downloader.download_many([
+            ("https://img/x1.jpg", self._path("One.jpg")),
+            ("https://img/x2.jpg", self._path("Two.jpg")),
+            ("https://img/b.jpg", self._path("Three.jpg")),
+        ])
+
+        self.assertEqual(paths[self._path("Two.jpg")], self._path("Two.jpg"))
+        self.assertEqual(paths[self._path("Three.jpg")], self._path("Three.jpg"))
+        self.assertEqual(sorted(os.listdir(self.root)), ["One.jpg", "Three.jpg", "Two.jpg"])
+        # One copy of the data, linked under both names
+        self.assertTrue(os.path.samefile(self._path("One.jpg"), self._path("Two.jpg")))
+        self.assertEqual(downloader.stats()["deduplicated"], 1)
+
+    def test_replacing_a_deduplicated_cover_keeps_the_other(self):
+        covers = {"https://img/x1.jpg": b"placeholder", "https://img/x2.jpg": b"placeholder"}
+        self.http.get.side_effect = lambda url, **kwargs: _response(200, covers[url])
+        downloader = CoverDownloader(http=self.http, max_workers=1)
+        downloader.download("https://img/x1.jpg", self._path("One.jpg"))
+        downloader.download("https://img/x2.jpg", self._path("Two.jpg"))
+
+        # One's cover changes; Two keeps the placeholder
+        covers["https://img/x1.jpg"] = b"real cover"
+        self.assertEqual(downloader.download("https://img/x1.jpg", self._path("One.jpg")), self._path("One.jpg"))
+        with open(self._path("Two.jpg"), "rb") as f:
+            self.assertEqual(f.read(), b"placeholder")
+
+        # A later placeholder is not linked to One, which no longer holds it
+        covers["https://img/x3.jpg"] = b"placeholder"
+        downloader.download("https://img/x3.jpg", self._path("Three.jpg"))
+        with open(self._path("Three.jpg"), "rb") as f:
+            self.assertEqual(f.read(), b"placeholder")
+        self.assertFalse(os.path.samefile(self._path("One.jpg"), self._path("Three.jpg")))
+
+    def test_shared_url_is_stored_for_each_game(self):
+        self.http.get.side_effect = lambda url, **kwargs: _response(200, b"placeholder", {"ETag": '"p"'})
+        downloader = CoverDownloader(self.state_path, http=self.http, max_workers=1)
+        downloader.download("https://img/placeholder.jpg", self._path("One.jpg"))
+
+        self.assertEqual(downloader.download("https://img/placeholder.jpg", self._path("Two.jpg")),
+                         self._path("Two.jpg"))
+        # The entry belonged to One, so no conditional request was sent for Two
+        self.assertNotIn("If-None-Match", self.http.get.call_args.kwargs["headers"])
+        self.assertTrue(os.path.samefile(self._path("One.jpg"), self._path("Two.jpg")))
+
+        # Each game keeps its own validators, so a rescan downloads neither again
+        downloader.save()
+        self.http.get.side_effect = None
+        self.http.get.return_value = _response(304)
+        downloader = CoverDownloader(self.state_path, http=self.http)
+        for name in ("One.jpg", "Two.jpg"):
+            self.assertEqual(downloader.download("https://img/placeholder.jpg", self._path(name)), self._path(name))
+            self.assertEqual(self.http.get.call_args.kwargs["headers"], {"If-None-Match": '"p"'})
+        self.assertEqual(downloader.stats()["not_modified"], 2)
+
+    def test_downloads_to_the_same_path_do_not_share_a_temp_file(self):
+        # Both downloads are half written when either finishes
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get(url, **kwargs):
+            response = _response(200)
+            body = url.encode()
+
+            def iter_content(chunk_size):
+                yield body[:4]
+                barrier.wait()
+                yield body[4:]
+
+            response.iter_content.side_effect = iter_content
+            return response
+
+        self.http.get.side_effect = get
+        downloader = CoverDownloader(http=self.http, max_workers=2)
+        downloader.download_many([("https://img/first.jpg", self._path("Game.jpg")),
+                                  ("https://img/second.jpg", self._path("Game.jpg"))])
+
+        self.assertEqual(downloader.stats()["failed"], 0)
+        self.assertEqual(os.listdir(self.root), ["Game.jpg"])
+        with open(self._path("Game.jpg"), "rb") as f:
+            self.assertIn(f.read(), (b"https://img/first.jpg", b"https://img/second.jpg"))
+
+if __name__ == '__main__':
+    unittest.main()
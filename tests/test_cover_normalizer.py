@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src import cover_normalizer
+from src.cover_normalizer import CoverNormalizer
+
+def _fake_normalize(source_path, dest_path, size):
+    shutil.copyfile(source_path, dest_path)
+    return dest_path
+
+class TestCoverNormalizer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.output_dir = os.path.join(self.root, "boxart")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_without_pillow_covers_are_used_as_is(self):
+        cover = self._write("a.jpg", b"jpeg")
+        with patch.object(cover_normalizer, "Image", None):
+            normalizer = CoverNormalizer(self.output_dir)
+            self.assertFalse(normalizer.is_available())
+            self.assertEqual(normalizer.normalize_many([cover]), {cover: cover})
+
+    @patch.object(cover_normalizer, "Image", object())
+    def test_output_is_cached_by_source_hash(self):
+        first = self._write("a.jpg", b"same image")
+        duplicate = self._write("b.jpg", b"same image")
+        normalizer = CoverNormalizer(self.output_dir, size=(300, 400), max_workers=1)
+
+        with patch.object(cover_normalizer, "normalize_image", side_effect=_fake_normalize) as normalize:
+            results = normalizer.normalize_many([first, duplicate])
+            self.assertEqual(normalize.call_count, 1)
+            self.assertEqual(results[first], results[duplicate])
+            self.assertTrue(results[first].endswith("_300x400.png"))
+
+            # A later scan only hashes the source
+            normalizer.normalize(first)
+            self.assertEqual(normalize.call_count, 1)
+        self.assertEqual(normalizer.stats(), {"processed": 1, "cached": 2, "failed": 0})
+
+    @patch.object(cover_normalizer, "Image", object())
+    def test_failures_fall_back_to_source(self):
+        cover = self._write("a.jpg", b"not an image")
+        normalizer = CoverNormalizer(self.output_dir, max_workers=1)
+        with patch.object(cover_normalizer, "normalize_image", side_effect=OSError("cannot identify image")):
+            self.assertEqual(normalizer.normalize(cover), cover)
+        self.assertEqual(normalizer.stats()["failed"], 1)
+
+    @unittest.skipUnless(CoverNormalizer.is_available(), "Pillow is not installed")
+    def test_resizes_and_crops_in_worker_processes(self):
+        from PIL import Image
+        wide = os.path.join(self.root, "wide.jpg")
+        tall = os.path.join(self.root, "tall.png")
+        Image.new("RGB", (1280, 720), "red").save(wide)
+        Image.new("RGBA", (264, 352), "blue").save(tall)
+
+        normalizer = CoverNormalizer(self.output_dir, max_workers=2)
+        try:
+            results = normalizer.normalize_many([wide, tall])
+        finally:
+            normalizer.close()
+
+        for path in results.values():
+            with Image.open(path) as image:
+                self.assertEqual(image.size, (600, 800))
+                self.assertEqual(image.format, "PNG")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.exe_resolver import ExecutableResolver
+
+class TestExecutableResolver(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _make_file(self, relative_path, size):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.truncate(size)
+        return path
+
+    def test_prefers_game_binary_over_junk(self):
+        game = self._make_file(os.path.join("Hollow Knight", "hollow_knight.exe"), 600_000)
+        self._make_file(os.path.join("Hollow Knight", "UnityCrashHandler64.exe"), 2_000_000)
+        self._make_file(os.path.join("Hollow Knight", "unins000.exe"), 3_000_000)
+        self._make_file(os.path.join("Hollow Knight", "_CommonRedist", "vcredist_x64.exe"), 9_000_000)
+
+        resolver = ExecutableResolver()
+        self.assertEqual(resolver.resolve(os.path.join(self.root, "Hollow Knight"), "Hollow Knight"), game)
+
+    def test_prefers_unreal_shipping_binary(self):
+        self._make_file(os.path.join("Satisfactory", "FactoryGame.exe"), 300_000)
+        shipping = self._make_file(
+            os.path.join("Satisfactory", "FactoryGame", "Binaries", "Win64", "FactoryGame-Win64-Shipping.exe"), 90_000_000
+        )
+        self._make_file(os.path.join("Satisfactory", "Engine", "Binaries", "Win64", "CrashReportClient.exe"), 20_000_000)
+
+        resolver = ExecutableResolver()
+        self.assertEqual(resolver.resolve(os.path.join(self.root, "Satisfactory"), "Satisfactory"), shipping)
+
+    def test_cache_reused_until_folder_changes(self):
+        game_dir = os.path.join(self.root, "Celeste")
+        game = self._make_file(os.path.join("Celeste", "Celeste.exe"), 1_000_000)
+        cache_path = os.path.join(self.root, "cache", "exe_cache.json")
+
+        resolver = ExecutableResolver(cache_path)
+        self.assertEqual(resolver.resolve(game_dir, "Celeste"), game)
+        self.assertTrue(resolver.save())
+
+        resolver = ExecutableResolver(cache_path)
+        with patch.object(ExecutableResolver, "_find_best") as mock_find:
+            self.assertEqual(resolver.resolve(game_dir, "Celeste"), game)
+            mock_find.assert_not_called()
+        self.assertEqual(resolver.stats()["hits"], 1)
+
+        os.remove(game)
+        os.utime(game_dir, ns=(0, 0))
+        self.assertIsNone(resolver.resolve(game_dir, "Celeste"))
+        self.assertEqual(resolver.stats()["misses"], 1)
+
+    def test_depth_limit(self):
+        self._make_file(os.path.join("Deep", "a", "b", "c", "Deep.exe"), 1_000_000)
+        resolver = ExecutableResolver(max_depth=2)
+        self.assertIsNone(resolver.resolve(os.path.join(self.root, "Deep"), "Deep"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,56 +1,229 @@
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import sys
+import json
 import os
+import tempfile
+import time
 
 # Mock winreg before importing GameScanner if it's missing (Linux)
 if 'winreg' not in sys.modules:
     sys.modules['winreg'] = MagicMock()
 
-from src.game_scanner import GameScanner
+from src.game_scanner import GameScanner, GameRecord
+from benchmarks.synthetic_steam import generate_steam_install
+from tests.test_appinfo import build_appinfo
 
 class TestGameScanner(unittest.TestCase):
     def setUp(self):
         self.scanner = GameScanner()
 
+    def _write_manifest(self, steamapps_path, appid, name):
+        manifest_path = os.path.join(steamapps_path, f"appmanifest_{appid}.acf")
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            f.write(f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"{name}"\n\t"installdir"\t\t"{name}"\n}}\n')
+        return manifest_path
+
+    def _make_steam_dir(self, root):
+        steam_path = os.path.join(root, "Steam")
+        steamapps_path = os.path.join(steam_path, "steamapps")
+        os.makedirs(steamapps_path)
+        with open(os.path.join(steamapps_path, "libraryfolders.vdf"), "w", encoding="utf-8") as f:
+            f.write('"libraryfolders"\n{\n\t"0"\n\t{\n\t\t"path"\t\t"%s"\n\t}\n}\n' % steam_path.replace("\\", "\\\\"))
+        return steam_path, steamapps_path
+
     @patch("src.game_scanner.winreg.OpenKey")
     @patch("src.game_scanner.winreg.QueryValueEx")
     @patch("src.game_scanner.winreg.CloseKey")
-    @patch("os.path.exists")
-    @patch("src.game_scanner.GameScanner._parse_library_folders")
-    @patch("os.listdir")
-    @patch("src.game_scanner.GameScanner._parse_app_manifest")
-    def test_scan_steam_library(self, mock_parse_manifest, mock_listdir, mock_parse_folders, mock_exists, mock_close_key, mock_query_value, mock_open_key):
-        # Only run if winreg is mockable or present
-        if not hasattr(self.scanner, 'scan_steam_library'):
-             return
-
-        # Mock Registry
-        mock_query_value.return_value = (r"C:\Program Files (x86)\Steam", 1)
-
-        # Mock file existence
-        mock_exists.return_value = True
-
-        # Mock library folders
-        mock_parse_folders.return_value = [r"C:\Program Files (x86)\Steam"]
-
-        # Mock listdir
-        mock_listdir.return_value = ["appmanifest_10.acf"]
-
-        # Mock parse manifest
-        expected_game = {
-            "name": "Counter-Strike",
-            "cmd": "steam://rungameid/10",
-            "working_dir": r"C:\Program Files (x86)\Steam\steamapps\common\Half-Life",
-            "platform": "steam"
-        }
-        mock_parse_manifest.return_value = expected_game
-
-        games = self.scanner.scan_steam_library()
-
-        self.assertEqual(len(games), 1)
-        self.assertEqual(games[0]["name"], "Counter-Strike")
-        self.assertEqual(games[0]["platform"], "steam")
+    def test_scan_steam_library(self, mock_close_key, mock_query_value, mock_open_key):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            self._write_manifest(steamapps_path, 10, "Counter-Strike")
+
+            # Mock Registry
+            mock_query_value.return_value = (steam_path, 1)
+
+            games = self.scanner.scan_steam_library()
+
+            self.assertEqual(len(games), 1)
+            self.assertEqual(games[0]["name"], "Counter-Strike")
+            self.assertEqual(games[0]["platform"], "steam")
+
+    def test_scan_with_manifest_index(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            self._write_manifest(steamapps_path, 10, "Counter-Strike")
+            removed = self._write_manifest(steamapps_path, 20, "Team Fortress Classic")
+            index_path = os.path.join(root, "cache", "manifest_index.json")
+
+            scanner = GameScanner(steam_path=steam_path, index_path=index_path)
+            games = scanner.scan_steam_library()
+            self.assertEqual(len(games), 2)
+            self.assertEqual(scanner.manifest_index.stats()["misses"], 2)
+            self.assertTrue(os.path.exists(index_path))
+
+            # A fresh scanner reuses the persisted index without parsing anything
+            scanner = GameScanner(steam_path=steam_path, index_path=index_path)
+            with patch.object(GameScanner, "_parse_app_manifest") as mock_parse:
+                games = scanner.scan_steam_library()
+                mock_parse.assert_not_called()
+            self.assertEqual([g["name"] for g in games], ["Counter-Strike", "Team Fortress Classic"])
+            self.assertEqual(scanner.manifest_index.stats()["hits"], 2)
+
+            os.remove(removed)
+            self._write_manifest(steamapps_path, 30, "Day of Defeat")
+            games = scanner.scan_steam_library()
+            stats = scanner.manifest_index.stats()
+            self.assertEqual([g["name"] for g in games], ["Counter-Strike", "Day of Defeat"])
+            self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+
+    def test_index_from_an_older_version_is_rebuilt(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            self._write_manifest(steamapps_path, 10, "Counter-Strike")
+            index_path = os.path.join(root, "cache", "manifest_index.json")
+            GameScanner(steam_path=steam_path, index_path=index_path).scan_steam_library()
+
+            # A record cached before working_dir pointed into steamapps
+            with open(index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            data["version"] -= 1
+            for entry in data["entries"].values():
+                entry["game"]["working_dir"] = os.path.join(steam_path, "common", "Counter-Strike")
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+            games = GameScanner(steam_path=steam_path, index_path=index_path).scan_steam_library()
+            self.assertEqual(games[0]["working_dir"], os.path.join(steamapps_path, "common", "Counter-Strike"))
+
+    def test_parallel_scan_matches_sequential(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            library_paths = [steam_path]
+            for i in range(3):
+                lib_path = os.path.join(root, f"Library{i}")
+                os.makedirs(os.path.join(lib_path, "steamapps"))
+                library_paths.append(lib_path)
+                for j in range(5):
+                    self._write_manifest(os.path.join(lib_path, "steamapps"), i * 100 + j, f"Game {i}-{j}")
+            self._write_manifest(steamapps_path, 7, "Main Library Game")
+
+            with patch.object(GameScanner, "_parse_library_folders", return_value=list(library_paths)):
+                sequential = GameScanner(steam_path=steam_path).scan_steam_library()
+                scanner = GameScanner(steam_path=steam_path, max_workers=4)
+                parallel = scanner.scan_steam_library()
+
+            self.assertEqual(len(sequential), 16)
+            self.assertEqual(parallel, sequential)
+            self.assertEqual(set(scanner.library_timings), set(library_paths))
+
+    def test_scan_system_order_is_stable(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            library_paths = [steam_path]
+            for i in range(3):
+                lib_path = os.path.join(root, f"Library{i}")
+                os.makedirs(os.path.join(lib_path, "steamapps"))
+                library_paths.append(lib_path)
+                for j in range(3):
+                    self._write_manifest(os.path.join(lib_path, "steamapps"), i * 100 + j, f"Game {i}-{j}")
+            self._write_manifest(steamapps_path, 7, "Main Library Game")
+            iter_library = GameScanner._iter_library
+
+            def slow_main_library(scanner, lib_path, *args):
+                # The first library finishes last
+                if lib_path == steam_path:
+                    time.sleep(0.2)
+                return iter_library(scanner, lib_path, *args)
+
+            with patch.object(GameScanner, "_parse_library_folders", return_value=list(library_paths)), \
+                 patch.object(GameScanner, "_iter_library", slow_main_library):
+                expected = GameScanner(steam_path=steam_path, use_appinfo=False).scan_steam_library()
+                games = GameScanner(steam_path=steam_path, max_workers=4, use_appinfo=False).scan_system()
+
+            self.assertEqual(expected[0]["name"], "Main Library Game")
+            self.assertEqual(games, expected)
+
+    def test_iter_steam_library_streams_records(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            library_paths = [steam_path]
+            for i in range(2):
+                lib_path = os.path.join(root, f"Library{i}")
+                os.makedirs(os.path.join(lib_path, "steamapps"))
+                library_paths.append(lib_path)
+                for j in range(3):
+                    self._write_manifest(os.path.join(lib_path, "steamapps"), i * 100 + j, f"Game {i}-{j}")
+            index_path = os.path.join(root, "manifest_index.json")
+
+            with patch.object(GameScanner, "_parse_library_folders", return_value=list(library_paths)):
+                scanner = GameScanner(steam_path=steam_path, index_path=index_path, max_workers=4)
+                games = list(scanner.iter_steam_library())
+                self.assertEqual(len(games), 6)
+                self.assertIsInstance(games[0], GameRecord)
+                self.assertFalse(hasattr(games[0], "__dict__"))
+                self.assertEqual(sorted(g.name for g in games), sorted(g["name"] for g in scanner.scan_system()))
+
+                # Stopping early must not evict the manifests that were not reached
+                stream = GameScanner(steam_path=steam_path, index_path=index_path).iter_steam_library()
+                next(stream)
+                stream.close()
+                scanner = GameScanner(steam_path=steam_path, index_path=index_path)
+                self.assertEqual(len(scanner.manifest_index.entries), 6)
+
+    def test_scan_synthetic_install(self):
+        with tempfile.TemporaryDirectory() as root:
+            install = generate_steam_install(root, libraries=3, manifests=40, malformed=0.25, seed=1)
+            self.assertGreater(install["malformed"], 0)
+
+            scanner = GameScanner(steam_path=install["steam_path"], max_workers=3)
+            games = scanner.scan_steam_library()
+
+            self.assertEqual(len(games), install["games"])
+            self.assertEqual(set(scanner.library_timings), set(install["library_paths"]))
+
+    def test_scan_adds_appinfo_details(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            self._write_manifest(steamapps_path, 10, "Counter-Strike")
+            self._write_manifest(steamapps_path, 20, "Team Fortress Classic")
+            os.makedirs(os.path.join(steam_path, "appcache"))
+            build_appinfo(os.path.join(steam_path, "appcache", "appinfo.vdf"), {
+                10: {"common": {"type": "Game"}, "config": {"launch": {"0": {"executable": "bin\\hl.exe"}}}}
+            })
+
+            games = {g.appid: g for g in GameScanner(steam_path=steam_path).scan_steam_library()}
+
+            self.assertEqual(games["10"].app_type, "game")
+            self.assertEqual(games["10"].executable,
+                             os.path.join(steamapps_path, "common", "Counter-Strike", "bin", "hl.exe"))
+            # Apps missing from appinfo.vdf are still returned, just without the extra details
+            self.assertIsNone(games["20"].app_type)
+            self.assertIsNone(games["20"].executable)
+
+            games = GameScanner(steam_path=steam_path, use_appinfo=False).scan_steam_library()
+            self.assertIsNone(games[0].app_type)
+
+    def test_load_manifests_shares_appinfo_and_saves_once(self):
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            paths = [self._write_manifest(steamapps_path, 10, "Counter-Strike"),
+                     self._write_manifest(steamapps_path, 20, "Team Fortress Classic")]
+            os.makedirs(os.path.join(steam_path, "appcache"))
+            build_appinfo(os.path.join(steam_path, "appcache", "appinfo.vdf"), {
+                10: {"common": {"type": "Game"}, "config": {"launch": {"0": {"executable": "bin\\hl.exe"}}}}
+            })
+            resolver = MagicMock()
+            resolver.resolve.return_value = "tfc.exe"
+            scanner = GameScanner(steam_path=steam_path, exe_resolver=resolver)
+
+            with patch.object(scanner, "_open_appinfo", wraps=scanner._open_appinfo) as mock_open_appinfo:
+                games = dict(scanner.load_manifests(paths))
+
+            mock_open_appinfo.assert_called_once()
+            resolver.save.assert_called_once()
+            self.assertEqual(games[paths[0]].app_type, "game")
+            self.assertEqual(games[paths[1]].executable, "tfc.exe")
 
     def test_parse_library_folders(self):
         vdf_content = """"libraryfolders"
@@ -79,17 +252,28 @@ class TestGameScanner(unittest.TestCase):
     "name"      "Counter-Strike"
     "StateFlags"        "4"
     "installdir"        "Half-Life"
+    "LastUpdated"       "1700000000"
 }
 """
-        with patch("builtins.open", mock_open(read_data=manifest_content)):
+        with patch("builtins.open", mock_open(read_data=manifest_content.encode())):
             # Use os.path.join for cross-platform compatibility in test expectation
             steamapps_path = os.path.join("C:", "Steam", "steamapps")
             game = self.scanner._parse_app_manifest("dummy_path", steamapps_path)
             self.assertEqual(game["name"], "Counter-Strike")
             self.assertEqual(game["cmd"], "steam://rungameid/10")
+            self.assertEqual(game["last_updated"], 1700000000)
+
+    def test_working_dir_is_the_install_dir(self):
+        # Steam installs games to <library>/steamapps/common/<installdir>, in
+        # every library, not to <library>/common
+        with tempfile.TemporaryDirectory() as root:
+            steam_path, steamapps_path = self._make_steam_dir(root)
+            manifest_path = self._write_manifest(steamapps_path, 10, "Counter-Strike")
+            expected_dir = os.path.join(steamapps_path, "common", "Counter-Strike")
 
-            expected_dir = os.path.join(os.path.dirname(steamapps_path), "common", "Half-Life")
-            self.assertEqual(game["working_dir"], expected_dir)
+            scanner = GameScanner(steam_path=steam_path)
+            self.assertEqual(scanner.scan_steam_library()[0].working_dir, expected_dir)
+            self.assertEqual(scanner.load_manifest(manifest_path).working_dir, expected_dir)
 
 if __name__ == '__main__':
     unittest.main()
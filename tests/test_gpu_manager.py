@@ -70,5 +70,18 @@ class TestGPUManager(unittest.TestCase):
         result = self.manager.check_registry_access()
         self.assertTrue(result)
 
+    @patch('src.gpu_manager.win32api')
+    def test_list_adapters(self, mock_win32api):
+        devices = [
+            MagicMock(DeviceName="\\\\.\\DISPLAY1", DeviceString="Intel(R) UHD Graphics"),
+            MagicMock(DeviceName="\\\\.\\DISPLAY2", DeviceString="NVIDIA GeForce RTX 4060 Laptop GPU"),
+            MagicMock(DeviceName="\\\\.\\DISPLAY3", DeviceString="NVIDIA GeForce RTX 4060 Laptop GPU"),
+        ]
+        mock_win32api.EnumDisplayDevices.side_effect = lambda device, i: devices[i]
+
+        self.assertEqual(self.manager.list_adapters(), ["Intel(R) UHD Graphics", "NVIDIA GeForce RTX 4060 Laptop GPU"])
+        self.assertEqual(self.manager.display_adapter("\\\\.\\DISPLAY2"), "NVIDIA GeForce RTX 4060 Laptop GPU")
+        self.assertIsNone(self.manager.display_adapter("\\\\.\\DISPLAY9"))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from src.http_client import HttpClient
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.client = HttpClient(max_retries=3, backoff=0.5)
+        self.session_request = patch.object(self.client.session, "request").start()
+        self.sleep = patch("src.http_client.time.sleep").start()
+
+    def tearDown(self):
+        patch.stopall()
+        self.client.close()
+
+    def test_retries_transient_errors_with_backoff(self):
+        ok = _response(200)
+        self.session_request.side_effect = [requests.ConnectionError("reset"), _response(503), ok]
+
+        self.assertIs(self.client.get("https://api.igdb.com/v4/games"), ok)
+
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(0.25 <= delays[0] <= 0.5)
+        self.assertTrue(0.5 <= delays[1] <= 1.0)
+        # Timeouts are always applied
+        self.assertEqual(self.session_request.call_args.kwargs["timeout"], self.client.timeout)
+
+        stats = self.client.stats()["api.igdb.com"]
+        self.assertEqual((stats["requests"], stats["errors"], stats["retries"]), (3, 2, 2))
+
+    def test_honors_retry_after(self):
+        self.session_request.side_effect = [_response(429, {"Retry-After": "7"}), _response(200)]
+        self.client.post("https://api.igdb.com/v4/multiquery", data="query")
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_gives_up_after_max_retries(self):
+        self.session_request.return_value = _response(500)
+        self.assertEqual(self.client.get("https://example.com/").status_code, 500)
+        self.assertEqual(self.session_request.call_count, 4)
+
+        self.session_request.side_effect = requests.Timeout("slow")
+        with self.assertRaises(requests.Timeout):
+            self.client.get("https://example.com/")
+
+    def test_client_errors_are_not_retried(self):
+        self.session_request.return_value = _response(404)
+        self.assertEqual(self.client.get("https://example.com/missing").status_code, 404)
+        self.assertEqual(self.session_request.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_429_backs_off_rate_limiter(self):
+        limiter = MagicMock()
+        self.session_request.side_effect = [_response(429, {"Retry-After": "2"}), _response(200)]
+        self.client.get("https://api.igdb.com/v4/games", rate_limiter=limiter)
+
+        self.assertEqual(limiter.acquire.call_count, 2)
+        self.assertEqual([call.args[0] for call in limiter.release.call_args_list], [429, 200])
+        limiter.backoff.assert_called_once_with(2.0)
+        self.assertNotIn("rate_limiter", self.session_request.call_args.kwargs)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,9 @@ from src.installer import download_file, extract_zip
 
 class TestInstaller(unittest.TestCase):
 
-    @patch('src.installer.requests.get')
-    def test_download_file_success(self, mock_get):
+    @patch('src.installer.default_client')
+    def test_download_file_success(self, mock_client):
+        mock_get = mock_client.return_value.get
         # Mock response
         mock_response = MagicMock()
         mock_response.iter_content.return_value = [b'chunk1', b'chunk2']
@@ -21,8 +22,9 @@ class TestInstaller(unittest.TestCase):
             mock_file().write.assert_any_call(b'chunk1')
             mock_file().write.assert_any_call(b'chunk2')
 
-    @patch('src.installer.requests.get')
-    def test_download_file_failure(self, mock_get):
+    @patch('src.installer.default_client')
+    def test_download_file_failure(self, mock_client):
+        mock_get = mock_client.return_value.get
         mock_get.side_effect = Exception("Download failed")
         result = download_file("http://example.com/file.zip", "test.zip")
         self.assertFalse(result)
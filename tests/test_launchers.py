@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+if 'winreg' not in sys.modules:
+    sys.modules['winreg'] = MagicMock()
+
+from src import launchers
+from src.game_scanner import GameScanner, GameRecord
+from src.launchers.base import LauncherScanner
+from src.launchers.epic import EpicScanner
+from src.launchers.xbox import XboxScanner
+
+class FakeScanner(LauncherScanner):
+    def __init__(self, name, games=(), error=None, delay=0):
+        self.name = name
+        self.games = games
+        self.error = error
+        self.delay = delay
+
+    def scan(self):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        for game_name in self.games:
+            yield GameRecord(game_name, game_name, "", self.name)
+
+class TestLaunchers(unittest.TestCase):
+    def test_load_scanner(self):
+        scanner = launchers.load_scanner("epic")
+        self.assertIsInstance(scanner, EpicScanner)
+        with self.assertRaises(KeyError):
+            launchers.load_scanner("unknown")
+
+    def test_epic_scanner(self):
+        with tempfile.TemporaryDirectory() as manifests_dir:
+            items = {
+                "game.item": {
+                    "DisplayName": "Epic Game", "InstallLocation": "D:\\Epic\\Game", "AppName": "Fennec",
+                    "MainGameAppName": "Fennec", "CatalogNamespace": "ns", "CatalogItemId": "item"
+                },
+                "dlc.item": {
+                    "DisplayName": "Epic DLC", "InstallLocation": "D:\\Epic\\Game", "AppName": "FennecDLC",
+                    "MainGameAppName": "Fennec"
+                },
+                "partial.item": {
+                    "DisplayName": "Partial", "InstallLocation": "D:\\Epic\\Partial", "AppName": "Partial",
+                    "bIsIncompleteInstall": True
+                },
+            }
+            for filename, data in items.items():
+                with open(os.path.join(manifests_dir, filename), "w") as f:
+                    json.dump(data, f)
+            with open(os.path.join(manifests_dir, "broken.item"), "w") as f:
+                f.write("{not json")
+
+            games = list(EpicScanner(manifests_dir).scan())
+
+        self.assertEqual(len(games), 1)
+        self.assertEqual(games[0].name, "Epic Game")
+        self.assertEqual(games[0].platform, "epic")
+        self.assertEqual(games[0].cmd, "com.epicgames.launcher://apps/ns%3Aitem%3AFennec?action=launch&silent=true")
+
+    def test_xbox_scanner(self):
+        with tempfile.TemporaryDirectory() as root:
+            content_dir = os.path.join(root, "Halo", "Content")
+            os.makedirs(content_dir)
+            with open(os.path.join(content_dir, "MicrosoftGame.config"), "w") as f:
+                f.write('<Game><Identity Name="Microsoft.Halo"/><ShellVisuals DefaultDisplayName="Halo"/>'
+                        '<ExecutableList><Executable Name="halo.exe" Id="Game"/></ExecutableList></Game>')
+            os.makedirs(os.path.join(root, "NotAGame"))
+
+            games = list(XboxScanner(roots=[root]).scan())
+
+        self.assertEqual(len(games), 1)
+        self.assertEqual(games[0].name, "Halo")
+        self.assertEqual(games[0].cmd, os.path.join(content_dir, "halo.exe"))
+        self.assertEqual(games[0].appid, "Microsoft.Halo")
+
+    def test_scan_system_isolates_failures(self):
+        fakes = {
+            "epic": FakeScanner("epic", games=["A", "B"]),
+            "gog": FakeScanner("gog", error=RuntimeError("registry broken")),
+            "xbox": FakeScanner("xbox", games=["C"]),
+        }
+        scanner = GameScanner(launchers=["epic", "gog", "xbox"])
+        with patch("src.game_scanner.launchers.load_scanner", side_effect=fakes.get):
+            games = scanner.scan_system()
+
+        self.assertEqual([g.name for g in games], ["A", "B", "C"])
+        self.assertIn("gog", scanner.launcher_errors)
+        self.assertEqual(set(scanner.launcher_timings), {"epic", "xbox"})
+
+    def test_scan_system_runs_launchers_concurrently(self):
+        fakes = {name: FakeScanner(name, games=[name], delay=0.2) for name in ("epic", "gog", "xbox")}
+        fakes["ea"] = FakeScanner("ea", games=["stalled"], delay=5)
+        scanner = GameScanner(launchers=["epic", "gog", "xbox", "ea"], launcher_timeout=1)
+
+        start = time.perf_counter()
+        with patch("src.game_scanner.launchers.load_scanner", side_effect=fakes.get):
+            games = list(scanner.iter_system())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(sorted(g.name for g in games), ["epic", "gog", "xbox"])
+        self.assertLess(elapsed, 2)
+        self.assertIsInstance(scanner.launcher_errors["ea"], str)
+
+    def test_timeout_keeps_finished_launchers_in_order(self):
+        # epic is still running at the deadline, xbox finished but waits behind it
+        fakes = {
+            "epic": FakeScanner("epic", games=["stalled"], delay=5),
+            "xbox": FakeScanner("xbox", games=["C", "D"]),
+        }
+        scanner = GameScanner(launchers=["epic", "xbox"], launcher_timeout=0.3)
+
+        with patch("src.game_scanner.launchers.load_scanner", side_effect=fakes.get):
+            games = scanner.scan_system()
+
+        self.assertEqual([g.name for g in games], ["C", "D"])
+        self.assertEqual(set(scanner.launcher_errors), {"epic"})
+        self.assertIn("xbox", scanner.launcher_timings)
+
+if __name__ == '__main__':
+    unittest.main()
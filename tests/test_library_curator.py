@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+from src.game_scanner import GameRecord
+from src.library_curator import LibraryCurator, read_play_stats
+
+LOCALCONFIG = """"UserLocalConfigStore"
+{
+    "Software"
+    {
+        "Valve"
+        {
+            "Steam"
+            {
+                "%s"
+                {
+%s
+                }
+            }
+        }
+    }
+}
+"""
+
+def _app(appid, last_played, playtime):
+    return f'"{appid}" {{ "LastPlayed" "{last_played}" "Playtime" "{playtime}" }}'
+
+class TestReadPlayStats(unittest.TestCase):
+    def test_merges_accounts(self):
+        with tempfile.TemporaryDirectory() as steam_path:
+            for account, apps_key, apps in (
+                ("111", "apps", [_app(620, 1700000000, 300), _app(1145360, 1600000000, 50)]),
+                ("222", "Apps", [_app(620, 1650000000, 900)]),
+            ):
+                config_dir = os.path.join(steam_path, "userdata", account, "config")
+                os.makedirs(config_dir)
+                with open(os.path.join(config_dir, "localconfig.vdf"), "w", encoding="utf-8") as f:
+                    f.write(LOCALCONFIG % (apps_key, "\n".join(apps)))
+            with open(os.path.join(steam_path, "userdata", "333.vdf"), "w") as f:
+                f.write("not an account")
+
+            stats = read_play_stats(steam_path)
+
+        self.assertEqual(stats, {
+            "620": {"last_played": 1700000000, "playtime": 900},
+            "1145360": {"last_played": 1600000000, "playtime": 50},
+        })
+
+    def test_missing_steam(self):
+        self.assertEqual(read_play_stats(os.path.join(tempfile.gettempdir(), "no-steam-here")), {})
+
+class TestLibraryCurator(unittest.TestCase):
+    def setUp(self):
+        self.games = [
+            GameRecord("Portal 2", "p", "", "steam", appid="620", last_updated=100),
+            GameRecord("Hades", "h", "", "steam", appid="1145360", last_updated=100),
+            GameRecord("Celeste", "c", "", "steam", appid="504230", last_updated=400),
+            GameRecord("Control", "epic-control", "", "epic"),
+            GameRecord("Alan Wake", "epic-alan", "", "epic"),
+        ]
+        self.play_stats = {
+            "620": {"last_played": 300, "playtime": 10},
+            "1145360": {"last_played": 500, "playtime": 5},
+        }
+
+    def _names(self, games):
+        return [game["name"] for game in games]
+
+    def test_orders_by_recency(self):
+        kept, dropped = LibraryCurator(play_stats=self.play_stats).curate(self.games)
+        # Never played Celeste ranks by its update time; other launchers rank last by name
+        self.assertEqual(self._names(kept), ["Hades", "Celeste", "Portal 2", "Alan Wake", "Control"])
+        self.assertEqual(dropped, [])
+
+    def test_caps_and_pins(self):
+        curator = LibraryCurator(max_games=3, pinned=["CONTROL", "620"], play_stats=self.play_stats)
+
+        kept, dropped = curator.curate(self.games)
+
+        self.assertEqual(self._names(kept), ["Control", "Portal 2", "Hades"])
+        self.assertEqual(self._names(dropped), ["Celeste", "Alan Wake"])
+        self.assertEqual(curator.dropped, 2)
+
+        # Pinned games keep their place however recently the others were played
+        self.play_stats["504230"] = {"last_played": 900, "playtime": 1}
+        kept, _ = curator.curate(reversed(self.games))
+        self.assertEqual(self._names(kept), ["Control", "Portal 2", "Celeste"])
+
+    def test_pins_beyond_the_cap(self):
+        kept, dropped = LibraryCurator(max_games=1, pinned=["Alan Wake", "Control"]).curate(self.games)
+        self.assertEqual(self._names(kept), ["Alan Wake", "Control"])
+        self.assertEqual(len(dropped), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.library_watcher import LibraryWatcher, CREATED, CHANGED, DELETED
+
+class TestLibraryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.steamapps = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, appid, content):
+        path = os.path.join(self.steamapps, f"appmanifest_{appid}.acf")
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_diff(self):
+        old = {"a": (1, 10), "b": (1, 10)}
+        new = {"b": (2, 10), "c": (1, 10)}
+        self.assertEqual(LibraryWatcher.diff(old, new), {"a": DELETED, "b": CHANGED, "c": CREATED})
+
+    def test_polling_detects_changes(self):
+        changed = self._write(10, "old")
+        removed = self._write(20, "old")
+        self._write(30, "unchanged")
+        with open(os.path.join(self.steamapps, "libraryfolders.vdf"), "w") as f:
+            f.write("not a manifest")
+        watcher = LibraryWatcher([self.steamapps], debounce=0.05, poll_interval=0.05, use_native=False)
+        self.assertEqual(len(watcher.snapshot), 3)
+
+        self._write(10, "new content")
+        os.remove(removed)
+        created = self._write(40, "new")
+
+        changes = watcher.wait_for_changes(timeout=2)
+        self.assertEqual(changes, {changed: CHANGED, removed: DELETED, created: CREATED})
+        self.assertEqual(watcher.wait_for_changes(timeout=0.2), {})
+
+    def test_burst_is_coalesced(self):
+        watcher = LibraryWatcher([self.steamapps], debounce=0.3, poll_interval=0.05, use_native=False)
+
+        def burst():
+            path = self._write(10, "downloading")
+            time.sleep(0.1)
+            self._write(10, "downloading more")
+            time.sleep(0.1)
+            self._write(20, "temporary")
+            time.sleep(0.1)
+            os.remove(os.path.join(self.steamapps, "appmanifest_20.acf"))
+            return path
+
+        writer = threading.Thread(target=burst)
+        writer.start()
+        changes = watcher.wait_for_changes(timeout=3)
+        writer.join()
+
+        self.assertEqual(changes, {os.path.join(self.steamapps, "appmanifest_10.acf"): CREATED})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from src.local_artwork import SteamArtworkSource
+
+class TestSteamArtworkSource(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.steam_path = self.temp_dir.name
+        self.librarycache = os.path.join(self.steam_path, "appcache", "librarycache")
+        os.makedirs(self.librarycache)
+        self.covers_dir = os.path.join(self.steam_path, "covers")
+        os.makedirs(self.covers_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path, content=b"image"):
+        path = os.path.join(self.librarycache, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_finds_flat_and_nested_layouts(self):
+        self._write("10_library_600x900.jpg")
+        hires = self._write("10_library_600x900_2x.jpg")
+        nested = self._write(os.path.join("620", "0123abcd", "library_600x900.jpg"))
+        self._write(os.path.join("620", "header.jpg"))
+
+        artwork = SteamArtworkSource(self.steam_path)
+        self.assertTrue(artwork.is_available())
+        self.assertEqual(artwork.find_cover("10"), hires)
+        self.assertEqual(artwork.find_cover("620"), nested)
+        self.assertIsNone(artwork.find_cover("70"))
+        self.assertIsNone(artwork.find_cover(None))
+
+    def test_copy_cover_links_into_covers_dir(self):
+        source = self._write("10_library_600x900.jpg", b"cover")
+        artwork = SteamArtworkSource(self.steam_path)
+
+        dest = artwork.copy_cover("10", os.path.join(self.covers_dir, "Counter Strike"))
+        self.assertEqual(dest, os.path.join(self.covers_dir, "Counter Strike.jpg"))
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(), b"cover")
+        self.assertTrue(os.path.samefile(source, dest))
+
+        # Copying again is a no-op
+        self.assertEqual(artwork.copy_cover("10", os.path.join(self.covers_dir, "Counter Strike")), dest)
+        self.assertIsNone(artwork.copy_cover("70", os.path.join(self.covers_dir, "Half-Life")))
+        self.assertEqual(artwork.stats(), {"hits": 2, "misses": 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.metadata_cache import MetadataCache
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "cache", "metadata.sqlite3")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_spellings_of_a_title_share_an_entry(self):
+        cache = MetadataCache(":memory:")
+        cache.set_search("DOOM™: The  Dark_Ages®", {"name": "DOOM: The Dark Ages"})
+        cache.set_search("Pokémon", {"name": "Pokémon"})
+        cache.set_search("???", None)
+
+        self.assertEqual(cache.get_search("Doom The Dark Ages (Deluxe Edition)"), (True, {"name": "DOOM: The Dark Ages"}))
+        self.assertEqual(cache.get_search("Pokemon"), (True, {"name": "Pokémon"}))
+        # Titles without a canonical key do not share one
+        self.assertEqual(cache.get_search("!!!"), (False, None))
+        cache.close()
+
+    def test_searches_of_an_older_schema_are_dropped(self):
+        cache = MetadataCache(self.db_path)
+        cache.set_search("Portal 2", {"name": "Portal 2"})
+        cache.set_steam_game(620, {"name": "Portal 2"})
+        with cache._conn:
+            cache._conn.execute("PRAGMA user_version = 1")
+        cache.close()
+
+        cache = MetadataCache(self.db_path)
+        self.assertEqual(cache.get_search("Portal 2"), (False, None))
+        self.assertEqual(cache.get_steam_game(620), (True, {"name": "Portal 2"}))
+        cache.close()
+
+    def test_results_persist_across_instances(self):
+        cache = MetadataCache(self.db_path)
+        cache.set_search("Portal 2", {"name": "Portal 2", "cover": {"url": "//img/t_thumb/a.jpg"}})
+        cache.set_search("Unknown Tool", None)
+        cache.set_token("token", time.time() + 3600)
+        cache.close()
+
+        cache = MetadataCache(self.db_path)
+        self.assertEqual(cache.get_search("portal 2"), (True, {"name": "Portal 2", "cover": {"url": "//img/t_thumb/a.jpg"}}))
+        self.assertEqual(cache.get_search("Unknown Tool"), (True, None))
+        self.assertEqual(cache.get_search("Half-Life"), (False, None))
+        self.assertEqual(cache.get_token()[0], "token")
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["negative_hits"], stats["misses"]), (1, 1, 1))
+        self.assertEqual((stats["entries"], stats["negative_entries"]), (1, 1))
+        cache.close()
+
+    def test_expiry_and_prune(self):
+        cache = MetadataCache(self.db_path, ttl=100, negative_ttl=10)
+        cache.set_search("Portal 2", {"name": "Portal 2"})
+        cache.set_search("Unknown Tool", None)
+        cache.set_token("token", time.time() + 50)
+
+        later = time.time() + 60
+        with patch("src.metadata_cache.time.time", return_value=later):
+            # Negative entries expire first
+            self.assertEqual(cache.get_search("Unknown Tool"), (False, None))
+            self.assertTrue(cache.get_search("Portal 2")[0])
+            self.assertIsNone(cache.get_token())
+            self.assertEqual(cache.prune(), 2)
+
+        self.assertEqual(cache.prune(everything=True), 1)
+        self.assertEqual(cache.stats()["entries"], 0)
+        cache.close()
+
+    def test_steam_mappings_do_not_expire(self):
+        cache = MetadataCache(self.db_path, ttl=100, negative_ttl=10)
+        cache.set_steam_game(620, {"name": "Portal 2"})
+        cache.set_steam_game("999", None)
+
+        with patch("src.metadata_cache.time.time", return_value=time.time() + 10 ** 9):
+            self.assertEqual(cache.get_steam_game("620"), (True, {"name": "Portal 2"}))
+            self.assertEqual(cache.get_steam_game("999"), (False, None))
+            self.assertEqual(cache.prune(), 1)
+        self.assertEqual(cache.stats()["steam_mappings"], 1)
+
+        self.assertEqual(cache.prune(everything=True), 1)
+        self.assertEqual(cache.get_steam_game("620"), (False, None))
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
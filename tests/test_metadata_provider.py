@@ -0,0 +1,194 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from benchmarks.fake_igdb import FakeIGDBServer
+from src.http_client import HttpClient
+from src.metadata_cache import MetadataCache
+from src.metadata_provider import IGDBMetadataProvider
+from src.rate_limiter import RateLimiter
+
+def _response(data, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    return response
+
+class TestIGDBMetadataProvider(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "metadata.sqlite3")
+        self.http = MagicMock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _scan(self, titles):
+        cache = MetadataCache(self.db_path)
+        provider = IGDBMetadataProvider("id", "secret", cache=cache, http=self.http)
+        results = [provider.search_game(title) for title in titles]
+        cache.close()
+        return results
+
+    def test_repeat_scan_makes_no_requests(self):
+        mock_post = self.http.post
+        def post(url, **kwargs):
+            if url == IGDBMetadataProvider.AUTH_URL:
+                return _response({"access_token": "token", "expires_in": 3600})
+            if "Portal" in kwargs["data"]:
+                return _response([{"name": "Portal 2", "cover": {"url": "//img/t_thumb/a.jpg"}}])
+            return _response([])
+        mock_post.side_effect = post
+
+        first = self._scan(["Portal 2", "Steamworks Common Redistributables"])
+        self.assertEqual(first[0]["name"], "Portal 2")
+        self.assertIsNone(first[1])
+        self.assertEqual(mock_post.call_count, 3)
+
+        mock_post.reset_mock()
+        self.assertEqual(self._scan(["Portal 2", "Steamworks Common Redistributables"]), first)
+        mock_post.assert_not_called()
+
+    def test_request_errors_are_not_cached(self):
+        mock_post = self.http.post
+        mock_post.side_effect = [
+            _response({"access_token": "token", "expires_in": 3600}),
+            Exception("connection reset"),
+            _response([{"name": "Portal 2"}]),
+        ]
+        self.assertEqual(self._scan(["Portal 2"]), [None])
+        self.assertEqual(self._scan(["Portal 2"]), [{"name": "Portal 2"}])
+
+    def test_search_games_uses_multiquery(self):
+        mock_post = self.http.post
+        names = [f"Game {i}" for i in range(12)] + ['Say "Hello"']
+        queries = []
+
+        def post(url, **kwargs):
+            if url == IGDBMetadataProvider.AUTH_URL:
+                return _response({"access_token": "token", "expires_in": 3600})
+            self.assertTrue(url.endswith("/multiquery"))
+            queries.append(kwargs["data"])
+            count = kwargs["data"].count("query games")
+            # Every other sub-query finds a match
+            return _response([
+                {"name": str(i), "result": [{"name": f"match {i}"}] if i % 2 == 0 else []}
+                for i in range(count)
+            ])
+        mock_post.side_effect = post
+
+        provider = IGDBMetadataProvider("id", "secret", cache=MetadataCache(self.db_path), http=self.http)
+        results = provider.search_games(names + ["Game 0"])
+
+        self.assertEqual(provider.request_count, 3)
+        self.assertEqual(len(queries), 2)
+        self.assertIn('search "Say \\"Hello\\""', queries[1])
+        self.assertEqual(results["Game 0"], {"name": "match 0"})
+        self.assertIsNone(results["Game 1"])
+        self.assertEqual(results["Game 10"], {"name": "match 0"})
+        self.assertEqual(set(results), set(names))
+
+        # Everything, including the misses, is now answered by the cache
+        self.assertEqual(provider.search_games(names), results)
+        self.assertEqual(provider.request_count, 3)
+
+    def test_search_games_runs_batches_concurrently(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def post(url, **kwargs):
+            if url == IGDBMetadataProvider.AUTH_URL:
+                # Only IGDB API requests are paced, not the Twitch token request
+                self.assertNotIn("rate_limiter", kwargs)
+                return _response({"access_token": "token", "expires_in": 3600})
+            self.assertIsInstance(kwargs["rate_limiter"], RateLimiter)
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.pop()
+            return _response([{"name": "0", "result": []}])
+        self.http.post.side_effect = post
+
+        provider = IGDBMetadataProvider("id", "secret", http=self.http,
+                                        rate_limiter=RateLimiter(rate=1000, max_in_flight=3))
+        results = provider.search_games([f"Game {i}" for i in range(50)])
+
+        self.assertEqual(len(results), 50)
+        self.assertEqual(provider.request_count, 6)
+        self.assertEqual(max(peak), 3)
+
+    def test_lookup_steam_games_uses_external_games(self):
+        queries = []
+
+        def post(url, **kwargs):
+            if url == IGDBMetadataProvider.AUTH_URL:
+                return _response({"access_token": "token", "expires_in": 3600})
+            self.assertTrue(url.endswith("/external_games"))
+            queries.append(kwargs["data"])
+            return _response([{"uid": "620", "game": {"name": "Portal 2", "cover": {"url": "//img/a.jpg"}}}])
+        self.http.post.side_effect = post
+
+        provider = IGDBMetadataProvider("id", "secret", cache=MetadataCache(self.db_path), http=self.http)
+        results = provider.lookup_steam_games(["620", 123456, "620"])
+
+        self.assertEqual(results, {"620": {"name": "Portal 2", "cover": {"url": "//img/a.jpg"}}, "123456": None})
+        self.assertEqual(len(queries), 1)
+        self.assertIn("category = 1", queries[0])
+        self.assertIn('uid = ("620","123456")', queries[0])
+
+        # Both the match and the miss are answered by the cache
+        self.assertEqual(provider.lookup_steam_games(["620", "123456"]), results)
+        self.assertEqual(provider.request_count, 2)
+
+class TestIGDBMetadataProviderAgainstStandIn(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeIGDBServer(catalog_size=200, retry_after=0).start()
+        self.portal = self.server.add_game("Portal 2", steam_appid=620)
+        self.http = HttpClient(backoff=0.01)
+
+    def tearDown(self):
+        self.http.close()
+        self.server.stop()
+
+    def _provider(self, **kwargs):
+        return IGDBMetadataProvider(
+            FakeIGDBServer.CLIENT_ID, FakeIGDBServer.CLIENT_SECRET, http=self.http,
+            api_url=self.server.api_url, auth_url=self.server.auth_url, **kwargs
+        )
+
+    def test_end_to_end_lookups(self):
+        names = [game["name"] for game in self.server.games[:50]] + ["No Such Game"]
+        provider = self._provider(rate_limiter=RateLimiter(rate=1000, max_in_flight=4))
+
+        results = provider.search_games(names)
+        self.assertEqual({name: results[name]["name"] if results[name] else None for name in names},
+                         {name: None if name == "No Such Game" else name for name in names})
+        self.assertEqual(provider.lookup_steam_games([620, 730]), {"620": self.portal, "730": None})
+
+        cover_url = provider.get_cover_art(results[names[0]])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cover.jpg")
+            self.assertTrue(provider.download_cover_art(cover_url, path))
+            with open(path, "rb") as f:
+                self.assertTrue(f.read().startswith(b"\x89PNG"))
+        self.assertEqual(self.server.requests["/v4/multiquery"], 6)
+
+    def test_recovers_from_throttling_and_expired_tokens(self):
+        self.server.throttle_every = 3
+        provider = self._provider(rate_limiter=RateLimiter(rate=1000, max_in_flight=2))
+        names = [game["name"] for game in self.server.games[:40]]
+        self.assertTrue(all(provider.search_games(names).values()))
+        self.assertGreater(self.server.throttled, 0)
+
+        self.server.expire_tokens()
+        self.assertEqual(provider.search_game("Portal 2"), self.portal)
+        self.assertEqual(self.server.requests["/oauth2/token"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
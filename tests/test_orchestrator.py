@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import os
 import sys
+import tempfile
 
 # Ensure mocks for dependencies are in place before importing orchestrator
 sys.modules['win32api'] = MagicMock()
@@ -8,7 +10,14 @@ sys.modules['win32con'] = MagicMock()
 sys.modules['ctypes'] = MagicMock()
 sys.modules['winreg'] = MagicMock()
 
-from src.orchestrator import Orchestrator
+from src.orchestrator import GamePipeline, Orchestrator
+from src.game_scanner import GameRecord, GameScanner
+from src.library_watcher import LibraryWatcher, CREATED, DELETED
+from src.local_artwork import SteamArtworkSource
+from src.sunshine_api import SunshineApiManager
+from src.sunshine_manager import SunshineManager
+from benchmarks import bench_metadata
+from benchmarks.fake_sunshine import FakeSunshineServer
 
 class TestOrchestrator(unittest.TestCase):
     def setUp(self):
@@ -25,7 +34,8 @@ class TestOrchestrator(unittest.TestCase):
 
         self.orchestrator.gpu_manager.force_high_performance.assert_called()
         self.orchestrator.display_manager.create_virtual_display.assert_called()
-        self.orchestrator.display_manager.set_resolution.assert_called_with(1920, 1080)
+        virtual_display = self.orchestrator.display_manager.create_virtual_display.return_value
+        self.orchestrator.display_manager.set_resolution.assert_called_with(1920, 1080, device_name=virtual_display)
         self.orchestrator.display_manager.toggle_physical_display.assert_called_with(enable=False)
 
     @patch('src.orchestrator.DisplayManager')
@@ -79,5 +89,253 @@ class TestOrchestrator(unittest.TestCase):
         mock_download.assert_called()
         mock_extract.assert_called()
 
+    def test_watch_games_pushes_only_changes(self):
+        with tempfile.TemporaryDirectory() as root:
+            steamapps = os.path.join(root, "steamapps")
+            os.makedirs(steamapps)
+            with open(os.path.join(steamapps, "libraryfolders.vdf"), "w") as f:
+                f.write('"libraryfolders" { }')
+            manifest = '"AppState" {{ "appid" "{0}" "name" "{1}" "installdir" "{1}" }}'
+            for appid, name in ((10, "Kept"), (20, "Removed")):
+                with open(os.path.join(steamapps, f"appmanifest_{appid}.acf"), "w") as f:
+                    f.write(manifest.format(appid, name))
+
+            self.orchestrator.config.config.update({"steam_path": root, "resolve_executables": False})
+            sunshine_manager = MagicMock()
+            pipeline = GamePipeline(MagicMock(), sunshine_manager, root, None, None, None)
+
+            added_path = os.path.join(steamapps, "appmanifest_30.acf")
+            removed_path = os.path.join(steamapps, "appmanifest_20.acf")
+            responses = iter([{removed_path: DELETED, added_path: CREATED}, {}])
+
+            def wait_for_changes(timeout=None):
+                # Simulate an install and an uninstall while watching
+                if os.path.exists(removed_path):
+                    os.remove(removed_path)
+                    with open(added_path, "w") as f:
+                        f.write(manifest.format(30, "Added"))
+                return next(responses)
+
+            with patch.object(Orchestrator, "_init_game_pipeline", return_value=pipeline), \
+                 patch.object(Orchestrator, "_process_game") as mock_process, \
+                 patch.object(LibraryWatcher, "wait_for_changes", side_effect=wait_for_changes), \
+                 patch.object(GameScanner, "_open_appinfo", return_value=None) as mock_open_appinfo:
+                calls = iter([False, False, True])
+                self.orchestrator.watch_games(should_stop=lambda: next(calls))
+
+            # Once for the startup library pass and once for the change batch
+            self.assertEqual(mock_open_appinfo.call_count, 2)
+            sunshine_manager.remove_game.assert_called_once_with("Removed")
+            processed = [call.args[0]["name"] for call in mock_process.call_args_list]
+            self.assertEqual(processed, ["Added"])
+
+    def test_process_game_prefers_local_artwork(self):
+        with tempfile.TemporaryDirectory() as root:
+            librarycache = os.path.join(root, "appcache", "librarycache")
+            os.makedirs(librarycache)
+            with open(os.path.join(librarycache, "10_library_600x900.jpg"), "wb") as f:
+                f.write(b"cover")
+            covers_dir = os.path.join(root, "covers")
+            os.makedirs(covers_dir)
+
+            metadata_provider = MagicMock()
+            sunshine_manager = MagicMock()
+            artwork = SteamArtworkSource(root)
+            steam_game = GameRecord("Counter-Strike", "steam://rungameid/10", root, "steam", appid="10")
+            self.orchestrator._process_game(steam_game, metadata_provider, sunshine_manager, covers_dir, artwork)
+
+            cover = os.path.join(covers_dir, "CounterStrike.jpg")
+            metadata_provider.lookup_steam_games.assert_not_called()
+            metadata_provider.search_games.assert_not_called()
+            sunshine_manager.add_game.assert_called_once_with("Counter-Strike", "steam://rungameid/10", root, cover)
+
+            # Misses fall back to IGDB, by appid first and then by title
+            metadata_provider.lookup_steam_games.return_value = {"620": None}
+            metadata_provider.search_games.return_value = {"Portal 2": None}
+            other_game = GameRecord("Portal 2", "steam://rungameid/620", root, "steam", appid="620")
+            self.orchestrator._process_game(other_game, metadata_provider, sunshine_manager, covers_dir, artwork)
+            metadata_provider.lookup_steam_games.assert_called_once_with(["620"])
+            metadata_provider.search_games.assert_called_once_with(["Portal 2"])
+
+    def test_process_batch_matches_steam_games_by_appid(self):
+        games = [
+            GameRecord("Portal 2", "steam://rungameid/620", "", "steam", appid="620"),
+            GameRecord("Mod Tool", "steam://rungameid/999", "", "steam", appid="999"),
+            GameRecord("Fortnite", "cmd", "", "epic"),
+        ]
+        metadata_provider = MagicMock()
+        metadata_provider.lookup_steam_games.return_value = {"620": {"name": "Portal 2"}, "999": None}
+        metadata_provider.search_games.side_effect = lambda names: {name: None for name in names}
+        metadata_provider.get_cover_art.return_value = None
+
+        self.orchestrator._process_batch(games, metadata_provider, MagicMock(), "covers")
+
+        metadata_provider.lookup_steam_games.assert_called_once_with(["620", "999"])
+        metadata_provider.search_games.assert_called_once_with(["Mod Tool", "Fortnite"])
+        metadata_provider.get_cover_art.assert_called_once_with({"name": "Portal 2"})
+
+    def test_scan_games_batches_igdb_lookups(self):
+        games = [GameRecord(f"Game {i}", f"cmd{i}", "", "epic") for i in range(5)]
+        metadata_provider = MagicMock(request_count=2, cache=None, rate_limiter=None)
+        metadata_provider.search_games.side_effect = lambda names: {name: None for name in names}
+        sunshine_manager = MagicMock()
+        scanner = MagicMock()
+        scanner.iter_system.return_value = iter(games)
+        self.orchestrator.config.config["igdb_batch_size"] = 2
+
+        with patch.object(Orchestrator, "_init_game_pipeline",
+                          return_value=GamePipeline(metadata_provider, sunshine_manager, "covers", None, None, None)), \
+             patch.object(Orchestrator, "_create_scanner", return_value=scanner):
+            self.orchestrator.scan_games()
+
+        batches = [call.args[0] for call in metadata_provider.search_games.call_args_list]
+        self.assertEqual(batches, [["Game 0", "Game 1"], ["Game 2", "Game 3"], ["Game 4"]])
+        metadata_provider.search_game.assert_not_called()
+        # All games reach Sunshine in one apps.json update
+        sunshine_manager.add_game.assert_not_called()
+        sunshine_manager.add_games.assert_called_once()
+        self.assertEqual(len(sunshine_manager.add_games.call_args.args[0]), 5)
+
+    def test_scan_games_skips_non_games(self):
+        games = [
+            GameRecord("Portal 2", "steam://rungameid/620", "", "steam", appid="620", app_type="game"),
+            GameRecord("Steamworks Common Redistributables", "steam://rungameid/228980", "", "steam", appid="228980"),
+            GameRecord("Proton Experimental", "steam://rungameid/1493710", "", "steam", appid="1493710"),
+            GameRecord("Blender", "steam://rungameid/365670", "", "steam", appid="365670", app_type="tool"),
+        ]
+        scanner = MagicMock()
+        scanner.iter_system.return_value = iter(games)
+
+        with patch.object(Orchestrator, "_init_game_pipeline",
+                          return_value=GamePipeline(MagicMock(), MagicMock(), "covers", None, None, None)), \
+             patch.object(Orchestrator, "_create_scanner", return_value=scanner), \
+             patch.object(Orchestrator, "_process_batch") as mock_batch:
+            self.orchestrator.scan_games()
+
+        processed = [game["name"] for call in mock_batch.call_args_list for game in call.args[0]]
+        self.assertEqual(processed, ["Portal 2"])
+
+    def test_scan_games_merges_duplicates_across_launchers(self):
+        games = [
+            GameRecord("Hades", "epic-hades", "", "epic"),
+            GameRecord("Hades", "steam://rungameid/1145360", "", "steam", appid="1145360"),
+            GameRecord("Control", "epic-control", "", "epic"),
+            GameRecord("Control Ultimate Edition", "steam://rungameid/870780", "", "steam", appid="870780"),
+            GameRecord("CONTROL", "gog-control", "", "gog"),
+        ]
+        scanner = MagicMock()
+        scanner.iter_system.return_value = iter(games)
+        sunshine_manager = MagicMock()
+        self.orchestrator.config.config["igdb_batch_size"] = 2
+        batches = []
+
+        def process_batch(batch, *args):
+            batches.append([game["cmd"] for game in batch])
+            return [f"{game['name']}.png" for game in batch]
+
+        with patch.object(Orchestrator, "_init_game_pipeline",
+                          return_value=GamePipeline(MagicMock(), sunshine_manager, "covers", None, None, None)), \
+             patch.object(Orchestrator, "_create_scanner", return_value=scanner), \
+             patch.object(Orchestrator, "_process_batch", side_effect=process_batch):
+            self.orchestrator.scan_games()
+
+        # Hades was replaced by the Steam copy before its batch ran; Control
+        # was already processed and keeps its cover
+        self.assertEqual(batches, [["steam://rungameid/1145360", "epic-control"]])
+        sunshine_manager.add_games.assert_called_once_with([
+            ("Hades", "steam://rungameid/1145360", "", "Hades.png"),
+            ("Control Ultimate Edition", "steam://rungameid/870780", "", "Control.png"),
+        ], order=False)
+
+    def test_scan_games_curates_before_lookup(self):
+        games = [
+            GameRecord("Portal 2", "steam://rungameid/620", "", "steam", appid="620", last_updated=100),
+            GameRecord("Hades", "steam://rungameid/1145360", "", "steam", appid="1145360", last_updated=300),
+            GameRecord("Control", "epic-control", "", "epic"),
+            GameRecord("Celeste", "steam://rungameid/504230", "", "steam", appid="504230", last_updated=200),
+        ]
+        scanner = MagicMock()
+        scanner.iter_system.return_value = iter(games)
+        sunshine_manager = MagicMock()
+        self.orchestrator.config.config.update({"max_games": 3, "pinned_games": ["Control"], "igdb_batch_size": 1})
+        batches = []
+
+        def process_batch(batch, *args):
+            batches.append([game["name"] for game in batch])
+            return [f"{game['name']}.png" for game in batch]
+
+        with patch.object(Orchestrator, "_init_game_pipeline",
+                          return_value=GamePipeline(MagicMock(), sunshine_manager, "covers", None, None, None)), \
+             patch.object(Orchestrator, "_create_scanner", return_value=scanner), \
+             patch.object(Orchestrator, "_process_batch", side_effect=process_batch), \
+             patch("src.orchestrator.read_play_stats", return_value={"620": {"last_played": 900, "playtime": 1}}):
+            self.orchestrator.scan_games()
+
+        # Celeste is left out before any lookup
+        self.assertEqual(batches, [["Control"], ["Portal 2"], ["Hades"]])
+        sunshine_manager.add_games.assert_called_once_with([
+            ("Control", "epic-control", "", "Control.png"),
+            ("Portal 2", "steam://rungameid/620", "", "Portal 2.png"),
+            ("Hades", "steam://rungameid/1145360", "", "Hades.png"),
+        ], order=True)
+        sunshine_manager.remove_games.assert_called_once_with(["Celeste"])
+
+    def test_create_artwork_source_does_not_build_a_scanner(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "appcache", "librarycache"))
+            self.orchestrator.config.config.update({"steam_path": root, "local_artwork": True})
+
+            with patch.object(Orchestrator, "_create_scanner") as mock_scanner:
+                artwork = self.orchestrator._create_artwork_source()
+
+            mock_scanner.assert_not_called()
+            self.assertEqual(artwork.cache_dir, os.path.join(root, "appcache", "librarycache"))
+
+    def test_create_sunshine_manager_prefers_the_api(self):
+        config = self.orchestrator.config.config
+        self.assertIsInstance(self.orchestrator._create_sunshine_manager(), SunshineManager)
+
+        with FakeSunshineServer(username="user", password="secret") as server:
+            config.update({"sunshine_api_url": server.base_url, "sunshine_api_username": "user",
+                           "sunshine_api_password": "secret"})
+            manager = self.orchestrator._create_sunshine_manager()
+            self.assertIsInstance(manager, SunshineApiManager)
+            manager.close()
+
+            config["sunshine_api_password"] = "wrong"
+            self.assertIsInstance(self.orchestrator._create_sunshine_manager(), SunshineManager)
+
+    def test_tune_encoder(self):
+        with tempfile.TemporaryDirectory() as root:
+            self.orchestrator.sunshine_path = os.path.join(root, "Sunshine.exe")
+            self.orchestrator.gpu_manager = MagicMock()
+            self.orchestrator.gpu_manager.list_adapters.return_value = [
+                "Intel(R) UHD Graphics", "NVIDIA GeForce RTX 4060 Laptop GPU"
+            ]
+            self.orchestrator.gpu_manager.display_adapter.return_value = "NVIDIA GeForce RTX 4060 Laptop GPU"
+            self.orchestrator.config.config["encoder_settings"] = {"nvenc_preset": "3"}
+
+            diff = self.orchestrator.tune_encoder("\\\\.\\DISPLAY2")
+
+            self.orchestrator.gpu_manager.display_adapter.assert_called_with("\\\\.\\DISPLAY2")
+            self.assertEqual(diff["encoder"], (None, "nvenc"))
+            self.assertEqual(diff["nvenc_preset"], (None, "3"))
+            self.assertEqual(diff["nvenc_twopass"], (None, "disabled"))
+            self.assertEqual(diff["output_name"], (None, "\\\\.\\DISPLAY2"))
+            # A second run finds nothing to change
+            self.assertEqual(self.orchestrator.tune_encoder("\\\\.\\DISPLAY2"), {})
+
+    def test_metadata_benchmark_stays_in_its_temp_root(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            previous = os.getcwd()
+            os.chdir(cwd)
+            try:
+                result = bench_metadata.benchmark(games=10, latency=0.0, rate_limit=None, normalize=False)
+            finally:
+                os.chdir(previous)
+            self.assertEqual(result["games"], 10)
+            # The default Sunshine path resolves against the working directory off Windows
+            self.assertEqual(os.listdir(cwd), [])
+
 if __name__ == '__main__':
     unittest.main()
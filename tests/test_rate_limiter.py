@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+
+from src.rate_limiter import RateLimiter
+
+class TestRateLimiter(unittest.TestCase):
+    def test_spaces_requests_at_rate(self):
+        limiter = RateLimiter(rate=50, max_in_flight=8)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+            limiter.release(200)
+        # The first request goes out at once, the other five 20 ms apart
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_bounds_requests_in_flight(self):
+        limiter = RateLimiter(rate=1000, max_in_flight=2)
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def request():
+            limiter.acquire()
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+            limiter.release(200)
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(max(peak), 2)
+
+    def test_backs_off_on_429_and_recovers(self):
+        limiter = RateLimiter(rate=4, max_in_flight=1, min_rate=1)
+        limiter.acquire()
+        limiter.release(429)
+        limiter.backoff(0.05)
+        self.assertEqual(limiter.rate, 2)
+        self.assertEqual(limiter.stats()["throttled"], 1)
+
+        start = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        limiter.release(200)
+        self.assertAlmostEqual(limiter.rate, 2.2)
+
+        limiter.backoff(0)
+        limiter.backoff(0)
+        self.assertEqual(limiter.rate, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.fake_sunshine import FakeSunshineServer
+from src.http_client import HttpClient
+from src.sunshine_api import SunshineApiManager
+from src.sunshine_manager import SunshineManager
+
+class TestSunshineApiManager(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeSunshineServer(apps=[{"name": "Desktop", "image-path": "desktop.png"}]).start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.fallback = SunshineManager(os.path.join(self.temp_dir.name, "Sunshine.exe"))
+
+    def tearDown(self):
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def _manager(self, password="admin"):
+        manager = SunshineApiManager(self.server.base_url, "admin", password,
+                                     http=HttpClient(max_retries=0), fallback=self.fallback)
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_add_games_sends_only_changes(self):
+        manager = self._manager()
+        self.assertTrue(manager.is_available())
+
+        counts = manager.add_games([("Portal 2", "portal", "", "p.png"), ("Hades", "hades", "", "")])
+        self.assertEqual(counts, {"added": 2, "updated": 0, "unchanged": 0})
+        counts = manager.add_games([
+            ("Portal 2", "portal", "", "p.png"),
+            ("HADES", "hades-new", "", ""),
+            ("Celeste", "celeste", "", ""),
+        ])
+        self.assertEqual(counts, {"added": 1, "updated": 1, "unchanged": 1})
+
+        self.assertEqual([app["name"] for app in self.server.apps], ["Desktop", "Portal 2", "HADES", "Celeste"])
+        self.assertEqual(self.server.apps[2]["cmd"], "hades-new")
+        self.assertEqual(self.server.requests["GET /api/apps"], 3)
+        self.assertEqual(self.server.requests["POST /api/apps"], 4)
+        self.assertFalse(os.path.exists(self.fallback.config_path))
+
+    def test_remove_game(self):
+        manager = self._manager()
+        manager.add_games([("Portal 2", "portal", "", ""), ("Hades", "hades", "", "")])
+        self.assertTrue(manager.remove_game("Portal 2"))
+        self.assertTrue(manager.remove_game("Not Installed"))
+        self.assertEqual([app["name"] for app in self.server.apps], ["Desktop", "Hades"])
+        self.assertEqual(self.server.requests["DELETE /api/apps/1"], 1)
+
+    def test_remove_games_and_order(self):
+        manager = self._manager()
+        manager.add_games([("Portal 2", "portal", "", ""), ("Hades", "hades", "", ""), ("Celeste", "celeste", "", "")])
+
+        self.assertEqual(manager.remove_games(["Portal 2", "Celeste", "Not Installed"]), 2)
+        self.assertEqual(manager.add_games([("Celeste", "celeste", "", ""), ("Hades", "hades", "", "")], order=True),
+                         {"added": 1, "updated": 0, "unchanged": 1})
+        self.assertEqual([app["name"] for app in self.server.apps], ["Desktop", "Celeste", "Hades"])
+
+    def test_falls_back_to_apps_json(self):
+        manager = self._manager(password="wrong")
+        self.assertFalse(manager.is_available())
+        self.assertEqual(manager.add_games([("Portal 2", "portal", "", "")]),
+                         {"added": 1, "updated": 0, "unchanged": 0})
+
+        self.server.stop()
+        manager = self._manager()
+        self.assertTrue(manager.remove_game("Portal 2"))
+        self.assertTrue(manager.add_game("Hades", "hades", "", ""))
+
+        with open(self.fallback.config_path) as f:
+            self.assertEqual([app["name"] for app in json.load(f)["apps"]], ["Hades"])
+        self.assertEqual(self.server.apps, [{"name": "Desktop", "image-path": "desktop.png"}])
+
+if __name__ == '__main__':
+    unittest.main()
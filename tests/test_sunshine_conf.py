@@ -0,0 +1,95 @@
+import unittest
+
+from src.sunshine_conf import SunshineConf, encoder_profile, gpu_vendor
+
+CONF = """# Sunshine settings
+sunshine_name = Gaming Laptop
+min_log_level = info
+
+# Encoder
+encoder = software
+unknown_future_key = keep me
+"""
+
+class TestSunshineConf(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(SunshineConf(CONF).dumps(), CONF)
+        crlf = CONF.replace("\n", "\r\n")
+        self.assertEqual(SunshineConf(crlf).dumps(), crlf)
+        self.assertEqual(SunshineConf("a = 1").dumps(), "a = 1")
+
+    def test_get_and_items(self):
+        conf = SunshineConf(CONF + "encoder = nvenc\n")
+        # The last assignment is the one in effect
+        self.assertEqual(conf.get("encoder"), "nvenc")
+        self.assertEqual(conf.get("sunshine_name"), "Gaming Laptop")
+        self.assertIsNone(conf.get("adapter_name"))
+        self.assertEqual(conf.items()["unknown_future_key"], "keep me")
+
+    def test_apply_is_a_diff(self):
+        conf = SunshineConf(CONF)
+        diff = conf.apply({"encoder": "nvenc", "min_log_level": "info", "adapter_name": "NVIDIA GeForce RTX 4060",
+                           "unknown_future_key": None})
+
+        self.assertEqual(diff, {
+            "encoder": ("software", "nvenc"),
+            "adapter_name": (None, "NVIDIA GeForce RTX 4060"),
+            "unknown_future_key": ("keep me", None),
+        })
+        self.assertEqual(conf.dumps(), """# Sunshine settings
+sunshine_name = Gaming Laptop
+min_log_level = info
+
+# Encoder
+encoder = nvenc
+adapter_name = NVIDIA GeForce RTX 4060
+""")
+        self.assertEqual(conf.apply({"encoder": "nvenc", "missing": None}), {})
+
+class TestEncoderProfile(unittest.TestCase):
+    def test_gpu_vendor(self):
+        self.assertEqual(gpu_vendor("NVIDIA GeForce RTX 4060 Laptop GPU"), "nvidia")
+        self.assertEqual(gpu_vendor("AMD Radeon(TM) Graphics"), "amd")
+        self.assertEqual(gpu_vendor("Intel(R) Iris(R) Xe Graphics"), "intel")
+        self.assertIsNone(gpu_vendor("Virtual Display Driver"))
+        self.assertIsNone(gpu_vendor(None))
+
+    def test_hybrid_laptop_prefers_the_dgpu(self):
+        settings = encoder_profile(["Intel(R) UHD Graphics", "NVIDIA GeForce RTX 3060 Laptop GPU"], cpu_count=16)
+
+        self.assertEqual(settings["encoder"], "nvenc")
+        self.assertEqual(settings["adapter_name"], "NVIDIA GeForce RTX 3060 Laptop GPU")
+        self.assertEqual(settings["nvenc_twopass"], "disabled")
+        self.assertEqual(settings["capture"], "ddx")
+        self.assertEqual(settings["min_threads"], "2")
+        self.assertNotIn("output_name", settings)
+
+    def test_adapter_driving_the_virtual_display_wins(self):
+        settings = encoder_profile(
+            ["AMD Radeon(TM) Graphics", "NVIDIA GeForce RTX 4070 Laptop GPU"],
+            display_adapter="AMD Radeon(TM) Graphics", output_name="\\\\.\\DISPLAY2"
+        )
+
+        self.assertEqual(settings["encoder"], "amdvce")
+        self.assertEqual(settings["adapter_name"], "AMD Radeon(TM) Graphics")
+        self.assertEqual(settings["output_name"], "\\\\.\\DISPLAY2")
+
+    def test_desktop_and_software_profiles(self):
+        settings = encoder_profile(["NVIDIA GeForce RTX 4080"], display_adapter="Virtual Display Driver")
+        self.assertEqual(settings["nvenc_twopass"], "quarter_res")
+        self.assertEqual(settings["adapter_name"], "NVIDIA GeForce RTX 4080")
+
+        settings = encoder_profile(["Microsoft Basic Display Adapter", "Virtual Display Driver"], cpu_count=12)
+        self.assertEqual(settings["encoder"], "software")
+        self.assertEqual(settings["min_threads"], "6")
+        self.assertNotIn("adapter_name", settings)
+
+    def test_undetected_adapters_keep_sunshines_choice(self):
+        # Detection failed, e.g. without win32api
+        self.assertEqual(encoder_profile([]), {})
+        self.assertEqual(encoder_profile([], output_name="\\\\.\\DISPLAY2"), {"output_name": "\\\\.\\DISPLAY2"})
+        # A GPU of a vendor without a profile
+        self.assertEqual(encoder_profile(["Moore Threads MTT S80", "Microsoft Basic Display Adapter"]), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,59 +2,37 @@ import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import json
 import os
-from src.sunshine_manager import SunshineManager
+import tempfile
+from src.sunshine_manager import MANAGED_BY, MANAGED_KEY, SunshineManager
+from src.utils import FileLock
 
 class TestSunshineManager(unittest.TestCase):
     def setUp(self):
         self.sunshine_path = r"C:\Program Files\Sunshine\Sunshine.exe"
         self.manager = SunshineManager(self.sunshine_path)
 
-    @patch("os.path.exists")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("os.makedirs")
-    def test_add_game_new(self, mock_makedirs, mock_file, mock_exists):
-        # Mock file existence: config does not exist initially
-        mock_exists.side_effect = lambda x: x == self.manager.config_path
+    def _temp_manager(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        return SunshineManager(os.path.join(self.temp_dir.name, "Sunshine.exe"))
 
-        # Mock reading empty or non-existent file
-        # We need to manage the side_effect carefully.
-        # When add_game opens the file for reading:
-        read_handle = mock_open(read_data='{"apps": []}').return_value
-        # When add_game opens the file for writing:
-        write_handle = mock_open().return_value
+    def _apps(self, manager):
+        with open(manager.config_path) as f:
+            return json.load(f)["apps"]
 
-        def side_effect(*args, **kwargs):
-            mode = 'r'
-            if len(args) > 1:
-                mode = args[1]
-            elif 'mode' in kwargs:
-                mode = kwargs['mode']
-
-            if 'r' in mode:
-                return read_handle
-            else:
-                return write_handle
-
-        mock_file.side_effect = side_effect
-
-        success = self.manager.add_game("Test Game", "C:\\Game.exe", "C:\\", "cover.png")
+    def test_add_game_new(self):
+        manager = self._temp_manager()
+        success = manager.add_game("Test Game", "C:\\Game.exe", "C:\\", "cover.png")
 
         self.assertTrue(success)
-
-        # Check if write was called with correct data
-        # We need to inspect the write_handle we created
-        # json.dump might call write multiple times
-        written_content = "".join([call.args[0] for call in write_handle.write.mock_calls])
-        written_data = json.loads(written_content)
-
-        self.assertEqual(len(written_data["apps"]), 1)
-        self.assertEqual(written_data["apps"][0]["name"], "Test Game")
-        self.assertEqual(written_data["apps"][0]["image-path"], "cover.png")
-
-    @patch("os.path.exists")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("os.makedirs")
-    def test_add_game_update(self, mock_makedirs, mock_file, mock_exists):
+        apps = self._apps(manager)
+        self.assertEqual(len(apps), 1)
+        self.assertEqual(apps[0]["name"], "Test Game")
+        self.assertEqual(apps[0]["image-path"], "cover.png")
+
+    def test_add_game_update(self):
+        manager = self._temp_manager()
+        os.makedirs(os.path.dirname(manager.config_path))
         initial_data = {
             "apps": [
                 {
@@ -65,40 +43,160 @@ class TestSunshineManager(unittest.TestCase):
                 }
             ]
         }
+        with open(manager.config_path, "w") as f:
+            json.dump(initial_data, f)
 
-        mock_exists.return_value = True
-
-        # Mock reading existing file
-        read_handle = mock_open(read_data=json.dumps(initial_data)).return_value
-        write_handle = mock_open().return_value
-
-        def side_effect(*args, **kwargs):
-            mode = 'r'
-            if len(args) > 1:
-                mode = args[1]
-            elif 'mode' in kwargs:
-                mode = kwargs['mode']
-
-            if 'r' in mode:
-                return read_handle
-            else:
-                return write_handle
-
-        mock_file.side_effect = side_effect
-
-        success = self.manager.add_game("Test Game", "C:\\NewGame.exe", "C:\\NewDir", "new_cover.png")
+        success = manager.add_game("Test Game", "C:\\NewGame.exe", "C:\\NewDir", "new_cover.png")
 
         self.assertTrue(success)
-
-        # Check if write was called with updated data
-        # We need to inspect the write_handle we created
-        written_content = "".join([call.args[0] for call in write_handle.write.mock_calls])
-        written_data = json.loads(written_content)
-
-        self.assertEqual(len(written_data["apps"]), 1)
-        self.assertEqual(written_data["apps"][0]["name"], "Test Game")
-        self.assertEqual(written_data["apps"][0]["cmd"], "C:\\NewGame.exe")
-        self.assertEqual(written_data["apps"][0]["image-path"], "new_cover.png")
+        apps = self._apps(manager)
+        self.assertEqual(len(apps), 1)
+        self.assertEqual(apps[0]["name"], "Test Game")
+        self.assertEqual(apps[0]["cmd"], "C:\\NewGame.exe")
+        self.assertEqual(apps[0]["image-path"], "new_cover.png")
+
+    def test_writes_are_atomic(self):
+        manager = self._temp_manager()
+        manager.add_game("Portal 2", "portal", "", "")
+        with open(manager.config_path, "rb") as f:
+            before = f.read()
+
+        # A failed write leaves the previous file and no temp files behind
+        with patch("src.utils.os.replace", side_effect=OSError("disk full")):
+            self.assertFalse(manager.add_game("Hades", "hades", "", ""))
+        with open(manager.config_path, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(manager.config_path))), ["apps.json", "apps.json.lock"])
+
+    def test_unchanged_bytes_are_not_rewritten(self):
+        manager = self._temp_manager()
+        manager.add_game("Portal 2", "portal", "", "p.png")
+        mtime = os.stat(manager.config_path).st_mtime_ns
+
+        with patch("src.sunshine_manager.write_atomic") as mock_write:
+            # Same values, and a removal of a game that is not there
+            self.assertTrue(manager.add_game("Portal 2", "portal", "", "p.png"))
+            self.assertTrue(manager.remove_game("Hades"))
+            # Saving exactly what was read
+            self.assertTrue(manager._save(*manager._load()))
+        mock_write.assert_not_called()
+        self.assertEqual(os.stat(manager.config_path).st_mtime_ns, mtime)
+
+    def test_updates_wait_for_the_lock(self):
+        manager = self._temp_manager()
+        manager.add_game("Portal 2", "portal", "", "")
+        with FileLock(manager.lock_path):
+            with patch("src.sunshine_manager.FileLock", lambda path: FileLock(path, timeout=0.1)):
+                self.assertIsNone(manager.add_games([("Hades", "hades", "", "")]))
+                self.assertFalse(manager.remove_game("Portal 2"))
+        self.assertEqual([app["name"] for app in self._apps(manager)], ["Portal 2"])
+
+        # Released again
+        self.assertTrue(manager.remove_game("Portal 2"))
+        self.assertEqual(self._apps(manager), [])
+
+    def test_add_game_matches_other_spellings(self):
+        with tempfile.TemporaryDirectory() as root:
+            manager = SunshineManager(os.path.join(root, "Sunshine.exe"))
+            manager.add_game("DOOM®", "old", "", "doom.png")
+            manager.add_game("Portal 2", "portal", "", "")
+            manager.add_game("Doom (Deluxe Edition)", "new", "C:\\Doom", "")
+
+            with open(manager.config_path) as f:
+                apps = json.load(f)["apps"]
+            self.assertEqual(len(apps), 2)
+            self.assertEqual(apps[0], {
+                "name": "Doom (Deluxe Edition)", "cmd": "new", "working_dir": "C:\\Doom", "image-path": "doom.png",
+                MANAGED_KEY: MANAGED_BY,
+            })
+
+    def test_add_game_keeps_apps_it_did_not_add(self):
+        manager = self._temp_manager()
+        os.makedirs(os.path.dirname(manager.config_path))
+        with open(manager.config_path, "w") as f:
+            json.dump({"apps": [{"name": "HADES", "cmd": "mine"}, {"name": "!!!", "cmd": "mine"}]}, f)
+
+        counts = manager.add_games([("Hades", "hades", "", ""), ("???", "symbols", "", ""), ("®", "mark", "", "")])
+
+        # Another spelling of a hand-made app and titles without a canonical key are new apps
+        self.assertEqual(counts, {"added": 3, "updated": 0, "unchanged": 0})
+        self.assertEqual([(app["name"], app["cmd"]) for app in self._apps(manager)], [
+            ("HADES", "mine"), ("!!!", "mine"), ("Hades", "hades"), ("???", "symbols"), ("®", "mark"),
+        ])
+
+    def test_add_games_merges_in_one_write(self):
+        with tempfile.TemporaryDirectory() as root:
+            manager = SunshineManager(os.path.join(root, "Sunshine.exe"))
+            manager.add_games([("Portal 2", "portal", "", "p.png"), ("Hades", "hades", "", "")])
+
+            with patch.object(manager, "_save", wraps=manager._save) as mock_save:
+                counts = manager.add_games([
+                    ("Portal 2", "portal", "", ""),
+                    ("HADES", "hades-new", "", "h.png"),
+                    ("Celeste", "celeste", "", ""),
+                ])
+                self.assertEqual(counts, {"added": 1, "updated": 1, "unchanged": 1})
+                self.assertEqual(mock_save.call_count, 1)
+
+                # Nothing changed, nothing written
+                counts = manager.add_games([("Celeste", "celeste", "", "")])
+                self.assertEqual(counts, {"added": 0, "updated": 0, "unchanged": 1})
+                self.assertEqual(mock_save.call_count, 1)
+
+            with open(manager.config_path) as f:
+                apps = json.load(f)["apps"]
+            self.assertEqual([app["name"] for app in apps], ["Portal 2", "HADES", "Celeste"])
+            self.assertEqual(apps[0]["image-path"], "p.png")
+
+    def test_add_games_in_order(self):
+        manager = self._temp_manager()
+        os.makedirs(os.path.dirname(manager.config_path))
+        with open(manager.config_path, "w") as f:
+            json.dump({"apps": [{"name": "Hades"}, {"name": "Desktop"}, {"name": "Portal 2"}]}, f)
+
+        counts = manager.add_games([("Celeste", "celeste", "", ""), ("Portal 2", "", "", ""), ("Hades", "", "", "")],
+                                   order=True)
+
+        self.assertEqual(counts, {"added": 1, "updated": 2, "unchanged": 0})
+        # Apps that are not games keep their place
+        self.assertEqual([app["name"] for app in self._apps(manager)], ["Celeste", "Desktop", "Portal 2", "Hades"])
+        with patch("src.sunshine_manager.write_atomic") as mock_write:
+            manager.add_games([("Celeste", "celeste", "", ""), ("Portal 2", "", "", ""), ("Hades", "", "", "")],
+                              order=True)
+        mock_write.assert_not_called()
+
+    def test_remove_games(self):
+        manager = self._temp_manager()
+        manager.add_games([("Portal 2", "portal", "", ""), ("Hades", "hades", "", ""), ("Celeste", "celeste", "", "")])
+
+        with patch.object(manager, "_save", wraps=manager._save) as mock_save:
+            self.assertEqual(manager.remove_games(["Portal 2", "Celeste", "Not Installed"]), 2)
+            self.assertEqual(manager.remove_games(["Portal 2"]), 0)
+        self.assertEqual(mock_save.call_count, 1)
+        self.assertEqual([app["name"] for app in self._apps(manager)], ["Hades"])
+
+    def test_update_conf_keeps_unknown_keys(self):
+        manager = self._temp_manager()
+        self.assertEqual(manager.conf_path, os.path.join(os.path.dirname(manager.config_path), "sunshine.conf"))
+        os.makedirs(os.path.dirname(manager.conf_path))
+        with open(manager.conf_path, "w") as f:
+            f.write("# Set by the user\nsunshine_name = Laptop\nencoder = software\n")
+
+        diff = manager.update_conf({"encoder": "nvenc", "sunshine_name": "Laptop", "min_threads": "2"})
+
+        self.assertEqual(diff, {"encoder": ("software", "nvenc"), "min_threads": (None, "2")})
+        with open(manager.conf_path) as f:
+            self.assertEqual(f.read(), "# Set by the user\nsunshine_name = Laptop\nencoder = nvenc\nmin_threads = 2\n")
+
+        # Applying the same profile again does not touch the file
+        with patch("src.sunshine_manager.write_atomic") as mock_write:
+            self.assertEqual(manager.update_conf({"encoder": "nvenc"}), {})
+        mock_write.assert_not_called()
+
+    def test_update_conf_creates_the_file(self):
+        manager = self._temp_manager()
+        self.assertEqual(manager.update_conf({"encoder": "quicksync"}), {"encoder": (None, "quicksync")})
+        self.assertEqual(manager.read_conf().get("encoder"), "quicksync")
 
 if __name__ == '__main__':
     unittest.main()
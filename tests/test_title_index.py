@@ -0,0 +1,34 @@
+import unittest
+
+from src.title_index import TitleIndex, canonical_title
+
+def _game(name, platform):
+    return {"name": name, "platform": platform}
+
+class TestTitleIndex(unittest.TestCase):
+    def test_canonical_title(self):
+        self.assertEqual(canonical_title("DOOM® (Deluxe Edition)"), "doom")
+        self.assertEqual(canonical_title("The Witcher® 3: Wild Hunt - Game of the Year Edition"),
+                         "the witcher 3 wild hunt")
+        self.assertEqual(canonical_title("Death Stranding Director's Cut"), "death stranding")
+        self.assertEqual(canonical_title("Pokémon™ Tower & Co"), "pokemon tower and co")
+        self.assertEqual(canonical_title("Sid Meier's Civilization VI"), "sid meiers civilization vi")
+        # An edition name on its own is still a title
+        self.assertEqual(canonical_title("Gold Edition"), "gold edition")
+
+    def test_launcher_preference(self):
+        index = TitleIndex(["steam", "epic"])
+        self.assertEqual(index.add(_game("Control", "epic")), ("control", TitleIndex.NEW, None))
+        self.assertEqual(index.add(_game("Hades", "xbox"))[1], TitleIndex.NEW)
+
+        key, status, other = index.add(_game("Control Ultimate Edition", "steam"))
+        self.assertEqual((key, status, other["platform"]), ("control", TitleIndex.REPLACED, "epic"))
+        # Unlisted launchers rank last, ties keep the first entry
+        self.assertEqual(index.add(_game("Control", "gog"))[1], TitleIndex.DUPLICATE)
+        self.assertEqual(index.add(_game("HADES", "ea"))[1], TitleIndex.DUPLICATE)
+
+        self.assertEqual([game["platform"] for game in index.games()], ["steam", "xbox"])
+        self.assertEqual((len(index), index.duplicates), (2, 3))
+
+if __name__ == '__main__':
+    unittest.main()
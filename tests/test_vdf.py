@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, mock_open
+
+from src import vdf
+from src.game_scanner import GameScanner
+
+class TestVDF(unittest.TestCase):
+    def test_loads_nested(self):
+        text = """// generated by Steam
+"libraryfolders"
+{
+    "contentstatsid"    "123"
+    "0"
+    {
+        "path"      "C:\\\\Program Files (x86)\\\\Steam"
+        "apps"
+        {
+            "10"    "12345"
+        }
+    }
+}
+"""
+        data = vdf.loads(text)
+        folder = data["libraryfolders"]["0"]
+        self.assertEqual(folder["path"], r"C:\Program Files (x86)\Steam")
+        self.assertEqual(folder["apps"], {"10": "12345"})
+        self.assertEqual(data["libraryfolders"]["contentstatsid"], "123")
+
+    def test_escaped_quotes_and_conditionals(self):
+        data = vdf.loads('"root" { "name" "The \\"Game\\"" "key" "value" [$WIN32] }')
+        self.assertEqual(data["root"]["name"], 'The "Game"')
+        self.assertEqual(data["root"]["key"], "value")
+
+    def test_multiline_string(self):
+        data = vdf.load(['"root"\n', '{ "text" "line one\n', 'line two" }\n'])
+        self.assertEqual(data["root"]["text"], "line one\nline two")
+
+    def test_malformed(self):
+        with self.assertRaises(vdf.VDFError):
+            vdf.loads('"root" { "key" "value"')
+        with self.assertRaises(vdf.VDFError):
+            vdf.loads('"root" { "key" "unterminated')
+
+    def test_extract_ignores_nested_keys(self):
+        text = '"AppState" { "UserConfig" { "name" "nested" } "NAME" "Top Level" }'
+        self.assertEqual(vdf.extract(text.splitlines(True), ["name"]), {"name": "Top Level"})
+
+    def test_extract_stops_early(self):
+        def lines():
+            yield '"AppState"\n'
+            yield '{\n'
+            yield '"appid" "10"\n'
+            yield '"installdir" "Half-Life"\n'
+            yield '"name" "Counter-Strike"\n'
+            raise AssertionError("read past requested fields")
+
+        fields = vdf.extract(lines(), ["appid", "name", "installdir"])
+        self.assertEqual(fields, {"appid": "10", "installdir": "Half-Life", "name": "Counter-Strike"})
+
+    def _write(self, text):
+        fd, path = tempfile.mkstemp(suffix=".acf")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_extract_file_header(self):
+        path = self._write('"AppState"\r\n{\r\n\t"appid"\t\t"10"\r\n\t"name"\t\t"Counter-Strike"\r\n'
+                           '\t"name"\t\t"Repeated"\r\n\t"UserConfig"\r\n\t{\r\n\t}\r\n}\r\n')
+        self.assertEqual(vdf.extract_file(path, ["appid", "name"]), {"appid": "10", "name": "Counter-Strike"})
+
+    def test_extract_file_falls_back_to_tokenizer(self):
+        # A key in other case, an escape and a field after the nested block
+        path = self._write('"AppState"\n{\n\t"AppID"\t\t"10"\n\t"name"\t\t"The \\"Game\\""\n'
+                           '\t"UserConfig"\n\t{\n\t\t"installdir"\t\t"nested"\n\t}\n\t"installdir"\t\t"Game"\n}\n')
+        self.assertEqual(vdf.extract_file(path, ["appid", "name", "installdir"]),
+                         {"appid": "10", "name": 'The "Game"', "installdir": "Game"})
+
+    def test_parse_legacy_library_folders(self):
+        vdf_content = '"LibraryFolders"\n{\n\t"TimeNextStatsReport"\t\t"1234"\n\t"1"\t\t"D:\\\\SteamLibrary"\n}\n'
+        with patch("builtins.open", mock_open(read_data=vdf_content)):
+            paths = GameScanner()._parse_library_folders("dummy_path")
+        self.assertEqual(paths, [r"D:\SteamLibrary"])
+
+if __name__ == '__main__':
+    unittest.main()